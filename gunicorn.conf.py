@@ -0,0 +1,64 @@
+# gunicorn.conf.py — preload-and-warm boot profile (used by Procfile)
+#
+# The app is imported once in the master (preload_app) and warmed there; each
+# worker then warms its own DB connection/pool, schema registry and vocab cache
+# in post_fork, before it accepts traffic. Startup and first-request latency
+# are logged so cold-worker cost after a deploy or max_requests recycle is visible.
+import multiprocessing
+import os
+import time
+
+_BOOT = time.perf_counter()
+
+bind = "0.0.0.0:" + os.environ.get("PORT", "8000")
+preload_app = True
+
+# --- sizing -------------------------------------------------------------------
+# Each thread may hold one DB connection, so threads per worker never exceed the
+# per-process pool, and workers x pool stays under the database's connection cap.
+_cpus = multiprocessing.cpu_count()
+_pool = int(os.environ.get("DB_POOL_SIZE", "0")) or 1
+_db_max = int(os.environ.get("DB_MAX_CONNECTIONS", "100"))
+
+threads = int(os.environ.get("GUNICORN_THREADS", min(_pool, 4)))
+workers = int(os.environ.get("WEB_CONCURRENCY", max(1, min(2 * _cpus + 1, _db_max // max(_pool, threads)))))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    from registrations.warmup import warm_imports
+
+    report = warm_imports()
+    server.log.info(
+        "boot: master ready in %.0f ms (workers=%s threads=%s class=%s pool=%s) warm=%s",
+        (time.perf_counter() - _BOOT) * 1000.0, server.cfg.workers, server.cfg.threads,
+        server.cfg.worker_class_str, _pool, report,
+    )
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    from registrations.warmup import warm_worker
+
+    connections.close_all()  # never share the master's sockets across processes
+    t0 = time.perf_counter()
+    report = warm_worker()
+    worker._first_request_pending = True
+    server.log.info("boot: worker %s warmed in %.0f ms %s",
+                    worker.pid, (time.perf_counter() - t0) * 1000.0, report)
+
+
+def pre_request(worker, req):
+    worker._req_started = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    if getattr(worker, "_first_request_pending", False):
+        worker._first_request_pending = False
+        worker.log.info("boot: worker %s first request %s %s took %.1f ms",
+                        worker.pid, req.method, req.path,
+                        (time.perf_counter() - worker._req_started) * 1000.0)
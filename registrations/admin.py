@@ -1,3 +1,52 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from .invitations import send_invitations
+from .models import AccessLink, AuditEntry, PendingUser, TourCapacity
+
+
+@admin.action(description="Send invitation links to selected users")
+def send_invitation_action(modeladmin, request, queryset):
+    stats = send_invitations(queryset.order_by("id"), base_url=request.build_absolute_uri("/"))
+    level = messages.SUCCESS if not stats["failed"] else messages.WARNING
+    modeladmin.message_user(
+        request, f"Sent {stats['sent']} invitation(s); {stats['failed']} failed.", level
+    )
+
+
+@admin.register(PendingUser)
+class PendingUserAdmin(admin.ModelAdmin):
+    list_display = ("last_name", "first_name", "email", "category", "is_validated")
+    list_filter = ("category", "is_validated")
+    search_fields = ("first_name", "last_name", "email")
+    actions = [send_invitation_action]
+
+
+@admin.register(AccessLink)
+class AccessLinkAdmin(admin.ModelAdmin):
+    list_display = ("email", "created_at", "expires_at", "used")
+    list_filter = ("used",)
+    search_fields = ("email",)
+
+
+@admin.register(TourCapacity)
+class TourCapacityAdmin(admin.ModelAdmin):
+    list_display = ("tour", "event", "capacity", "reserved")
+    list_filter = ("event",)
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(admin.ModelAdmin):
+    """Read-only: the table is append-only."""
+    list_display = ("created_at", "actor", "action", "entity", "object_key", "path")
+    list_filter = ("entity", "action")
+    search_fields = ("actor", "object_key")
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
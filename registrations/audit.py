@@ -0,0 +1,180 @@
+# registrations/audit.py
+"""
+Audit trail for participant and pending-user changes. Write paths call
+record() with the row before and after; inside a request the entries are
+buffered in a context variable and AuditMiddleware writes them all with one
+multi-row INSERT after the view returns, so auditing costs at most one
+statement per request. Outside a request (commands, shell) wrap the work in
+buffered(), or each record() is written on its own.
+
+The table (AuditEntry) is append-only and, on PostgreSQL, partitioned by
+month; see `manage.py audit_partitions`.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .constants import ACCESS_SESSION_KEY
+from .models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+TABLE = AuditEntry._meta.db_table
+BATCH_SIZE = 1000  # rows per INSERT; a request rarely gets near it, a roster sync can
+
+# {"entries": [AuditEntry, ...], "actor": default actor} while buffering
+_buffer: ContextVar[dict | None] = ContextVar("flc_audit_buffer", default=None)
+
+
+def _enabled() -> bool:
+    return getattr(settings, "AUDIT_ENABLED", True)
+
+
+def record(action: str, entity: str, key="", before=None, after=None, actor: str = "") -> None:
+    """Log one change; `before`/`after` are JSON-able dicts (None for inserts/deletes)."""
+    if not _enabled():
+        return
+    buf = _buffer.get()
+    entry = AuditEntry(
+        created_at=timezone.now(), action=action, entity=entity, object_key=str(key)[:64],
+        actor=(actor or (buf or {}).get("actor") or "")[:254], before=before, after=after,
+    )
+    if buf is None:
+        write([entry])
+    else:
+        buf["entries"].append(entry)
+
+
+def write(entries, path: str = "") -> None:
+    """One INSERT for all `entries`. Never raises: a lost audit line must not fail the change it describes."""
+    if not entries:
+        return
+    for entry in entries:
+        entry.path = entry.path or path[:200]
+    try:
+        AuditEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    except Exception:
+        logger.exception("Could not write %d audit entries", len(entries))
+
+
+@contextmanager
+def buffered(actor: str = "", path: str = ""):
+    """Collect record() calls and write them in one INSERT at the end; nests into an open buffer."""
+    if _buffer.get() is not None:
+        yield
+        return
+    token = _buffer.set({"entries": [], "actor": actor})
+    try:
+        yield
+    finally:
+        entries = _buffer.get()["entries"]
+        _buffer.reset(token)
+        write(entries, path)
+
+
+def _request_actor(request) -> str:
+    """Staff username, else the advisor email the session was granted."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.get_username()
+    session = getattr(request, "session", None)
+    return (session.get(ACCESS_SESSION_KEY) or "") if session is not None else ""
+
+
+class AuditMiddleware:
+    """
+    Buffers the request's audit entries and flushes them in one INSERT once
+    the view has returned. Place it after AuthenticationMiddleware so the
+    actor can fall back to the logged-in user or the session's advisor.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _take(self, request, token):
+        entries = _buffer.get()["entries"]
+        _buffer.reset(token)
+        anonymous = [entry for entry in entries if not entry.actor]
+        if anonymous:  # only then is the session/user worth loading
+            actor = _request_actor(request)[:254]
+            for entry in anonymous:
+                entry.actor = actor
+        return entries
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _buffer.set({"entries": [], "actor": ""})
+        try:
+            response = self.get_response(request)
+        finally:
+            entries = self._take(request, token)
+            write(entries, request.path)
+        return response
+
+    async def __acall__(self, request):
+        token = _buffer.set({"entries": [], "actor": ""})
+        try:
+            response = await self.get_response(request)
+        finally:
+            entries = self._take(request, token)
+            if entries:
+                await sync_to_async(write)(entries, request.path)
+        return response
+
+
+# ---- partitions (PostgreSQL) ---------------------------------------------------
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def next_month(month: datetime.date) -> datetime.date:
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{TABLE}_y{month:%Y}m{month:%m}"
+
+
+def attached_partitions() -> dict[str, str]:
+    """{partition name: bound expression} for the audit table's current partitions."""
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        return dict(cur.fetchall())
+
+
+def create_partition(month: datetime.date) -> bool:
+    """Partition for `month`; False if it already exists. Rows already in the default partition block it."""
+    name = partition_name(month)
+    if name in attached_partitions():
+        return False
+    with connection.cursor() as cur:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month}') TO ('{next_month(month)}')"
+        )
+    return True
+
+
+def detach_partition(name: str) -> None:
+    """Detached partitions keep their rows as a plain table: archive or drop them separately."""
+    with connection.cursor() as cur:
+        cur.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
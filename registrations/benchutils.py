@@ -0,0 +1,113 @@
+# registrations/benchutils.py
+"""Small helpers shared by the bench_* management commands."""
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import time
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Latency summary in milliseconds: mean and p50/p95/p99/max."""
+    if not samples_ms:
+        return {"n": 0}
+    ordered = sorted(samples_ms)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(pct(50), 3),
+        "p95": round(pct(95), 3),
+        "p99": round(pct(99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn once; returns (result, elapsed_ms)."""
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return ""
+
+
+def write_json(path: str, data: dict) -> None:
+    with open(path, "w") as fh:
+        json.dump(data, fh, indent=2, default=str)
+
+
+def http_request(conn_cache: dict, url: str, method: str = "GET", body: bytes | None = None,
+                 headers: dict | None = None, timeout: float = 30.0):
+    """
+    One request on a per-thread keep-alive connection (conn_cache is per thread).
+    Returns (status, response_headers, body_bytes); status 0 means a transport error.
+    """
+    import http.client
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    conn = conn_cache.get(key)
+    if conn is None:
+        cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = conn_cache[key] = cls(parts.netloc, timeout=timeout)
+    path = parts.path + ("?" + parts.query if parts.query else "")
+    try:
+        conn.request(method, path or "/", body=body, headers=headers or {})
+        resp = conn.getresponse()
+        data = resp.read()
+        return resp.status, dict(resp.getheaders()), data
+    except Exception:
+        conn.close()
+        conn_cache.pop(key, None)
+        return 0, {}, b""
+
+
+def http_load(url: str, concurrency: int, duration: float, method: str = "GET",
+              body: bytes | None = None, headers: dict | None = None) -> dict:
+    """Hammer one URL from `concurrency` threads for `duration` seconds."""
+    import threading
+
+    samples: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors
+        conns: dict = {}
+        local, local_err = [], 0
+        while time.perf_counter() < stop_at:
+            t0 = time.perf_counter()
+            status, _, _ = http_request(conns, url, method, body, headers)
+            local.append((time.perf_counter() - t0) * 1000.0)
+            if not 200 <= status < 400:
+                local_err += 1
+        with lock:
+            samples.extend(local)
+            errors += local_err
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0,
+        "latency_ms": summarize(samples),
+    }
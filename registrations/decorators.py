@@ -1,6 +1,9 @@
 # registrations/decorators.py
+from datetime import timedelta
+
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.utils import timezone
 from .constants import ACCESS_SESSION_KEY
 
 def require_access(viewfunc):
@@ -10,3 +13,39 @@ def require_access(viewfunc):
             return redirect("registrations:user_access")  # or "registrations:access_request"
         return viewfunc(request, *args, **kwargs)
     return _wrapped
+
+# Re-granting refreshes the expiry once less than this fraction of max_age is left.
+REFRESH_BELOW = 0.5
+_SECOND = timedelta(seconds=1)
+
+def _expiry_stale(remaining, remaining_a_second_ago, max_age):
+    # A relative (or default) expiry reports the same age whatever the modification
+    # time, so it can't say how much is left; only an absolute one counts down.
+    return remaining == remaining_a_second_ago or remaining < max_age * REFRESH_BELOW
+
+def grant_access(request, email, max_age=None):
+    """
+    Store the verified email in the session. Re-granting the same email skips
+    the redundant write, and the expiry (stored as an absolute time) is only
+    pushed out once it runs low, so most repeat visits don't cost a session
+    UPDATE (and with signed-cookie sessions, no new Set-Cookie).
+    """
+    session = request.session
+    if session.get(ACCESS_SESSION_KEY) != email:
+        session[ACCESS_SESSION_KEY] = email
+    if max_age:
+        now = timezone.now()
+        ages = session.get_expiry_age(modification=now), session.get_expiry_age(modification=now - _SECOND)
+        if _expiry_stale(*ages, max_age):
+            session.set_expiry(timedelta(seconds=max_age))
+
+async def agrant_access(request, email, max_age=None):
+    """Async twin of grant_access for views_async (session I/O via the async session API)."""
+    session = request.session
+    if await session.aget(ACCESS_SESSION_KEY) != email:
+        await session.aset(ACCESS_SESSION_KEY, email)
+    if max_age:
+        now = timezone.now()
+        ages = await session.aget_expiry_age(modification=now), await session.aget_expiry_age(modification=now - _SECOND)
+        if _expiry_stale(*ages, max_age):
+            await session.aset_expiry(timedelta(seconds=max_age))
@@ -0,0 +1,134 @@
+# registrations/dedupe.py
+"""
+Duplicate participant detection. Every participant row (both raw tables) and
+every FLCRegistration stores a match key: first name, last name and
+college/company, casefolded with accents and punctuation stripped, so
+"José  Núñez-Ruiz" and "jose nunezruiz" at the same college collide (within
+one event: the same student coming back next year is no duplicate). Saves
+from either form warn after one probe of the indexed key across all three
+tables (find_matches); report() groups them by key in a single windowed query
+instead of comparing rows pairwise.
+
+Rows written before the key existed have none until `manage.py
+find_duplicates --backfill` fills them in.
+"""
+from __future__ import annotations
+
+import unicodedata
+
+from django.db import connection
+
+from . import events
+
+BACKFILL_BATCH = 1000
+
+
+def _fold(value: str) -> str:
+    text = unicodedata.normalize("NFKD", value or "")
+    return "".join(ch for ch in text if ch.isalnum()).casefold()
+
+
+def match_key(first: str, last: str, college: str = "") -> str:
+    return f"{_fold(first)}|{_fold(last)}|{_fold(college)}"
+
+
+def _sources() -> list[str]:
+    """One SELECT (param: event) per table that carries match_key; src is the rowkey prefix ('r' = FLCRegistration)."""
+    from .views_flat import _TABLES, _has_match_key
+
+    cols = "id, first_name, last_name, college_company, advisor_email, created_at, match_key"
+    out = [f"SELECT '{src}' AS src, {cols} FROM {table} WHERE event=%s"
+           for src, table in _TABLES.items() if _has_match_key(table)]
+    out.append("SELECT 'r' AS src, r.id, r.first_name, r.last_name, r.college_company, a.email, "
+               "r.created_at, r.match_key FROM registrations_flcregistration r "
+               "JOIN registrations_pendinguser a ON a.id = r.advisor_id WHERE r.event=%s")
+    return out
+
+
+def find_matches(keys, limit: int = 5, event: str | None = None, exclude=None) -> list[tuple]:
+    """
+    Rows of both families (raw participant tables and FLCRegistration) whose
+    match_key is in `keys`, for `event` (default: the current one):
+    [(src, id, first, last, advisor email)], one indexed UNION. `exclude` is a
+    (src, id) pair to leave out, e.g. the row being saved.
+    """
+    from .views_flat import _TABLES, _has_match_key, _try_select
+
+    keys = sorted(set(k for k in keys if k))
+    if not keys:
+        return []
+    marks = ",".join(["%s"] * len(keys))
+    selects = [f"SELECT '{src}', id, first_name, last_name, advisor_email FROM {table} "
+               f"WHERE event=%s AND match_key IN ({marks})"
+               for src, table in _TABLES.items() if _has_match_key(table)]
+    selects.append("SELECT 'r', r.id, r.first_name, r.last_name, a.email FROM registrations_flcregistration r "
+                   "JOIN registrations_pendinguser a ON a.id = r.advisor_id "
+                   f"WHERE r.event=%s AND r.match_key IN ({marks})")
+    rows = _try_select(" UNION ALL ".join(selects) + " LIMIT %s;",
+                       [event or events.current(), *keys] * len(selects) + [limit + (1 if exclude else 0)]) or []
+    return [r for r in rows if exclude is None or (r[0], r[1]) != tuple(exclude)][:limit]
+
+
+def report(limit: int = 5000) -> list[dict]:
+    """
+    The current event's groups of rows sharing a match key, largest first:
+    [{"key", "rows": [{"src", "id", "first", "last", "college", "advisor", "created_at"}, ...]}].
+    """
+    sources = _sources()
+    union = " UNION ALL ".join(sources)
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT src, id, first_name, last_name, college_company, advisor_email, created_at, match_key, n "
+            f"FROM (SELECT u.*, COUNT(*) OVER (PARTITION BY match_key) AS n FROM ({union}) u "
+            f"      WHERE match_key IS NOT NULL AND match_key <> '') d "
+            f"WHERE n > 1 ORDER BY n DESC, match_key, created_at LIMIT %s",
+            [events.current()] * len(sources) + [limit],
+        )
+        rows = cur.fetchall()
+    groups: dict[str, dict] = {}
+    for src, pid, first, last, college, advisor, created, key, _ in rows:
+        groups.setdefault(key, {"key": key, "rows": []})["rows"].append({
+            "src": src, "id": pid, "first": first, "last": last, "college": college or "",
+            "advisor": advisor or "", "created_at": created,
+        })
+    return list(groups.values())
+
+
+def backfill() -> int:
+    """Set match_key on rows that predate it, in batches; returns the number of rows filled."""
+    from .models import FLCRegistration
+    from .views_flat import _TABLES, _has_match_key
+
+    filled = 0
+    for table in _TABLES.values():
+        if not _has_match_key(table):
+            continue
+        while True:
+            with connection.cursor() as cur:
+                cur.execute(f"SELECT id, first_name, last_name, college_company FROM {table} "
+                            f"WHERE match_key IS NULL LIMIT %s", [BACKFILL_BATCH])
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                cur.executemany(f"UPDATE {table} SET match_key=%s WHERE id=%s",
+                                [(match_key(f, l, c), pid) for pid, f, l, c in rows])
+            filled += len(rows)
+
+    stale = [reg for reg in FLCRegistration.objects.filter(match_key="").only(
+        "id", "first_name", "last_name", "college_company")]
+    for reg in stale:
+        reg.refresh_match_key()
+    FLCRegistration.objects.bulk_update(stale, ["match_key"], batch_size=BACKFILL_BATCH)
+    return filled + len(stale)
+
+
+def describe(matches, advisor_email: str) -> str:
+    """Warning text for find_matches() rows [(src, id, first, last, advisor), ...]; '' if none."""
+    if not matches:
+        return ""
+    def whose(advisor):
+        if (advisor or "").lower() == (advisor_email or "").lower():
+            return "already on your list"
+        return f"registered by {advisor}"
+    names = ", ".join(f"{first} {last} ({whose(advisor)})" for _, _, first, last, advisor in matches)
+    return f"Possible duplicate: {names}."
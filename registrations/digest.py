@@ -0,0 +1,144 @@
+# registrations/digest.py
+"""
+Digest coalescing for participant notifications.
+
+A save only records a ParticipantEvent row (one small INSERT, no SMTP). The
+flush_digests command later sends each advisor a single digest once their
+burst has gone quiet for DIGEST_QUIET_SECONDS, or after DIGEST_MAX_DELAY_SECONDS
+of continuous activity. The digest carries the same summary table and CSV the
+Finish button produces.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+from django.utils.html import escape
+
+from .mailers import send_html
+from .models import ParticipantEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def record_event(advisor_email: str, action: str, first: str = "", last: str = "") -> None:
+    if not _setting("DIGEST_ENABLED", True) or not advisor_email:
+        return
+    try:
+        ParticipantEvent.objects.create(
+            advisor_email=advisor_email.strip().lower(), action=action,
+            first_name=first[:120], last_name=last[:120],
+        )
+    except Exception:
+        logger.exception("Could not record participant event for %s", advisor_email)
+
+
+def record_events(advisor_email: str, action: str, names) -> None:
+    """record_event for many (first, last) pairs in one INSERT (batch saves)."""
+    if not _setting("DIGEST_ENABLED", True) or not advisor_email:
+        return
+    email = advisor_email.strip().lower()
+    try:
+        ParticipantEvent.objects.bulk_create([
+            ParticipantEvent(advisor_email=email, action=action, first_name=first[:120], last_name=last[:120])
+            for first, last in names
+        ])
+    except Exception:
+        logger.exception("Could not record participant events for %s", advisor_email)
+
+
+def due_advisors(now=None) -> list[str]:
+    """Advisors whose burst is quiet (or has run past the max delay)."""
+    now = now or timezone.now()
+    quiet_cutoff = now - timedelta(seconds=_setting("DIGEST_QUIET_SECONDS", 300))
+    max_cutoff = now - timedelta(seconds=_setting("DIGEST_MAX_DELAY_SECONDS", 3600))
+    groups = (ParticipantEvent.objects.values("advisor_email")
+              .annotate(first=Min("created_at"), last=Max("created_at")))
+    return [g["advisor_email"] for g in groups
+            if g["last"] <= quiet_cutoff or g["first"] <= max_cutoff]
+
+
+def _digest_html(advisor: str, events, table_html: str, count: int, total: int) -> str:
+    added = sum(1 for e in events if e.action == "added")
+    removed = sum(1 for e in events if e.action == "deleted")
+    changes = "".join(
+        f"<li>{escape(e.action)}: {escape(e.first_name)} {escape(e.last_name)}</li>" for e in events
+    )
+    return f"""
+    <p>Registration activity for <strong>{escape(advisor)}</strong>:
+       {added} added, {removed} removed.</p>
+    <ul>{changes}</ul>
+    <p>Current list: {count} participant(s), total $ {total}. The CSV is attached.</p>
+    {table_html}
+    """
+
+
+def _aware(value):
+    # raw cursors return naive UTC datetimes on sqlite
+    return value if timezone.is_aware(value) else timezone.make_aware(value, dt_timezone.utc)
+
+
+def flush_advisor(advisor: str) -> int:
+    """Send one digest for `advisor`. Returns the number of events it covered."""
+    from .views_flat import _build_table_and_csv, _select_participants_for_advisor
+
+    # Claim and read in one statement: overlapping flushers each get a disjoint
+    # set of events and send exactly what they removed, so none is dropped unsent.
+    with connection.cursor() as cur:
+        cur.execute(
+            f"DELETE FROM {ParticipantEvent._meta.db_table} WHERE advisor_email=%s "
+            f"RETURNING id, advisor_email, action, first_name, last_name, created_at",
+            [advisor],
+        )
+        claimed = cur.fetchall()
+    if not claimed:
+        return 0
+    events = sorted(
+        (ParticipantEvent(id=pid, advisor_email=email, action=action, first_name=first, last_name=last,
+                          created_at=_aware(created))
+         for pid, email, action, first, last, created in claimed),
+        key=lambda e: (e.created_at, e.id),
+    )
+
+    rows = _select_participants_for_advisor(advisor, 500)
+    table_html, csv_text, count, total = _build_table_and_csv(rows)
+    admin = _setting("DIGEST_ADMIN_EMAIL", "")
+    try:
+        send_html(
+            advisor,
+            f"FLC Registration update: {len(events)} change(s)",
+            _digest_html(advisor, events, table_html, count, total),
+            attachments=[("flc_summary.csv", csv_text, "text/csv")],
+            bcc=[admin] if admin else None,
+        )
+    except Exception:
+        logger.exception("Digest send failed for %s; re-queueing %d events", advisor, len(events))
+        for e in events:
+            e.pk = None
+        ParticipantEvent.objects.bulk_create(events)
+        return 0
+    return len(events)
+
+
+def flush_due(now=None) -> dict:
+    sent = events = 0
+    for advisor in due_advisors(now):
+        n = flush_advisor(advisor)
+        if n:
+            sent += 1
+            events += n
+    return {"digests": sent, "events": events}
+
+
+def pending_summary() -> dict:
+    agg = ParticipantEvent.objects.aggregate(events=Count("id"), oldest=Min("created_at"))
+    agg["advisors"] = ParticipantEvent.objects.values("advisor_email").distinct().count()
+    return agg
@@ -1,27 +1,170 @@
 # registrations/email_utils.py
 
+import logging
 import os
-from typing import Optional
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import threading
+import time
+from typing import Iterable, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from sendgrid.helpers.mail import Mail, To
+from django.utils.module_loading import import_string
+
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+# SendGrid accepts at most 1000 personalizations per /mail/send request
+MAX_PERSONALIZATIONS = 1000
+
+
+class SendGridTransport:
+    """Posts v3 mail payloads over one keep-alive session (connections are pooled)."""
+
+    def __init__(self, api_key: str, pool_size: int = 10, timeout: float = 10.0):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+
+    def send(self, payload: dict) -> int:
+        resp = self.session.post(SENDGRID_SEND_URL, json=payload, timeout=self.timeout)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+        return resp.status_code
+
+
+class FakeTransport:
+    """
+    Offline transport: keeps payloads in memory and answers 202 like SendGrid.
+    `latency_ms` simulates the API round trip so throughput can be benchmarked.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.sent: list[dict] = []
+        self._lock = threading.Lock()
+
+    def send(self, payload: dict) -> int:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        with self._lock:
+            self.sent.append(payload)
+        return 202
+
+    @property
+    def recipients(self) -> int:
+        return sum(len(p.get("personalizations", [])) for p in self.sent)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def _build_transport():
+    # SENDGRID_TRANSPORT=fake, or a dotted path to any class with .send(payload) -> status
+    choice = os.environ.get("SENDGRID_TRANSPORT", "").strip()
+    if choice == "fake":
+        return FakeTransport()
+    if choice:
+        return import_string(choice)()
+    api_key = os.environ.get("SENDGRID_API_KEY")
+    if not api_key:
+        return None
+    return SendGridTransport(api_key)
+
+
+def get_transport():
+    """Module-level transport, built once per process and shared by all sends."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = _build_transport()
+    return _transport
+
+
+def set_transport(transport) -> None:
+    """Swap the transport (e.g. a FakeTransport in benchmarks); None rebuilds from env."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
+
+
+def _sender(from_email: Optional[str]) -> str:
+    return from_email or os.environ.get("DEFAULT_FROM_EMAIL", "noreply@example.com")
+
+
+@timed("mail")
 def send_email(
     subject: str,
     to_email: str | list[str],
     html_content: str,
     from_email: Optional[str] = None,
 ) -> int | None:
-    sender = from_email or os.environ.get("DEFAULT_FROM_EMAIL", "noreply@example.com")
-    api_key = os.environ.get("SENDGRID_API_KEY")
-    if not api_key:
-        print("SendGrid error: SENDGRID_API_KEY is not set.")
+    transport = get_transport()
+    if transport is None:
+        logger.error("SendGrid error: SENDGRID_API_KEY is not set.")
         return None
 
-    message = Mail(from_email=sender, to_emails=to_email, subject=subject, html_content=html_content)
+    message = Mail(from_email=_sender(from_email), to_emails=to_email, subject=subject, html_content=html_content)
     try:
-        sg = SendGridAPIClient(api_key)
-        resp = sg.send(message)
-        return resp.status_code  # 202 == accepted
+        return transport.send(message.get())  # 202 == accepted
     except Exception as e:
-        print(f"SendGrid error: {e}")
+        logger.warning("SendGrid error: %s", e)
         return None
+
+
+@timed("mail")
+def send_bulk(
+    subject: str,
+    recipients: Iterable[str | tuple[str, dict]],
+    html_content: str,
+    from_email: Optional[str] = None,
+) -> int:
+    """
+    Send one message to many recipients, packing up to MAX_PERSONALIZATIONS
+    into each API call. Each recipient gets its own personalization, so nobody
+    sees the other addresses. A recipient may be (email, substitutions) where
+    substitutions maps tags in `html_content` (e.g. "-link-") to per-recipient values.
+
+    Returns the number of recipients SendGrid accepted.
+    """
+    transport = get_transport()
+    if transport is None:
+        logger.error("SendGrid error: SENDGRID_API_KEY is not set.")
+        return 0
+
+    sender = _sender(from_email)
+    accepted = 0
+    batch: list[To] = []
+
+    def _flush():
+        nonlocal accepted
+        if not batch:
+            return
+        message = Mail(from_email=sender, to_emails=list(batch), subject=subject,
+                       html_content=html_content, is_multiple=True)
+        try:
+            transport.send(message.get())
+            accepted += len(batch)
+        except Exception as e:
+            logger.warning("SendGrid bulk error (%d recipients): %s", len(batch), e)
+        batch.clear()
+
+    for rcpt in recipients:
+        if isinstance(rcpt, (list, tuple)):
+            email, subs = rcpt
+            batch.append(To(email, substitutions=subs or None))
+        else:
+            batch.append(To(rcpt))
+        if len(batch) >= MAX_PERSONALIZATIONS:
+            _flush()
+    _flush()
+    return accepted
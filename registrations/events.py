@@ -0,0 +1,125 @@
+# registrations/events.py
+"""
+Event (conference year) scoping. Participant rows (both raw tables) and
+FLCRegistration carry the event they were registered for, and every read and
+write filters on settings.CURRENT_EVENT, so past events drop out of the
+advisor pages, reports and duplicate checks.
+
+On PostgreSQL the raw participant tables can be LIST-partitioned by event
+(`manage.py event_partitions --convert`): the event filter then prunes every
+query to the current event's partition, and an old event is detached with
+one ALTER TABLE instead of a bulk DELETE. Rows for an event without its own
+partition land in the table's default partition until --create moves them.
+"""
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+# also keeps event names safe to inline in partition DDL, which takes no parameters
+EVENT_RE = re.compile(r"^[A-Za-z0-9_-]{1,40}$")
+
+
+def current() -> str:
+    event = str(getattr(settings, "CURRENT_EVENT", "") or "")
+    if not EVENT_RE.match(event):
+        raise ImproperlyConfigured(f"CURRENT_EVENT must be 1-40 letters, digits, '-' or '_' (got {event!r})")
+    return event
+
+
+def check(event: str) -> str:
+    if not EVENT_RE.match(event or ""):
+        raise ValueError(f"Bad event name {event!r}")
+    return event
+
+
+def partition_name(table: str, event: str) -> str:
+    return f"{table}_e{check(event).lower().replace('-', '_')}"
+
+
+def default_partition(table: str) -> str:
+    return f"{table}_default"
+
+
+# ---- partitions (PostgreSQL) ---------------------------------------------------
+
+def is_partitioned(table: str) -> bool:
+    with connection.cursor() as cur:
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cur.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def partitions(table: str) -> dict[str, str]:
+    """{partition name: bound expression} for `table`'s attached partitions."""
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+            [table],
+        )
+        return dict(cur.fetchall())
+
+
+def convert(table: str) -> list[str]:
+    """
+    Rebuild plain `table` as a table LIST-partitioned by event, one partition
+    per event already present plus a default one. Runs in one transaction
+    holding an exclusive lock; ids (and their sequence) are kept. Returns the
+    partitions created.
+    """
+    old = f"{table}_unpartitioned"
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        cur.execute(f"SELECT DISTINCT event FROM {table}")
+        found = sorted(check(e) for (e,) in cur.fetchall())
+        cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        sequence = cur.fetchone()[0]
+
+        cur.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        cur.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY LIST (event)")
+        created = [default_partition(table)]
+        cur.execute(f"CREATE TABLE {created[0]} PARTITION OF {table} DEFAULT")
+        for event in found:
+            created.append(partition_name(table, event))
+            cur.execute(f"CREATE TABLE {created[-1]} PARTITION OF {table} FOR VALUES IN ('{event}')")
+        cur.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        if sequence:
+            cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+        cur.execute(f"DROP TABLE {old}")  # frees its index names for the ones below
+
+        # unique keys must include the partition key
+        cur.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, event)")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_match_key_idx ON {table} (match_key)")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_advisor_idx ON {table} (advisor_email)")
+    return created
+
+
+def create_partition(table: str, event: str) -> bool:
+    """
+    Partition for `event`; False if it exists. Rows already filed in the
+    default partition for that event move into it in the same transaction.
+    """
+    name = partition_name(table, event)
+    if name in partitions(table):
+        return False
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        cur.execute(
+            f"WITH moved AS (DELETE FROM {default_partition(table)} WHERE event=%s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            [event],
+        )
+        cur.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ('{event}')")
+    return True
+
+
+def detach_partition(table: str, event: str) -> str:
+    """Detached, the event's rows stay in a plain table of the same name: archive or drop it separately."""
+    name = partition_name(table, event)
+    with connection.cursor() as cur:
+        cur.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+    return name
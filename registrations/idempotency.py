@@ -0,0 +1,65 @@
+# registrations/idempotency.py
+"""
+Idempotency keys for form POSTs. Each rendered form carries a fresh random key;
+the first POST with that key claims it with one INSERT ... ON CONFLICT into
+IdempotencyKey (UNIQUE advisor, key), later ones (double clicks, mobile
+retries) get the stored outcome back instead of writing again. The claim lives
+in the database, not the cache, so it holds across workers even when the cache
+is per-process. Entries live for IDEMPOTENCY_TTL_SECONDS; purge_expired
+removes them afterwards.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+_TABLE = IdempotencyKey._meta.db_table
+
+# An expired claim is taken over in place, so a stale row never blocks a key.
+_CLAIM_SQL = (
+    f"INSERT INTO {_TABLE} (advisor, key, outcome, expires_at) VALUES (%s, %s, NULL, %s) "
+    f"ON CONFLICT (advisor, key) DO UPDATE SET outcome = NULL, expires_at = EXCLUDED.expires_at "
+    f"WHERE {_TABLE}.expires_at < %s"
+)
+
+
+def new_key() -> str:
+    return uuid.uuid4().hex
+
+
+def _expires_at():
+    return timezone.now() + timedelta(seconds=getattr(settings, "IDEMPOTENCY_TTL_SECONDS", 600))
+
+
+def begin(scope: str, key: str):
+    """
+    Returns (True, None) if this request owns the key and should do the work,
+    or (False, outcome) for a replay; outcome is None while the first request
+    is still running. Requests without a key always proceed.
+    """
+    if not key:
+        return True, None
+    with connection.cursor() as cur:
+        cur.execute(_CLAIM_SQL, [scope, key[:64], _expires_at(), timezone.now()])
+        if cur.rowcount:
+            return True, None
+    outcome = IdempotencyKey.objects.filter(advisor=scope, key=key[:64]).values_list("outcome", flat=True).first()
+    return False, outcome
+
+
+def finish(scope: str, key: str, outcome: dict) -> None:
+    """Remember the outcome so replays return it."""
+    if key:
+        IdempotencyKey.objects.filter(advisor=scope, key=key[:64]).update(outcome=outcome, expires_at=_expires_at())
+
+
+def release(scope: str, key: str) -> None:
+    """Forget the key (e.g. the write failed) so a retry may run again."""
+    if key:
+        IdempotencyKey.objects.filter(advisor=scope, key=key[:64]).delete()
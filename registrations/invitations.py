@@ -0,0 +1,125 @@
+# registrations/invitations.py
+"""
+Bulk invitation campaigns: one AccessLink bulk_create and one SendGrid call
+per batch instead of a link + email round trip per advisor.
+"""
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils import timezone
+
+from . import email_utils
+from .models import AccessLink, PendingUser
+
+INVITE_SUBJECT = "Your FLC Registration access link"
+INVITE_TEMPLATE = "registrations/email/invitation.html"
+DEFAULT_TTL_MINUTES = 7 * 24 * 60
+
+
+def select_invitees(category: str = "", validated: Optional[bool] = None,
+                    resend: bool = False) -> QuerySet:
+    """
+    PendingUsers matching the filters. Unless `resend`, anyone still holding an
+    unused, unexpired AccessLink is skipped, so re-running an interrupted
+    campaign picks up where it stopped.
+    """
+    qs = PendingUser.objects.filter(is_active=True)
+    if category:
+        qs = qs.filter(category__iexact=category)
+    if validated is not None:
+        qs = qs.filter(is_validated=validated)
+    if not resend:
+        live = AccessLink.objects.filter(used=False, expires_at__gt=timezone.now()).values("email")
+        qs = qs.exclude(email__in=live)
+    return qs.order_by("id")
+
+
+def _ttl_label(minutes: int) -> str:
+    if minutes % (24 * 60) == 0:
+        days = minutes // (24 * 60)
+        return f"{days} day{'s' if days != 1 else ''}"
+    return f"{minutes} minutes"
+
+
+def send_invitations(
+    users: QuerySet,
+    base_url: str,
+    ttl_minutes: int = DEFAULT_TTL_MINUTES,
+    batch_size: int = 500,
+    after_id: int = 0,
+    dry_run: bool = False,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Walk `users` by id in batches. Per batch: bulk_create the AccessLinks, then
+    hand every recipient to email_utils.send_bulk in one call. If a batch is
+    not accepted its links are deleted again so a resumed run retries it.
+    `progress` gets a stats dict after every batch (includes `last_id` for --after-id).
+    """
+    batch_size = max(1, min(batch_size, email_utils.MAX_PERSONALIZATIONS))
+    html = render_to_string(INVITE_TEMPLATE, {"ttl_label": _ttl_label(ttl_minutes)})
+    base_url = base_url.rstrip("/")
+
+    stats = {"total": users.filter(id__gt=after_id).count(), "sent": 0, "failed": 0,
+             "batches": 0, "last_id": after_id, "elapsed": 0.0}
+    started = time.perf_counter()
+    last_id = after_id
+
+    while True:
+        batch = list(users.filter(id__gt=last_id).only("id", "email", "first_name")[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        if dry_run:
+            stats["sent"] += len(batch)
+        elif getattr(settings, "ACCESS_LINK_MODE", "db") == "signed":
+            # Stateless links: nothing to insert, nothing to roll back (resume with --after-id).
+            recipients = [
+                (u.email, {
+                    "-first-": escape(u.first_name or "there"),
+                    "-link-": base_url + reverse(
+                        "registrations:registrations_signed_access_link",
+                        args=[AccessLink.issue_token(u.email, ttl_minutes, user_id=u.id)],
+                    ),
+                })
+                for u in batch
+            ]
+            accepted = email_utils.send_bulk(INVITE_SUBJECT, recipients, html)
+            stats["sent"] += accepted
+            stats["failed"] += len(batch) - accepted
+        else:
+            expires = timezone.now() + timedelta(minutes=ttl_minutes)
+            links = AccessLink.objects.bulk_create(
+                [AccessLink(email=u.email, expires_at=expires) for u in batch]
+            )
+            recipients = [
+                (u.email, {
+                    "-first-": escape(u.first_name or "there"),
+                    "-link-": base_url + reverse("registrations:registrations_access_link", args=[link.token]),
+                })
+                for u, link in zip(batch, links)
+            ]
+            accepted = email_utils.send_bulk(INVITE_SUBJECT, recipients, html)
+            if accepted == len(batch):
+                stats["sent"] += accepted
+            else:
+                AccessLink.objects.filter(token__in=[l.token for l in links]).delete()
+                stats["failed"] += len(batch)
+
+        stats["batches"] += 1
+        stats["last_id"] = last_id
+        stats["elapsed"] = time.perf_counter() - started
+        if progress:
+            progress(dict(stats))
+
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
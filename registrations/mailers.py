@@ -1,12 +1,19 @@
 from django.conf import settings
 from django.core.mail import EmailMessage
 
-def send_html(to_email: str, subject: str, html: str):
+from .timing import timed
+
+@timed("mail")
+def send_html(to_email: str, subject: str, html: str, attachments=None, bcc=None):
+    """attachments: optional list of (filename, content, mimetype)."""
     email = EmailMessage(
         subject=subject,
         body=html,
         from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
         to=[to_email],
+        bcc=bcc or None,
     )
     email.content_subtype = "html"
+    for filename, content, mimetype in attachments or []:
+        email.attach(filename, content, mimetype)
     email.send(fail_silently=False)
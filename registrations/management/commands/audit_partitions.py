@@ -0,0 +1,51 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from registrations import audit
+
+
+class Command(BaseCommand):
+    help = ("Create the audit log's monthly partitions ahead of time and detach months older than "
+            "the retention window (PostgreSQL only). Detached months stay as plain tables to archive.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=3, help="Months to create beyond the current one")
+        parser.add_argument("--retain-months", type=int, default=None,
+                            help="Detach partitions older than this many months (default AUDIT_RETAIN_MONTHS; 0 = keep all)")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            self.stdout.write("Audit partitions are PostgreSQL-only; nothing to do.")
+            return
+
+        month = audit.month_start(datetime.date.today())
+        for _ in range(opts["ahead"] + 1):
+            name = audit.partition_name(month)
+            if opts["dry_run"]:
+                self.stdout.write(f"would ensure {name}")
+            elif audit.create_partition(month):
+                self.stdout.write(f"created {name}")
+            month = audit.next_month(month)
+
+        retain = opts["retain_months"]
+        if retain is None:
+            retain = getattr(settings, "AUDIT_RETAIN_MONTHS", 24)
+        if retain:
+            cutoff = audit.month_start(datetime.date.today())
+            for _ in range(retain):
+                cutoff = (cutoff - datetime.timedelta(days=1)).replace(day=1)
+            oldest_kept = audit.partition_name(cutoff)
+            prefix = f"{audit.TABLE}_y"
+            # monthly names sort chronologically; the default partition never matches the prefix
+            for name in sorted(audit.attached_partitions()):
+                if name.startswith(prefix) and name < oldest_kept:
+                    if opts["dry_run"]:
+                        self.stdout.write(f"would detach {name}")
+                    else:
+                        audit.detach_partition(name)
+                        self.stdout.write(f"detached {name}")
+        self.stdout.write(self.style.SUCCESS("Audit partitions up to date."))
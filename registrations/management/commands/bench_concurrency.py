@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from registrations.benchutils import http_load, http_request
+
+ROOT = Path(__file__).resolve().parents[3]
+
+STACKS = {
+    # label: (gunicorn args, extra env)
+    "wsgi-sync": (["wsgi"], {}),
+    "asgi-uvicorn": (["asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+                     {"ASYNC_VIEWS": "1", "ASYNC_DB_DRIVER": "psycopg"}),
+}
+
+
+class Command(BaseCommand):
+    help = "Throughput at high concurrency: sync WSGI workers vs gunicorn+uvicorn ASGI workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/registrations/form/?email=advisor0@example.com")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--duration", type=float, default=20.0)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--url", action="append", default=[],
+                            help="label=base_url of an already running server (repeatable); "
+                                 "without it both stacks are spawned locally")
+
+    def _spawn(self, label, port, workers):
+        args, env = STACKS[label]
+        cmd = [sys.executable, "-m", "gunicorn", *args, "-w", str(workers), "-b", f"127.0.0.1:{port}",
+               "--log-level", "warning"]
+        proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **env, "RATE_LIMIT_ENABLED": "0"})
+        base = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            if http_request({}, base + "/registrations/sanity/")[0] == 200:
+                return proc, base
+            time.sleep(0.2)
+        proc.terminate()
+        raise CommandError(f"{label} did not start on port {port}")
+
+    def handle(self, *args, **opts):
+        targets, procs = [], []
+        try:
+            if opts["url"]:
+                targets = [tuple(u.split("=", 1)) for u in opts["url"]]
+            else:
+                for i, label in enumerate(STACKS):
+                    proc, base = self._spawn(label, 8101 + i, opts["workers"])
+                    procs.append(proc)
+                    targets.append((label, base))
+
+            for label, base in targets:
+                r = http_load(base + opts["path"], opts["concurrency"], opts["duration"])
+                lat = r["latency_ms"]
+                self.stdout.write(
+                    f"{label:14s} {r['rps']:8.1f} req/s  errors {r['error_rate']:.2%}  "
+                    f"p50 {lat.get('p50', 0):.1f}  p95 {lat.get('p95', 0):.1f}  p99 {lat.get('p99', 0):.1f} ms"
+                )
+        finally:
+            for proc in procs:
+                proc.terminate()
+                proc.wait(timeout=10)
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from registrations import email_utils
+from registrations.email_utils import FakeTransport
+
+
+class Command(BaseCommand):
+    help = "Offline throughput benchmark: per-message send_email vs batched send_bulk (fake transport)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=2000)
+        parser.add_argument("--latency-ms", type=float, default=20.0,
+                            help="Simulated SendGrid round trip per API call")
+
+    def handle(self, *args, **opts):
+        n, latency = opts["messages"], opts["latency_ms"]
+        recipients = [f"advisor{i}@example.com" for i in range(n)]
+        html = "<p>Hello -name-, your link is -link-</p>"
+
+        fake = FakeTransport(latency_ms=latency)
+        email_utils.set_transport(fake)
+        try:
+            t0 = time.perf_counter()
+            for r in recipients:
+                email_utils.send_email("Benchmark", r, html)
+            single = time.perf_counter() - t0
+            single_calls = len(fake.sent)
+
+            fake.sent.clear()
+            t0 = time.perf_counter()
+            email_utils.send_bulk("Benchmark", [(r, {"-name-": r, "-link-": "x"}) for r in recipients], html)
+            bulk = time.perf_counter() - t0
+            bulk_calls = len(fake.sent)
+        finally:
+            email_utils.set_transport(None)
+
+        self.stdout.write(f"send_email: {n} msgs, {single_calls} calls, {single:.2f}s ({n / single:.0f} msg/s)")
+        self.stdout.write(f"send_bulk:  {n} msgs, {bulk_calls} calls, {bulk:.2f}s ({n / bulk:.0f} msg/s)")
+        self.stdout.write(self.style.SUCCESS(f"Speedup x{single / bulk:.1f}"))
@@ -0,0 +1,199 @@
+import datetime
+import itertools
+import json
+import time
+import tracemalloc
+from importlib import import_module
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+
+from registrations import events, views_flat
+from registrations.benchutils import git_revision, summarize, write_json
+from registrations.forms import COLLEGE_COMPANIES, STUDENT_ORGS, TEE_SIZES, TOURS
+from registrations.models import ParticipantEvent, PendingUser
+from registrations.utils_tokens import make_validation_token
+
+ADVISOR_EMAIL = "bench-advisor{}@example.com"
+STUDENT_CATEGORY = "BenchStudent"
+
+
+def _routed(path):
+    """The view the live URL conf serves for `path`, callable synchronously."""
+    match = resolve(path.split("?")[0])
+    func = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+    return lambda request: func(request, *match.args, **match.kwargs)
+
+
+class Command(BaseCommand):
+    help = ("Micro-benchmarks for the registration views and helpers on seeded data: "
+            "latency percentiles, queries per call and allocations, saved as JSON")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--advisors", type=int, default=20)
+        parser.add_argument("--participants", type=int, default=25, help="Participants per advisor")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--only", default="", help="Comma-separated case names to run")
+        parser.add_argument("--json", default="", help="Output path (default bench-registrations-<rev>.json)")
+        parser.add_argument("--compare", default="", help="Earlier JSON result to print deltas against")
+        parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place")
+
+    # ---- data -------------------------------------------------------------
+
+    def _seed(self, advisors, per_advisor):
+        _, participant_ok = views_flat._ensure_flat_tables_if_missing()
+        table = "registrations_participant" if participant_ok else "registrations_participant_fallback"
+        PendingUser.objects.bulk_create(
+            [PendingUser(first_name="Bench", last_name=f"Advisor{i}", email=ADVISOR_EMAIL.format(i),
+                         category="Faculty") for i in range(advisors)]
+            + [PendingUser(first_name=f"Student{i}", last_name="Bench", email=f"bench-student{i}@example.com",
+                           category=STUDENT_CATEGORY) for i in range(advisors * per_advisor)],
+            batch_size=1000, ignore_conflicts=True,
+        )
+        cycle = zip(itertools.cycle(STUDENT_ORGS), itertools.cycle(TEE_SIZES),
+                    itertools.cycle(COLLEGE_COMPANIES), itertools.cycle(TOURS))
+        event = events.current()
+        rows = [
+            (f"P{i}", f"Bench{a}", org[0], size[0], college[0], tour[0], views_flat.FEE_CENTS, ADVISOR_EMAIL.format(a),
+             event)
+            for (a, i), (org, size, college, tour) in zip(
+                ((a, i) for a in range(advisors) for i in range(per_advisor)), cycle)
+        ]
+        with connection.cursor() as cur:
+            for start in range(0, len(rows), 1000):
+                cur.executemany(
+                    f"INSERT INTO {table} (first_name,last_name,student_organization,tee_shirt_size,"
+                    f"college_company,tour,fee_cents,advisor_email,event) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+                    rows[start:start + 1000],
+                )
+
+    def _cleanup(self):
+        like = ADVISOR_EMAIL.format("%")
+        for table in ("registrations_participant", "registrations_participant_fallback"):
+            views_flat._try_exec(f"DELETE FROM {table} WHERE advisor_email LIKE %s", [like])
+        ParticipantEvent.objects.filter(advisor_email__startswith="bench-advisor").delete()
+        PendingUser.objects.filter(email__startswith="bench-").delete()
+
+    # ---- cases ------------------------------------------------------------
+
+    def _cases(self):
+        rf = RequestFactory()
+        engine = import_module(settings.SESSION_ENGINE)
+        adv = ADVISOR_EMAIL.format(0)
+        form = _routed("/registrations/form/")
+        names = _routed("/registrations/names-by-category/")
+        advisor = PendingUser.objects.get(email=adv)
+        token = make_validation_token(advisor.id, advisor.email)
+        validate = _routed(f"/registrations/validate/{token}/")
+        all_rows = views_flat._select_participants_all(2000)
+        post = {"first_name": "Bench", "last_name": "Post", "advisor_email": adv, "tee_shirt_size": "M"}
+
+        def with_session(req):
+            req.session = engine.SessionStore()
+            return req
+
+        return {
+            "form_get": lambda: form(rf.get("/registrations/form/", {"email": adv})),
+            "finish_advisor": lambda: form(rf.post("/registrations/form/", {"finish": "1", "advisor_email": adv})),
+            "finish_all": lambda: form(rf.post("/registrations/form/?all=1", {"finish": "1"})),
+            "build_table_and_csv": lambda: views_flat._build_table_and_csv(all_rows),
+            "names_by_category": lambda: names(rf.get("/registrations/names-by-category/",
+                                                      {"category": STUDENT_CATEGORY})),
+            "validate_user": lambda: validate(with_session(rf.get(f"/registrations/validate/{token}/"))),
+            # last: every call adds a row, which would skew the read cases above
+            "form_post_save": lambda: form(rf.post(f"/registrations/form/?email={adv}", post)),
+        }
+
+    def _measure(self, fn, iterations):
+        for _ in range(min(10, iterations)):
+            fn()  # warm caches and the schema registry
+
+        samples = []
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000.0)
+
+        probe = max(1, min(20, iterations))
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(probe):
+                fn()
+        queries = len(ctx.captured_queries) / probe
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(probe):
+                base = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                fn()
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "latency_ms": summarize(samples),
+            "queries_per_call": round(queries, 2),
+            "alloc_peak_kb": round(sum(peaks) / len(peaks) / 1024.0, 1),
+        }
+
+    # ---- main -------------------------------------------------------------
+
+    def handle(self, *args, **opts):
+        advisors, per_advisor, n = opts["advisors"], opts["participants"], opts["iterations"]
+        if advisors < 1 or per_advisor < 0 or n < 1:
+            raise CommandError("--advisors and --iterations must be >= 1")
+        only = {c.strip() for c in opts["only"].split(",") if c.strip()}
+        revision = git_revision()
+
+        self._cleanup()
+        self._seed(advisors, per_advisor)
+        results = {}
+        try:
+            with override_settings(RATE_LIMIT_ENABLED=False, DIGEST_ENABLED=False):
+                cases = self._cases()
+                unknown = only - set(cases)
+                if unknown:
+                    raise CommandError(f"Unknown case(s): {', '.join(sorted(unknown))}")
+                for name, fn in cases.items():
+                    if only and name not in only:
+                        continue
+                    r = results[name] = self._measure(fn, n)
+                    lat = r["latency_ms"]
+                    self.stdout.write(
+                        f"{name:20s} p50 {lat['p50']:8.2f}  p95 {lat['p95']:8.2f}  p99 {lat['p99']:8.2f} ms  "
+                        f"{r['queries_per_call']:6.2f} q/call  {r['alloc_peak_kb']:8.1f} KiB"
+                    )
+        finally:
+            if not opts["keep"]:
+                self._cleanup()
+
+        out = opts["json"] or f"bench-registrations-{revision or 'local'}.json"
+        write_json(out, {
+            "revision": revision,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "vendor": connection.vendor,
+            "params": {"advisors": advisors, "participants_per_advisor": per_advisor, "iterations": n},
+            "results": results,
+        })
+        self.stdout.write(self.style.SUCCESS(f"Wrote {out}"))
+
+        if opts["compare"]:
+            with open(opts["compare"]) as fh:
+                before = json.load(fh)
+            self.stdout.write(f"vs {before.get('revision') or opts['compare']}:")
+            for name, r in results.items():
+                old = before.get("results", {}).get(name)
+                if not old:
+                    continue
+                p50, old_p50 = r["latency_ms"]["p50"], old["latency_ms"]["p50"]
+                change = (p50 - old_p50) / old_p50 * 100.0 if old_p50 else 0.0
+                self.stdout.write(
+                    f"{name:20s} p50 {old_p50:8.2f} -> {p50:8.2f} ms ({change:+.1f}%)  "
+                    f"queries {old['queries_per_call']:.2f} -> {r['queries_per_call']:.2f}"
+                )
@@ -0,0 +1,73 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from registrations.benchutils import summarize
+from registrations.constants import ACCESS_SESSION_KEY
+from registrations.decorators import grant_access, require_access
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+
+
+@require_access
+def _gated_view(request):
+    return HttpResponse("ok")
+
+
+def _regrant_view(request):
+    # what user_access_view does on every visit with ?email=
+    grant_access(request, request.session.get(ACCESS_SESSION_KEY), 30 * 24 * 3600)
+    return HttpResponse("ok")
+
+
+class Command(BaseCommand):
+    help = "Requests/sec and DB queries per request of the require_access path for each session engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--engines", default=",".join(ENGINES))
+
+    def _run(self, view, engine_path, n):
+        store = import_module(engine_path).SessionStore()
+        store[ACCESS_SESSION_KEY] = "advisor@example.com"
+        store.set_expiry(30 * 24 * 3600)
+        store.save()
+        cookie = store.session_key
+
+        handler = SessionMiddleware(view)
+        rf = RequestFactory()
+        samples = []
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            for _ in range(n):
+                req = rf.get("/registrations/form/")
+                req.COOKIES[settings.SESSION_COOKIE_NAME] = cookie
+                t0 = time.perf_counter()
+                resp = handler(req)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+                assert resp.status_code == 200, resp.status_code
+            elapsed = time.perf_counter() - started
+        return {"rps": n / elapsed, "queries": len(ctx.captured_queries) / n, "latency": summarize(samples)}
+
+    def handle(self, *args, **opts):
+        n = opts["requests"]
+        for name in opts["engines"].split(","):
+            engine_path = ENGINES[name.strip()]
+            with override_settings(SESSION_ENGINE=engine_path):
+                for label, view in (("gated read", _gated_view), ("re-grant", _regrant_view)):
+                    r = self._run(view, engine_path, n)
+                    self.stdout.write(
+                        f"{name:15s} {label:10s} {r['rps']:8.0f} req/s  "
+                        f"{r['queries']:.2f} queries/req  p95 {r['latency']['p95']:.3f} ms"
+                    )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from registrations import events, views_flat
+
+
+class Command(BaseCommand):
+    help = ("Partition the raw participant tables by event (PostgreSQL only): --convert rebuilds them as "
+            "LIST-partitioned tables, --create adds an event's partition, --detach takes a past event out.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--convert", action="store_true",
+                            help="Rebuild plain participant tables as partitioned (locks them while copying)")
+        parser.add_argument("--create", metavar="EVENT", action="append", default=[],
+                            help="Add the partition for EVENT (repeatable; default: CURRENT_EVENT with --convert)")
+        parser.add_argument("--detach", metavar="EVENT", action="append", default=[],
+                            help="Detach EVENT's partition; its rows stay in a standalone table")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            self.stdout.write("Event partitions are PostgreSQL-only; rows are still scoped by the event column.")
+            return
+        if events.current() in opts["detach"]:
+            raise CommandError("Refusing to detach the current event.")
+
+        _, participant_ok = views_flat._ensure_flat_tables_if_missing()
+        tables = (["registrations_participant"] if participant_ok else []) + ["registrations_participant_fallback"]
+        create = opts["create"] or ([events.current()] if opts["convert"] else [])
+        try:
+            for event in create + opts["detach"]:
+                events.check(event)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for table in tables:
+            if not events.is_partitioned(table):
+                if not opts["convert"]:
+                    self.stdout.write(f"{table}: not partitioned (run with --convert)")
+                    continue
+                self.stdout.write(f"{table}: converted, partitions {', '.join(events.convert(table))}")
+            for event in create:
+                if events.create_partition(table, event):
+                    self.stdout.write(f"{table}: created {events.partition_name(table, event)}")
+            for event in opts["detach"]:
+                if events.partition_name(table, event) in events.partitions(table):
+                    self.stdout.write(f"{table}: detached {events.detach_partition(table, event)}")
+            self.stdout.write(f"{table}: {', '.join(sorted(events.partitions(table)))}")
+        self.stdout.write(self.style.SUCCESS("Done."))
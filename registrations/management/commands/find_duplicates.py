@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from registrations import dedupe
+
+
+class Command(BaseCommand):
+    help = "List participants that share a normalized name+college key (one grouped query over all tables)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backfill", action="store_true",
+                            help="First compute match keys for rows saved before they existed")
+        parser.add_argument("--limit", type=int, default=5000, help="Rows to report at most")
+
+    def handle(self, *args, **opts):
+        if opts["backfill"]:
+            self.stdout.write(f"Filled match keys on {dedupe.backfill()} row(s)")
+        groups = dedupe.report(opts["limit"])
+        for group in groups:
+            self.stdout.write(group["key"])
+            for r in group["rows"]:
+                self.stdout.write(f"  {r['src']}:{r['id']}  {r['first']} {r['last']}  "
+                                  f"{r['college']}  {r['advisor']}  {r['created_at'] or ''}")
+        self.stdout.write(self.style.SUCCESS(f"Done. {len(groups)} possible duplicate group(s)."))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from registrations.digest import flush_due, pending_summary
+
+
+class Command(BaseCommand):
+    help = "Send coalesced participant digests for advisors whose activity has gone quiet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", type=int, default=0,
+                            help="Keep running, checking every N seconds (0 = run once)")
+
+    def handle(self, *args, **opts):
+        while True:
+            stats = flush_due()
+            if stats["digests"]:
+                self.stdout.write(f"Sent {stats['digests']} digest(s) covering {stats['events']} event(s)")
+            if not opts["loop"]:
+                p = pending_summary()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Done. Pending: {p['events']} event(s) for {p['advisors']} advisor(s)."
+                ))
+                return
+            time.sleep(opts["loop"])
@@ -0,0 +1,296 @@
+import datetime
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter, defaultdict
+from queue import Empty, Queue
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from registrations import tours, views_flat
+from registrations.benchutils import git_revision, http_request, summarize, write_json
+from registrations.forms import COLLEGE_COMPANIES, STUDENT_ORGS, TEE_SIZES, TOURS
+from registrations.models import AccessLink, ParticipantEvent, PendingUser
+from registrations.utils_tokens import make_validation_token
+
+ADVISOR_EMAIL = "load-advisor{}@example.com"
+
+STEPS = ("access", "names", "validate", "save", "finish")
+
+
+def parse_ramp(spec: str) -> list[tuple[int, float]]:
+    """'50:60,200:120,200:600' -> ramp to 50 users over 60s, to 200 over 120s, hold 200 for 600s."""
+    stages = []
+    for part in spec.split(","):
+        users, _, seconds = part.partition(":")
+        stages.append((int(users), float(seconds)))
+    return stages
+
+
+def target_users(stages, elapsed: float) -> int:
+    start_users, t = 0, 0.0
+    for users, seconds in stages:
+        if elapsed < t + seconds:
+            return int(start_users + (users - start_users) * (elapsed - t) / seconds)
+        start_users, t = users, t + seconds
+    return -1  # ramp finished
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.flows = 0
+
+    def add(self, step, status, ms):
+        with self.lock:
+            self.samples[step].append(ms)
+            self.statuses[step][status] += 1
+
+
+class _PoolSampler(threading.Thread):
+    """Polls pg_stat_activity once a second for connection-pool saturation."""
+
+    SQL = """
+        SELECT count(*),
+               count(*) FILTER (WHERE state = 'active'),
+               count(*) FILTER (WHERE state = 'idle in transaction'),
+               count(*) FILTER (WHERE wait_event_type = 'Lock'),
+               current_setting('max_connections')::int
+        FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stop = threading.Event()
+        self.samples = []
+
+    def run(self):
+        try:
+            while not self.stop.wait(1.0):
+                with connection.cursor() as cur:
+                    cur.execute(self.SQL)
+                    self.samples.append(cur.fetchone())
+        finally:
+            connection.close()
+
+    def report(self):
+        if not self.samples:
+            return {}
+        total, active, idle_tx, lock_wait, max_conn = zip(*self.samples)
+        return {
+            "max_connections": max_conn[-1],
+            "peak_connections": max(total),
+            "peak_active": max(active),
+            "peak_idle_in_transaction": max(idle_tx),
+            "peak_lock_waits": max(lock_wait),
+            "peak_saturation": round(max(total) / max_conn[-1], 3),
+            "mean_active": round(sum(active) / len(active), 1),
+        }
+
+
+class Command(BaseCommand):
+    help = ("Registration-day load replay against a running server: each virtual advisor opens an access "
+            "link, loads names-by-category, validates, saves participants and presses Finish. "
+            "Start the server with RATE_LIMIT_ENABLED=0 unless throttling is what you want to measure.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--advisors", type=int, default=300, help="Advisors to register (one flow each)")
+        parser.add_argument("--ramp", default="50:60,200:120,200:600",
+                            help="users:seconds stages, e.g. 50:60,200:120,200:600")
+        parser.add_argument("--saves", type=int, default=8, help="Participant saves per advisor")
+        parser.add_argument("--think-ms", type=float, default=500.0, help="Mean pause between steps")
+        parser.add_argument("--json", default="")
+        parser.add_argument("--keep", action="store_true", help="Leave the seeded advisors and rows in place")
+
+    # ---- data -------------------------------------------------------------
+
+    def _seed(self, n):
+        self._cleanup()
+        PendingUser.objects.bulk_create(
+            [PendingUser(first_name="Load", last_name=f"Advisor{i}", email=ADVISOR_EMAIL.format(i),
+                         category="Faculty") for i in range(n)],
+            batch_size=1000,
+        )
+        users = list(PendingUser.objects.filter(email__startswith="load-advisor").only("id", "email"))
+        signed = getattr(settings, "ACCESS_LINK_MODE", "db") == "signed"
+        flows = []
+        if signed:
+            for u in users:
+                token = AccessLink.issue_token(u.email, ttl_minutes=24 * 60, user_id=u.id)
+                flows.append((u.email, f"access/s/{token}/", make_validation_token(u.id, u.email)))
+        else:
+            expires = timezone.now() + datetime.timedelta(days=1)
+            links = AccessLink.objects.bulk_create([AccessLink(email=u.email, expires_at=expires) for u in users])
+            ids = {u.email: u.id for u in users}
+            for link in links:
+                flows.append((link.email, f"access/{link.token}/", make_validation_token(ids[link.email], link.email)))
+        return flows
+
+    def _cleanup(self):
+        like = ADVISOR_EMAIL.format("%")
+        seats = Counter()
+        for table in ("registrations_participant", "registrations_participant_fallback"):
+            deleted = views_flat._try_select(f"DELETE FROM {table} WHERE advisor_email LIKE %s RETURNING tour",
+                                             [like]) or []
+            seats.update(tours.canonical(t) for t, in deleted if t and not tours.is_waitlisted(t))
+        for tour, n in seats.items():  # give back the seats the load test took
+            tours.release_seat(tour, n)
+        ParticipantEvent.objects.filter(advisor_email__startswith="load-advisor").delete()
+        AccessLink.objects.filter(email__startswith="load-advisor").delete()
+        PendingUser.objects.filter(email__startswith="load-advisor").delete()
+
+    # ---- one advisor ------------------------------------------------------
+
+    def _flow(self, stats, base, flow, saves, think_ms):
+        email, access_path, validation_token = flow
+        conns, cookies = {}, {}
+
+        def hit(step, path, method="GET", data=None):
+            headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())} if cookies else {}
+            body = None
+            if data is not None:
+                body = urllib.parse.urlencode(data).encode()
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+                headers["Referer"] = base + path  # CSRF checks the referer over https
+            t0 = time.perf_counter()
+            status, resp_headers, _ = http_request(conns, base + path, method, body, headers)
+            stats.add(step, status, (time.perf_counter() - t0) * 1000.0)
+            for name, value in resp_headers.items():
+                if name.lower() == "set-cookie":
+                    key, _, rest = value.partition("=")
+                    cookies[key.strip()] = rest.split(";", 1)[0]
+            if think_ms:
+                time.sleep(random.expovariate(1000.0 / think_ms))
+            return status
+
+        hit("access", access_path)  # confirm page; sets the csrftoken cookie
+        hit("access", access_path, "POST", {"csrfmiddlewaretoken": cookies.get("csrftoken", "")})
+        hit("names", "names-by-category/?" + urllib.parse.urlencode({"category": "Faculty"}))
+        hit("validate", f"validate/{validation_token}/")
+        form = "form/?" + urllib.parse.urlencode({"email": email})
+        for i in range(saves):
+            hit("save", form, "POST", {
+                "first_name": f"Guest{i}", "last_name": "Load", "advisor_email": email,
+                "student_organization": random.choice(STUDENT_ORGS)[0],
+                "tee_shirt_size": random.choice(TEE_SIZES)[0],
+                "college_company": random.choice(COLLEGE_COMPANIES)[0],
+                "tour": random.choice(TOURS)[0],
+                "idem_key": uuid.uuid4().hex,
+            })
+        hit("finish", form, "POST", {"finish": "1", "advisor_email": email})
+        for conn in conns.values():
+            conn.close()
+        with stats.lock:
+            stats.flows += 1
+
+    # ---- main -------------------------------------------------------------
+
+    def handle(self, *args, **opts):
+        base = opts["base_url"].rstrip("/") + "/registrations/"
+        try:
+            stages = parse_ramp(opts["ramp"])
+        except ValueError:
+            raise CommandError("--ramp must look like 50:60,200:120")
+        if http_request({}, base + "sanity/")[0] != 200:
+            raise CommandError(f"No server answering at {base}sanity/")
+
+        queue = Queue()
+        for flow in self._seed(opts["advisors"]):
+            queue.put(flow)
+        stats = _Stats()
+        sampler = _PoolSampler() if connection.vendor == "postgresql" else None
+        live = []
+        live_lock = threading.Lock()
+        state = {"target": 0}
+
+        def user():
+            me = threading.current_thread()
+            try:
+                while True:
+                    with live_lock:
+                        if len(live) > state["target"]:
+                            return  # ramping down
+                    try:
+                        flow = queue.get_nowait()
+                    except Empty:
+                        return
+                    self._flow(stats, base, flow, opts["saves"], opts["think_ms"])
+            finally:
+                with live_lock:
+                    live.remove(me)
+                connections.close_all()
+
+        started = time.perf_counter()
+        if sampler:
+            sampler.start()
+        try:
+            while True:
+                elapsed = time.perf_counter() - started
+                target = target_users(stages, elapsed)
+                with live_lock:
+                    state["target"] = max(target, 0)
+                    if target < 0 or (queue.empty() and not live):
+                        break
+                    while len(live) < target and not queue.empty():
+                        t = threading.Thread(target=user, daemon=True)
+                        live.append(t)
+                        t.start()
+                time.sleep(0.1)
+            with live_lock:
+                pending = list(live)
+            for t in pending:
+                t.join()
+        finally:
+            if sampler:
+                sampler.stop.set()
+                sampler.join()
+            elapsed = time.perf_counter() - started
+            if not opts["keep"]:
+                self._cleanup()
+
+        report = {
+            "revision": git_revision(),
+            "base_url": opts["base_url"],
+            "ramp": opts["ramp"],
+            "elapsed_s": round(elapsed, 1),
+            "flows_completed": stats.flows,
+            "requests": sum(len(v) for v in stats.samples.values()),
+            "endpoints": {},
+            "db_pool": sampler.report() if sampler else {},
+        }
+        report["rps"] = round(report["requests"] / elapsed, 1) if elapsed else 0
+        self.stdout.write(f"{stats.flows} flows, {report['requests']} requests in {elapsed:.1f}s "
+                          f"({report['rps']} req/s)")
+        for step in STEPS:
+            samples = stats.samples.get(step)
+            if not samples:
+                continue
+            codes = dict(stats.statuses[step])
+            errors = sum(n for code, n in codes.items() if not 200 <= code < 400)
+            lat = summarize(samples)
+            report["endpoints"][step] = {
+                "latency_ms": lat, "statuses": codes, "error_rate": round(errors / len(samples), 4),
+                "rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+            }
+            self.stdout.write(
+                f"{step:9s} {len(samples):7d} req  p50 {lat['p50']:8.1f}  p95 {lat['p95']:8.1f}  "
+                f"p99 {lat['p99']:8.1f} ms  errors {errors / len(samples):.2%}  {codes}"
+            )
+        if report["db_pool"]:
+            pool = report["db_pool"]
+            self.stdout.write(
+                f"db pool: peak {pool['peak_connections']}/{pool['max_connections']} connections "
+                f"({pool['peak_saturation']:.0%}), peak active {pool['peak_active']}, "
+                f"idle in tx {pool['peak_idle_in_transaction']}, lock waits {pool['peak_lock_waits']}"
+            )
+        if opts["json"]:
+            write_json(opts["json"], report)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {opts['json']}"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from registrations.purge import purge
+
+
+class Command(BaseCommand):
+    help = "Delete expired/used AccessLinks, token revocations and sessions in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.05, help="Seconds to pause between batches")
+        parser.add_argument("--used-grace-hours", type=int, default=24,
+                            help="Keep used links this long so 'already used' pages still resolve")
+        parser.add_argument("--max-seconds", type=float, default=0, help="Stop after this long (0 = no limit)")
+
+    def handle(self, *args, **opts):
+        report = purge(
+            batch_size=opts["batch_size"],
+            sleep=opts["sleep"],
+            used_grace_hours=opts["used_grace_hours"],
+            max_seconds=opts["max_seconds"],
+        )
+        for r in report:
+            self.stdout.write(f"{r['target']}: {r['rows']} row(s) in {r['seconds']:.2f}s")
+        total = sum(r["rows"] for r in report)
+        seconds = sum(r["seconds"] for r in report)
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} row(s) in {seconds:.2f}s"))
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from registrations.invitations import DEFAULT_TTL_MINUTES, select_invitees, send_invitations
+
+
+class Command(BaseCommand):
+    help = "Send access-link invitations to PendingUsers in bulk (resumable)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--category", default="", help="Only this category (case-insensitive)")
+        state = parser.add_mutually_exclusive_group()
+        state.add_argument("--validated", action="store_true", help="Only validated users")
+        state.add_argument("--unvalidated", action="store_true", help="Only users not yet validated")
+        parser.add_argument("--base-url", default=getattr(settings, "SITE_URL", ""),
+                            help="Public site root used in links, e.g. https://flc.example.org")
+        parser.add_argument("--ttl-minutes", type=int, default=DEFAULT_TTL_MINUTES)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--after-id", type=int, default=0,
+                            help="Resume after this PendingUser id (printed with each batch)")
+        parser.add_argument("--resend", action="store_true",
+                            help="Also invite users who still hold a live link")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        if not opts["base_url"]:
+            raise CommandError("--base-url is required (or set SITE_URL in settings).")
+
+        validated = True if opts["validated"] else False if opts["unvalidated"] else None
+        users = select_invitees(opts["category"], validated, resend=opts["resend"])
+
+        def _progress(s):
+            rate = s["sent"] / s["elapsed"] if s["elapsed"] else 0
+            self.stdout.write(
+                f"batch {s['batches']}: {s['sent'] + s['failed']}/{s['total']} "
+                f"(failed {s['failed']}, last id {s['last_id']}, {rate:.0f}/s)"
+            )
+
+        stats = send_invitations(
+            users,
+            base_url=opts["base_url"],
+            ttl_minutes=opts["ttl_minutes"],
+            batch_size=opts["batch_size"],
+            after_id=opts["after_id"],
+            dry_run=opts["dry_run"],
+            progress=_progress,
+        )
+        style = self.style.SUCCESS if not stats["failed"] else self.style.WARNING
+        self.stdout.write(style(
+            f"{'Would send' if opts['dry_run'] else 'Sent'} {stats['sent']} invitation(s), "
+            f"{stats['failed']} failed, in {stats['elapsed']:.1f}s. "
+            f"Re-run the same command to retry failures."
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from registrations.roster_sync import sync_roster
+
+
+class Command(BaseCommand):
+    help = "Sync PendingUser from a roster CSV (email, first_name, last_name, category, college_company)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing")
+        parser.add_argument("--deactivate-missing", action="store_true",
+                            help="Mark people not on the roster inactive")
+        parser.add_argument("--show", type=int, default=20, help="Lines of each kind to list")
+
+    def handle(self, *args, **opts):
+        try:
+            with open(opts["csv_path"], encoding="utf-8-sig", newline="") as fh:
+                text = fh.read()
+        except OSError as e:
+            raise CommandError(str(e))
+
+        plan = sync_roster(text, deactivate_missing=opts["deactivate_missing"], dry_run=opts["dry_run"])
+        for line in plan.report_lines(opts["show"]):
+            self.stdout.write(line)
+        if plan.applied:
+            self.stdout.write(self.style.SUCCESS(f"Applied in {plan.seconds:.2f}s"))
+        else:
+            self.stdout.write(self.style.WARNING("Dry run: nothing written"))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0006_accesslink_flcregistration_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParticipantEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('advisor_email', models.EmailField(max_length=254)),
+                ('action', models.CharField(max_length=20)),
+                ('first_name', models.CharField(blank=True, max_length=120)),
+                ('last_name', models.CharField(blank=True, max_length=120)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['advisor_email', 'created_at'], name='registratio_advisor_2e3315_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0008_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='revokedtoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='accesslink',
+            index=models.Index(fields=['expires_at'], name='accesslink_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslink',
+            index=models.Index(fields=['email'], name='accesslink_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslink',
+            index=models.Index(condition=models.Q(('used', True)), fields=['created_at'], name='accesslink_used_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0009_purge_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pendinguser',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='pendinguser_roster_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0010_pendinguser_roster_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendinguser',
+            name='is_active',
+            field=models.BooleanField(db_default=True, default=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0011_pendinguser_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TourCapacity',
+            fields=[
+                ('tour', models.CharField(max_length=120, primary_key=True, serialize=False)),
+                ('capacity', models.PositiveIntegerField()),
+                ('reserved', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.CheckConstraint(condition=models.Q(('reserved__lte', models.F('capacity'))), name='tourcapacity_not_overbooked')],
+            },
+        ),
+    ]
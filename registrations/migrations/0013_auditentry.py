@@ -0,0 +1,106 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:04
+
+import datetime
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+TABLE = "registrations_auditentry"
+
+PG_STATEMENTS = (
+    f"""
+    CREATE TABLE {TABLE} (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        actor varchar(254) NOT NULL DEFAULT '',
+        action varchar(20) NOT NULL,
+        entity varchar(40) NOT NULL,
+        object_key varchar(64) NOT NULL DEFAULT '',
+        before jsonb NULL,
+        after jsonb NULL,
+        path varchar(200) NOT NULL DEFAULT '',
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+    """,
+    f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT",
+    f"CREATE INDEX {TABLE}_object_idx ON {TABLE} (entity, object_key, created_at)",
+    f"""
+    CREATE FUNCTION {TABLE}_append_only() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        RAISE EXCEPTION 'audit entries are append-only';
+    END $$
+    """,
+    f"""
+    CREATE TRIGGER {TABLE}_append_only BEFORE UPDATE OR DELETE ON {TABLE}
+        FOR EACH ROW EXECUTE FUNCTION {TABLE}_append_only()
+    """,
+)
+
+OTHER_TABLE = f"""
+CREATE TABLE {TABLE} (
+    id integer PRIMARY KEY AUTOINCREMENT,
+    created_at datetime NOT NULL,
+    actor varchar(254) NOT NULL DEFAULT '',
+    action varchar(20) NOT NULL,
+    entity varchar(40) NOT NULL,
+    object_key varchar(64) NOT NULL DEFAULT '',
+    before text NULL,
+    after text NULL,
+    path varchar(200) NOT NULL DEFAULT ''
+)
+"""
+
+
+def create_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.execute(OTHER_TABLE)
+        return
+    for sql in PG_STATEMENTS:
+        schema_editor.execute(sql)
+    # this month and the next two; audit_partitions keeps extending the range
+    month = datetime.date.today().replace(day=1)
+    for _ in range(3):
+        following = (month + datetime.timedelta(days=32)).replace(day=1)
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_y{month:%Y}m{month:%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE {TABLE}")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP FUNCTION {TABLE}_append_only()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0012_tourcapacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.CharField(blank=True, max_length=254)),
+                ('action', models.CharField(max_length=20)),
+                ('entity', models.CharField(max_length=40)),
+                ('object_key', models.CharField(blank=True, max_length=64)),
+                ('before', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('after', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('path', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'verbose_name_plural': 'audit entries',
+                'db_table': 'registrations_auditentry',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
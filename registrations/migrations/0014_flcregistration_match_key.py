@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:10
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copy of dedupe.match_key as of this migration; later changes to the
+# live function must not change what this migration writes.
+def _fold(value):
+    text = unicodedata.normalize("NFKD", value or "")
+    return "".join(ch for ch in text if ch.isalnum()).casefold()
+
+
+def match_key(first, last, college=""):
+    return f"{_fold(first)}|{_fold(last)}|{_fold(college)}"
+
+
+def fill_match_keys(apps, schema_editor):
+    FLCRegistration = apps.get_model("registrations", "FLCRegistration")
+    regs = list(FLCRegistration.objects.only("id", "first_name", "last_name", "college_company"))
+    for reg in regs:
+        reg.match_key = match_key(reg.first_name, reg.last_name, reg.college_company)
+    FLCRegistration.objects.bulk_update(regs, ["match_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0013_auditentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flcregistration',
+            name='match_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=400),
+        ),
+        migrations.RunPython(fill_match_keys, migrations.RunPython.noop),
+    ]
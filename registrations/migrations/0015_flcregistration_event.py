@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:14
+
+import registrations.events
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0014_flcregistration_match_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flcregistration',
+            name='event',
+            field=models.CharField(default=registrations.events.current, editable=False, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name='flcregistration',
+            index=models.Index(fields=['advisor', 'event'], name='flcreg_advisor_event_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:26
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0015_flcregistration_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('advisor', models.CharField(max_length=254)),
+                ('key', models.CharField(max_length=64)),
+                ('outcome', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('advisor', 'key'), name='idempotencykey_advisor_key_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:32
+
+import registrations.events
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0017_reportversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tourcapacity',
+            name='event',
+            field=models.CharField(default=registrations.events.current, max_length=40),
+        ),
+        # drop the old primary key (tour) before adding the new one
+        migrations.AlterField(
+            model_name='tourcapacity',
+            name='tour',
+            field=models.CharField(max_length=120),
+        ),
+        migrations.AddField(
+            model_name='tourcapacity',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AddConstraint(
+            model_name='tourcapacity',
+            constraint=models.UniqueConstraint(fields=('tour', 'event'), name='tourcapacity_tour_event_uniq'),
+        ),
+    ]
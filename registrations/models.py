@@ -1,10 +1,15 @@
 # registrations/models.py
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
 from django.utils import timezone
+import json
 import uuid
 from datetime import timedelta
 from django.utils import timezone
 
+from . import events
+from .dedupe import find_matches, match_key
+
 class PendingUser(models.Model):
     first_name = models.CharField(max_length=120)
     last_name = models.CharField(max_length=120)
@@ -16,9 +21,83 @@ class PendingUser(models.Model):
     is_validated = models.BooleanField(default=False)
     validated_at = models.DateTimeField(null=True, blank=True)
 
+    # Cleared by roster sync (roster_sync.py) for people dropped from the roster
+    is_active = models.BooleanField(default=True, db_default=True)
+
+    class Meta:
+        # Keyset pagination of the roster (roster.py) walks this index in order.
+        indexes = [
+            models.Index(fields=["last_name", "first_name", "id"], name="pendinguser_roster_idx"),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.category})"
 
+    UPSERT_FIELDS = ("first_name", "last_name", "category", "college_company")
+
+    @classmethod
+    def upsert(cls, email, overwrite=True, **fields):
+        """
+        Race-free get_or_create + save for one email, in a single statement
+        (INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING) on PostgreSQL.
+        Non-empty `fields` replace stored values when `overwrite` is true; blank
+        ones never clobber. With overwrite=False an existing row is left as is.
+        Creations and real changes are audited (audit.py). Returns (instance, created).
+        """
+        from .audit import record
+
+        unknown = set(fields) - set(cls.UPSERT_FIELDS)
+        if unknown:
+            raise TypeError(f"upsert() got unexpected fields: {', '.join(sorted(unknown))}")
+        values = {k: (fields.get(k) or "") for k in cls.UPSERT_FIELDS}
+
+        if connection.vendor != "postgresql":
+            with transaction.atomic():
+                obj, created = cls.objects.select_for_update().get_or_create(email=email, defaults=values)
+                before = {k: getattr(obj, k) for k in cls.UPSERT_FIELDS}
+                changed = [k for k, v in values.items() if overwrite and v and getattr(obj, k) != v]
+                for k in changed:
+                    setattr(obj, k, values[k])
+                if changed and not created:
+                    obj.save(update_fields=changed)
+        else:
+            table = cls._meta.db_table
+            if overwrite:
+                updates = ", ".join(f"{k} = COALESCE(NULLIF(EXCLUDED.{k}, ''), {table}.{k})" for k in cls.UPSERT_FIELDS)
+            else:
+                updates = "email = EXCLUDED.email"  # no-op update so RETURNING still yields the row
+            cols = ["id", "email", *cls.UPSERT_FIELDS, "is_validated", "validated_at", "is_active"]
+            sql = (
+                # "old" is the statement's snapshot, i.e. the row before this upsert (the audit's before image)
+                f"WITH old AS (SELECT {', '.join(cls.UPSERT_FIELDS)} FROM {table} WHERE email = %s) "
+                f"INSERT INTO {table} (email, {', '.join(cls.UPSERT_FIELDS)}, is_validated) "
+                f"VALUES (%s, {', '.join(['%s'] * len(cls.UPSERT_FIELDS))}, false) "
+                f"ON CONFLICT (email) DO UPDATE SET {updates} "
+                f"RETURNING {', '.join(cols)}, (xmax = 0) AS created, (SELECT row_to_json(old) FROM old)"
+            )
+            with connection.cursor() as cur:
+                cur.execute(sql, [email, email, *values.values()])
+                row = cur.fetchone()
+            obj = cls(**dict(zip(cols, row[:-2])))
+            obj._state.adding = False
+            obj._state.db = connection.alias
+            created, before = bool(row[-2]), row[-1]
+            if isinstance(before, str):  # json comes back decoded on psycopg, as text elsewhere
+                before = json.loads(before)
+
+        after = {k: getattr(obj, k) for k in cls.UPSERT_FIELDS}
+        if created:
+            record("insert", "pendinguser", obj.pk, after={"email": obj.email, **after})
+        elif before and before != after:
+            record("update", "pendinguser", obj.pk, before=before, after=after)
+        return obj, created
+
+
+
+class FLCRegistrationQuerySet(models.QuerySet):
+    def current_event(self):
+        """Registrations for settings.CURRENT_EVENT; past events stay in the table but out of the pages."""
+        return self.filter(event=events.current())
 
 
 class FLCRegistration(models.Model):
@@ -40,9 +119,40 @@ class FLCRegistration(models.Model):
     # ✅ Safe fix: no prompt needed, works with old rows too
     created_at = models.DateTimeField(default=timezone.now, editable=False)
 
+    # Normalized first|last|college (dedupe.match_key), kept in step by save()
+    match_key = models.CharField(max_length=400, blank=True, db_index=True, editable=False)
+
+    # The event (conference year) registered for; see events.py
+    event = models.CharField(max_length=40, default=events.current, editable=False)
+
+    objects = FLCRegistrationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["advisor", "event"], name="flcreg_advisor_event_idx")]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
-    
+
+    def refresh_match_key(self):
+        self.match_key = match_key(self.first_name, self.last_name, self.college_company)
+
+    def save(self, *args, **kwargs):
+        self.refresh_match_key()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "match_key"}
+        super().save(*args, **kwargs)
+
+    def possible_duplicates(self, limit=3):
+        """
+        Rows of this event with this one's match key, from FLCRegistration and
+        the raw participant tables alike (one indexed lookup; see
+        dedupe.find_matches): [(src, id, first, last, advisor email)].
+        """
+        self.refresh_match_key()
+        return find_matches([self.match_key], limit, event=self.event,
+                            exclude=("r", self.pk) if self.pk else None)
+
+
 class AccessLink(models.Model):
     """
     One-time, time-limited access links for PendingUsers.
@@ -53,6 +163,14 @@ class AccessLink(models.Model):
     expires_at = models.DateTimeField()
     used = models.BooleanField(default=False)
 
+    class Meta:
+        # Serve the purge job (purge.py) and per-email lookups without table scans.
+        indexes = [
+            models.Index(fields=["expires_at"], name="accesslink_expires_idx"),
+            models.Index(fields=["email"], name="accesslink_email_idx"),
+            models.Index(fields=["created_at"], condition=models.Q(used=True), name="accesslink_used_idx"),
+        ]
+
     @classmethod
     def create_for(cls, email, ttl_minutes=30):
         """Factory to generate a new access link with expiration."""
@@ -61,6 +179,15 @@ class AccessLink(models.Model):
             expires_at=timezone.now() + timedelta(minutes=ttl_minutes),
         )
 
+    @staticmethod
+    def issue_token(email, ttl_minutes=30, user_id=None):
+        """
+        Stateless alternative to create_for: no row is written; validity, expiry
+        and a one-time nonce are signed into the token (see utils_tokens).
+        """
+        from .utils_tokens import make_access_token
+        return make_access_token(email, ttl_minutes * 60, user_id=user_id)
+
     def is_valid(self):
         """Check if link is not used and has not expired."""
         return (not self.used) and timezone.now() < self.expires_at
@@ -68,3 +195,120 @@ class AccessLink(models.Model):
     def __str__(self):
         status = "used" if self.used else "active"
         return f"AccessLink for {self.email} ({status}, expires {self.expires_at})"
+
+
+class ParticipantEvent(models.Model):
+    """
+    Participant add/delete events waiting to be coalesced into one digest email
+    per advisor (see digest.py). Rows are deleted once their digest is sent.
+    """
+    advisor_email = models.EmailField()
+    action = models.CharField(max_length=20)
+    first_name = models.CharField(max_length=120, blank=True)
+    last_name = models.CharField(max_length=120, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["advisor_email", "created_at"])]
+
+    def __str__(self):
+        return f"{self.action} {self.first_name} {self.last_name} ({self.advisor_email})"
+
+
+class RevokedToken(models.Model):
+    """
+    Nonces of consumed one-time signed access tokens (utils_tokens.make_access_token).
+    Rows only need to live until the token itself expires.
+    """
+    nonce = models.CharField(max_length=32, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"RevokedToken {self.nonce} (expires {self.expires_at})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Claimed idempotency key of a form POST (see idempotency.py) and, once the
+    write finished, its outcome for replays. The UNIQUE (advisor, key) pair
+    makes the claim a single INSERT ... ON CONFLICT that every worker sees;
+    purge_expired removes rows past expires_at.
+    """
+    advisor = models.CharField(max_length=254)
+    key = models.CharField(max_length=64)
+    outcome = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["advisor", "key"], name="idempotencykey_advisor_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.advisor}:{self.key}"
+
+
+class ReportVersion(models.Model):
+    """
+    One-row counter of participant writes (see reports.py). Every write bumps
+    it with a single upsert, so cached reports go stale at once in every
+    worker, whatever the cache backend.
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"reports v{self.version}"
+
+
+class TourCapacity(models.Model):
+    """
+    Seat counter for one tour of one event (see tours.py), keyed by (tour,
+    event) so each conference year starts with its own seats. Seats are taken
+    with a single conditional UPDATE (reserved < capacity), so concurrent
+    saves cannot overbook and only this row is locked. Tours without a row for
+    the current event are unlimited.
+    """
+    tour = models.CharField(max_length=120)
+    event = models.CharField(max_length=40, default=events.current)
+    capacity = models.PositiveIntegerField()
+    reserved = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["tour", "event"], name="tourcapacity_tour_event_uniq"),
+            models.CheckConstraint(condition=models.Q(reserved__lte=models.F("capacity")),
+                                   name="tourcapacity_not_overbooked"),
+        ]
+
+    def __str__(self):
+        return f"{self.tour} ({self.event}): {self.reserved}/{self.capacity}"
+
+
+class AuditEntry(models.Model):
+    """
+    Append-only record of a participant or pending-user change, with the row
+    before and after (see audit.py). The table is created by migration 0013,
+    not by Django: on PostgreSQL it is range-partitioned by month on
+    created_at and rejects UPDATE/DELETE; `manage.py audit_partitions` adds
+    upcoming months and detaches old ones.
+    """
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    actor = models.CharField(max_length=254, blank=True)
+    action = models.CharField(max_length=20)
+    entity = models.CharField(max_length=40)
+    object_key = models.CharField(max_length=64, blank=True)
+    before = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    after = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    path = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = "registrations_auditentry"
+        ordering = ["-created_at"]
+        verbose_name_plural = "audit entries"
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.actor or '-'} {self.action} {self.entity} {self.object_key}"
@@ -0,0 +1,159 @@
+# registrations/ratelimit.py
+"""
+Fixed-window rate limits counted in Django's cache, so every worker sharing the
+cache (Redis in production) sees the same counters. Each check is one atomic
+cache.add + cache.incr, so concurrent requests can't all read the same count
+and slip through. Checks touch only the cache: a throttled request gets its 429
+before any session, DB or email work.
+"""
+from __future__ import annotations
+
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """'5/m' -> (limit 5, window 60 seconds)."""
+    count, _, period = rate.partition("/")
+    return int(count), _PERIODS[(period or "m")[0]]
+
+
+def client_ip(request: HttpRequest) -> str:
+    """
+    REMOTE_ADDR, unless RATE_LIMIT_TRUSTED_PROXIES = N says N proxies of ours
+    append to X-Forwarded-For: then the entry N from the right, the address
+    our outermost proxy saw. Entries left of it are client-supplied and
+    never used, so rotating the header doesn't buy a fresh bucket.
+    """
+    depth = getattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    if depth:
+        hops = [h.strip() for h in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if h.strip()]
+        if len(hops) >= depth:
+            return hops[-depth]
+    return request.META.get("REMOTE_ADDR", "") or "unknown"
+
+
+def _post_value(request: HttpRequest, name: str) -> str:
+    if request.method != "POST":
+        return ""
+    return (request.POST.get(name) or "").strip().lower()
+
+
+KEY_FUNCS = {
+    "ip": client_ip,
+    "email": lambda r: _post_value(r, "email"),
+    "advisor": lambda r: _post_value(r, "advisor_email") or (r.GET.get("email") or "").strip().lower(),
+}
+
+
+def take(bucket: str, rate: str, cost: int = 1) -> tuple[bool, int]:
+    """
+    Count `cost` hits against `bucket` in the current window. Returns
+    (allowed, retry_after_seconds). The increment is atomic on every cache
+    backend (Redis INCR, a lock in locmem), so the limit holds under a flood.
+    """
+    limit, window = parse_rate(rate)
+    now = time.time()  # wall clock: windows are shared across processes
+    start = int(now // window) * window
+    key = f"rl::{bucket}::{start}"
+    cache.add(key, 0, window + 1)
+    try:
+        count = cache.incr(key, cost)
+    except ValueError:  # evicted between add and incr
+        cache.add(key, cost, window + 1)
+        count = cost
+    if count > limit:
+        return False, max(1, int(start + window - now + 0.999))
+    return True, 0
+
+
+def too_many_requests(retry_after: int) -> HttpResponse:
+    resp = HttpResponse("Too many requests. Please wait and try again.",
+                        status=429, content_type="text/plain")
+    resp["Retry-After"] = str(retry_after)
+    return resp
+
+
+def check(request: HttpRequest, scope: str, key: str, rate: str) -> HttpResponse | None:
+    """Return a 429 response if the bucket for (scope, key value) is empty, else None."""
+    value = KEY_FUNCS[key](request)
+    if not value:
+        return None  # nothing to key on (e.g. no email posted): other buckets still apply
+    allowed, retry_after = take(f"{scope}:{key}:{value}", rate)
+    return None if allowed else too_many_requests(retry_after)
+
+
+def rate_limit(rate: str, key: str = "ip", scope: str | None = None, methods=("POST",)):
+    """
+    View decorator: @rate_limit("5/m", key="email"). Stack it for several keys.
+    Only requests whose method is in `methods` spend tokens.
+    """
+    def decorator(viewfunc):
+        bucket_scope = scope or viewfunc.__name__
+
+        def _limited(request):
+            if getattr(settings, "RATE_LIMIT_ENABLED", True) and request.method in methods:
+                return check(request, bucket_scope, key, rate)
+            return None
+
+        if iscoroutinefunction(viewfunc):
+            @wraps(viewfunc)
+            async def _awrapped(request, *args, **kwargs):
+                limited = _limited(request)
+                if limited is not None:
+                    return limited
+                return await viewfunc(request, *args, **kwargs)
+            return _awrapped
+
+        @wraps(viewfunc)
+        def _wrapped(request, *args, **kwargs):
+            limited = _limited(request)
+            if limited is not None:
+                return limited
+            return viewfunc(request, *args, **kwargs)
+        return _wrapped
+    return decorator
+
+
+class RateLimitMiddleware:
+    """
+    Applies settings.RATE_LIMIT_RULES ahead of every view:
+        [("/registrations/", "ip", "60/m", ["POST"]), ...]
+    Each rule is (path prefix, key, rate, methods). Runs natively under both
+    WSGI and ASGI, so async views don't pay a thread hop for it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = list(getattr(settings, "RATE_LIMIT_RULES", []))
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _limited(self, request):
+        if getattr(settings, "RATE_LIMIT_ENABLED", True):
+            for prefix, key, rate, methods in self.rules:
+                if request.method in methods and request.path.startswith(prefix):
+                    limited = check(request, f"mw{prefix}", key, rate)
+                    if limited is not None:
+                        return limited
+        return None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        limited = self._limited(request)
+        return limited if limited is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        limited = self._limited(request)
+        return limited if limited is not None else await self.get_response(request)
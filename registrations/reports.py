@@ -0,0 +1,147 @@
+# registrations/reports.py
+"""
+Pre-event headcounts: shirts per size, tour signups, attendance per college/
+company and per student organization, over both participant tables for the
+current event. On PostgreSQL all four breakdowns come from one GROUPING SETS
+query; elsewhere one GROUP BY per breakdown. Results are cached under a version
+number that every participant write bumps (bump_version); the number lives in
+the database (ReportVersion), so a write in one worker invalidates the reports
+cached by all of them and a report is recomputed only after the data changed.
+"""
+from __future__ import annotations
+
+import csv
+import io
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from . import events
+from .forms import COLLEGE_COMPANIES, STUDENT_ORGS, TEE_SIZES, TOURS
+from .models import ReportVersion
+
+VERSION_TABLE = ReportVersion._meta.db_table
+
+# (participant column, title, vocabulary) in display order
+DIMENSIONS = (
+    ("tee_shirt_size", "T-shirt sizes", TEE_SIZES),
+    ("tour", "Tours", TOURS),
+    ("college_company", "Attendance by college/company", COLLEGE_COMPANIES),
+    ("student_organization", "Attendance by student organization", STUDENT_ORGS),
+)
+
+BLANK_LABEL = "(not given)"
+
+
+def _ttl() -> int:
+    return getattr(settings, "REPORTS_CACHE_SECONDS", 3600)
+
+
+def current_version() -> int:
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT version FROM {VERSION_TABLE} WHERE id = 1")
+        row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def bump_version() -> None:
+    """Call after any participant insert/update/delete; cached reports go stale at once."""
+    with connection.cursor() as cur:
+        cur.execute(
+            f"INSERT INTO {VERSION_TABLE} (id, version) VALUES (1, 1) "
+            f"ON CONFLICT (id) DO UPDATE SET version = {VERSION_TABLE}.version + 1"
+        )
+
+
+def _source_sql() -> tuple[str, list]:
+    """The current event's participants from both tables, and the query params."""
+    from .views_flat import _ensure_flat_tables_if_missing
+
+    cols = ", ".join(col for col, _, _ in DIMENSIONS)
+    _, participant_ok = _ensure_flat_tables_if_missing()
+    tables = (["registrations_participant"] if participant_ok else []) + ["registrations_participant_fallback"]
+    sql = " UNION ALL ".join(f"SELECT {cols} FROM {t} WHERE event=%s" for t in tables)
+    return sql, [events.current()] * len(tables)
+
+
+def _raw_counts() -> tuple[dict[str, dict[str, int]], int]:
+    """{column: {stored value: count}} and the overall headcount. NULL and '' both count as blank."""
+    source, params = _source_sql()
+    cols = [col for col, _, _ in DIMENSIONS]
+    counts = {col: {} for col in cols}
+    with connection.cursor() as cur:
+        if connection.vendor == "postgresql":
+            sets = ", ".join(f"({c})" for c in cols)
+            cur.execute(
+                f"SELECT {', '.join(cols)}, COUNT(*), GROUPING({', '.join(cols)}) "
+                f"FROM ({source}) p GROUP BY GROUPING SETS ({sets}, ())",
+                params,
+            )
+            full = (1 << len(cols)) - 1
+            total = 0
+            for row in cur.fetchall():
+                *values, n, grouping = row
+                if grouping == full:
+                    total = n
+                    continue
+                # exactly one column is grouped in this set: its GROUPING bit is 0
+                i = next(i for i in range(len(cols)) if not grouping & (1 << (len(cols) - 1 - i)))
+                bucket = counts[cols[i]]
+                bucket[values[i] or ""] = bucket.get(values[i] or "", 0) + n
+            return counts, total
+
+        for col in cols:
+            cur.execute(f"SELECT {col}, COUNT(*) FROM ({source}) p GROUP BY {col}", params)
+            for value, n in cur.fetchall():
+                counts[col][value or ""] = counts[col].get(value or "", 0) + n
+        return counts, sum(counts[cols[0]].values())
+
+
+def _labelled(raw: dict[str, int], vocabulary) -> list[tuple[str, int]]:
+    """Vocabulary entries first, in form order (stored keys or labels both match), then anything else."""
+    raw = dict(raw)
+    out = []
+    for value, label in vocabulary:
+        n = raw.pop(value, 0) + (raw.pop(label, 0) if label != value else 0)
+        out.append((label, n))
+    blank = raw.pop("", 0)
+    out += sorted(raw.items(), key=lambda kv: (-kv[1], kv[0]))
+    if blank:
+        out.append((BLANK_LABEL, blank))
+    return out
+
+
+def build_report() -> dict:
+    from .views_flat import FEE_USD
+
+    counts, total = _raw_counts()
+    return {
+        "total": total,
+        "fee_total": total * FEE_USD,
+        "sections": [
+            {"key": col, "title": title, "rows": _labelled(counts[col], vocab)}
+            for col, title, vocab in DIMENSIONS
+        ],
+    }
+
+
+def get_report() -> dict:
+    """The report for the current data version, computed at most once per write."""
+    key = f"reports::summary::{events.current()}::{current_version()}"
+    report = cache.get(key)
+    if report is None:
+        report = build_report()
+        cache.set(key, report, _ttl())
+    return report
+
+
+def report_csv(report: dict) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["Report", "Value", "Count"])
+    for section in report["sections"]:
+        for label, n in section["rows"]:
+            writer.writerow([section["title"], label, n])
+    writer.writerow(["Total participants", "", report["total"]])
+    return buf.getvalue()
@@ -0,0 +1,124 @@
+# registrations/roster.py
+"""
+The pending-user roster shared by the manage_pending_users pages: keyset
+pagination (no OFFSET, so page 200 costs the same as page 1), search by name,
+email and category, and each user's registration count and fee total
+annotated in the same query.
+"""
+import base64
+import json
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .constants import REG_FEE_PER_PERSON
+from .models import FLCRegistration, PendingUser
+
+PAGE_SIZE = 50
+
+# ordering name -> key fields; the last one is unique so the cursor is exact
+ORDERINGS = {
+    "name": ("last_name", "first_name", "id"),
+    "newest": ("-id",),
+}
+
+SEARCH_FIELDS = ("first_name", "last_name", "email", "category")
+
+
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+# cursor key field -> the only type its value may have
+CURSOR_TYPES = {"last_name": str, "first_name": str, "id": int}
+
+
+def _valid_key(field: str, value) -> bool:
+    kind = CURSOR_TYPES[field.lstrip("-")]
+    if kind is int:  # bool is an int too; ids are positive bigints
+        return type(value) is int and 0 < value < 2 ** 63
+    return type(value) is kind and "\x00" not in value
+
+
+def decode_cursor(cursor: str, fields):
+    """
+    Cursor -> list of key values for `fields`, or None if it is missing or
+    mangled (= first page): anything but a list of the right length holding
+    the right scalar types is rejected here rather than failing in the query.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not (isinstance(values, list) and len(values) == len(fields)
+            and all(_valid_key(f, v) for f, v in zip(fields, values))):
+        return None
+    return values
+
+
+def _after(fields, values) -> Q:
+    """Rows strictly after `values` in the ordering given by `fields` (row-value comparison as ORs)."""
+    q = Q()
+    for i, field in enumerate(fields):
+        name = field.lstrip("-")
+        step = Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": values[i]})
+        for prev, value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev.lstrip("-"): value})
+        q |= step
+    return q
+
+
+def search(qs, query: str):
+    """Every whitespace-separated term must match one of SEARCH_FIELDS."""
+    for term in query.split():
+        term_q = Q()
+        for field in SEARCH_FIELDS:
+            term_q |= Q(**{f"{field}__icontains": term})
+        qs = qs.filter(term_q)
+    return qs
+
+
+def annotated_users():
+    """PendingUsers with this event's registration_count and fee_total, still a single SELECT."""
+    counts = (
+        FLCRegistration.objects.current_event().filter(advisor=OuterRef("pk"))
+        .order_by().values("advisor").annotate(n=Count("id")).values("n")
+    )
+    return PendingUser.objects.annotate(
+        registration_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)),
+    ).annotate(
+        fee_total=ExpressionWrapper(
+            F("registration_count") * Value(REG_FEE_PER_PERSON),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+def roster_page(params, order: str = "name", page_size: int = PAGE_SIZE) -> dict:
+    """
+    One roster page for request.GET-like `params` (q, after). Returns template
+    context: pending_users, q, next_cursor, has_next, is_first_page.
+    """
+    fields = ORDERINGS[order]
+    query = (params.get("q") or "").strip()
+    qs = search(annotated_users(), query).order_by(*fields)
+
+    cursor = decode_cursor(params.get("after") or "", fields)
+    if cursor:
+        qs = qs.filter(_after(fields, cursor))
+
+    rows = list(qs[:page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = (
+        encode_cursor([getattr(rows[-1], f.lstrip("-")) for f in fields]) if has_next else ""
+    )
+    return {
+        "pending_users": rows,
+        "q": query,
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "is_first_page": not cursor,
+    }
@@ -0,0 +1,164 @@
+# registrations/roster_sync.py
+"""
+Sync PendingUser from a full roster CSV (the staff spreadsheet). Rows are
+keyed by normalized email (trimmed, lowercased), diffed against the table in
+memory after one SELECT, and only the differences are written: one
+bulk_create for new people, one bulk_update for changed ones and, optionally,
+one UPDATE deactivating people no longer on the roster.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import time
+
+from django.db import transaction
+
+from . import audit, vocab
+from .models import PendingUser
+
+SYNC_FIELDS = ("first_name", "last_name", "category", "college_company")
+
+# accepted header spellings -> field
+HEADER_ALIASES = {
+    "email": "email", "e-mail": "email", "email address": "email",
+    "first_name": "first_name", "first name": "first_name", "first": "first_name",
+    "last_name": "last_name", "last name": "last_name", "last": "last_name",
+    "category": "category", "role": "category",
+    "college_company": "college_company", "college/company": "college_company",
+    "college": "college_company", "company": "college_company",
+}
+
+BATCH_SIZE = 1000
+
+# column limits (first/last 120, category 50, college 120, email 254); an over-long
+# value would otherwise fail the whole bulk write instead of one line
+MAX_LENGTHS = {f: PendingUser._meta.get_field(f).max_length for f in ("email", *SYNC_FIELDS)}
+
+
+def normalize_email(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+def read_roster(text: str) -> tuple[dict[str, dict], list[str]]:
+    """CSV text -> ({normalized email: fields}, problems). Later duplicates win."""
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    columns = {h: HEADER_ALIASES.get((h or "").strip().lower()) for h in reader.fieldnames or []}
+    if "email" not in columns.values():
+        return {}, ["No email column found in the header row."]
+
+    rows, problems = {}, []
+    for line_no, raw in enumerate(reader, start=2):
+        rec = {field: (raw.get(h) or "").strip() for h, field in columns.items() if field}
+        email = normalize_email(rec.pop("email", ""))
+        if not email or "@" not in email:
+            problems.append(f"line {line_no}: missing or invalid email")
+            continue
+        too_long = [f for f, v in (("email", email), *rec.items()) if len(v) > MAX_LENGTHS.get(f, len(v))]
+        if too_long:
+            problems.append(f"line {line_no}: {', '.join(too_long)} too long")
+            continue
+        if email in rows:
+            problems.append(f"line {line_no}: duplicate of {email}, later row used")
+        rows[email] = {f: rec.get(f, "") for f in SYNC_FIELDS}
+    return rows, problems
+
+
+class SyncPlan:
+    def __init__(self):
+        self.inserts: list[PendingUser] = []
+        self.updates: list[tuple[PendingUser, list[str]]] = []
+        self.before: dict[int, dict] = {}  # id -> changed fields' old values, for the audit log
+        self.deactivate_ids: list[int] = []
+        self.unchanged = 0
+        self.problems: list[str] = []
+        self.applied = False
+        self.seconds = 0.0
+
+    def summary(self) -> str:
+        return (f"{len(self.inserts)} to add, {len(self.updates)} to update, "
+                f"{len(self.deactivate_ids)} to deactivate, {self.unchanged} unchanged, "
+                f"{len(self.problems)} problem(s)")
+
+    def report_lines(self, limit: int = 20) -> list[str]:
+        lines = [self.summary()]
+        lines += [f"+ {u.email} ({u.first_name} {u.last_name}, {u.category})" for u in self.inserts[:limit]]
+        lines += [f"~ {u.email}: {', '.join(fields)}" for u, fields in self.updates[:limit]]
+        lines += [f"! {p}" for p in self.problems[:limit]]
+        return lines
+
+
+def plan_sync(rows: dict[str, dict], deactivate_missing: bool = False) -> SyncPlan:
+    plan = SyncPlan()
+    existing: dict[str, PendingUser] = {}
+    ambiguous = set()
+    for user in PendingUser.objects.only("id", "email", "is_active", *SYNC_FIELDS):
+        key = normalize_email(user.email)
+        if key in existing:
+            ambiguous.add(key)
+        existing[key] = user
+    for key in ambiguous:
+        plan.problems.append(f"{key}: several rows differ only by case; left untouched")
+        existing.pop(key)
+        rows.pop(key, None)
+
+    for email, fields in rows.items():
+        user = existing.get(email)
+        if user is None:
+            plan.inserts.append(PendingUser(email=email, is_active=True, **fields))
+            continue
+        changed = [f for f in SYNC_FIELDS if fields[f] and getattr(user, f) != fields[f]]
+        if changed:
+            plan.before[user.id] = {f: getattr(user, f) for f in changed}
+        if not user.is_active:
+            changed.append("is_active")
+            plan.before.setdefault(user.id, {})["is_active"] = False
+            user.is_active = True
+        for f in changed:
+            if f != "is_active":
+                setattr(user, f, fields[f])
+        if changed:
+            plan.updates.append((user, changed))
+        else:
+            plan.unchanged += 1
+
+    if deactivate_missing and rows:  # an empty or unreadable file must not deactivate everyone
+        plan.deactivate_ids = [u.id for key, u in existing.items() if key not in rows and u.is_active]
+    return plan
+
+
+def _audit(plan: SyncPlan) -> None:
+    for user in plan.inserts:
+        audit.record("insert", "pendinguser", user.pk or user.email,
+                     after={"email": user.email, **{f: getattr(user, f) for f in SYNC_FIELDS}})
+    for user, changed in plan.updates:
+        audit.record("update", "pendinguser", user.pk, before=plan.before.get(user.id),
+                     after={f: getattr(user, f) for f in changed})
+    for user_id in plan.deactivate_ids:
+        audit.record("update", "pendinguser", user_id, before={"is_active": True}, after={"is_active": False})
+
+
+def apply_sync(plan: SyncPlan) -> SyncPlan:
+    t0 = time.perf_counter()
+    with audit.buffered(path="roster-sync"), transaction.atomic():
+        if plan.inserts:
+            PendingUser.objects.bulk_create(plan.inserts, batch_size=BATCH_SIZE)
+        if plan.updates:
+            fields = sorted({f for _, changed in plan.updates for f in changed})
+            PendingUser.objects.bulk_update([u for u, _ in plan.updates], fields, batch_size=BATCH_SIZE)
+        if plan.deactivate_ids:
+            PendingUser.objects.filter(id__in=plan.deactivate_ids).update(is_active=False)
+        _audit(plan)
+    vocab.invalidate()  # the roster may bring new categories
+    plan.applied = True
+    plan.seconds = time.perf_counter() - t0
+    return plan
+
+
+def sync_roster(text: str, deactivate_missing: bool = False, dry_run: bool = False) -> SyncPlan:
+    rows, problems = read_roster(text)
+    plan = plan_sync(rows, deactivate_missing)
+    plan.problems[:0] = problems
+    if not dry_run and rows:
+        apply_sync(plan)
+    return plan
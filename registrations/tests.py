@@ -1,3 +1,824 @@
-from django.test import TestCase
+import datetime
+import threading
+import time
+import unittest
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.cache import cache
+from django.core.signing import SignatureExpired
+from django.db import connection, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    dedupe, digest, email_utils, events, idempotency, purge, ratelimit, reports, roster, roster_sync, tours,
+    utils_tokens, views_flat, views_full,
+)
+from .constants import ACCESS_SESSION_KEY
+from .decorators import grant_access
+from .models import (
+    AccessLink, AuditEntry, FLCRegistration, IdempotencyKey, ParticipantEvent, PendingUser, ReportVersion, RevokedToken,
+    TourCapacity,
+)
+from .utils_tokens import make_validation_token
+
+
+def _postgres_only(cls):
+    return unittest.skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")(cls)
+
+
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="1.2.3.4", REMOTE_ADDR="10.0.0.9")
+        self.assertEqual(ratelimit.client_ip(request), "10.0.0.9")
+
+    @override_settings(RATE_LIMIT_TRUSTED_PROXIES=1)
+    def test_trusted_proxy_hop_is_taken_from_the_right(self):
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="6.6.6.6, 1.2.3.4", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(ratelimit.client_ip(request), "1.2.3.4")
+
+    def test_limit_holds(self):
+        results = [ratelimit.take("test:ip:1", "3/m")[0] for _ in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+
+
+class GrantAccessTests(SimpleTestCase):
+    def _request(self):
+        request = RequestFactory().get("/")
+        request.session = import_module("django.contrib.sessions.backends.signed_cookies").SessionStore()
+        return request
+
+    def test_same_email_with_fresh_expiry_leaves_session_unmodified(self):
+        request = self._request()
+        grant_access(request, "a@example.com", 3600)
+        request.session.modified = False
+        grant_access(request, "a@example.com", 3600)
+        self.assertFalse(request.session.modified)
+
+    def test_same_email_refreshes_expiry_when_low(self):
+        request = self._request()
+        request.session[ACCESS_SESSION_KEY] = "a@example.com"
+        request.session.set_expiry(timezone.now() + datetime.timedelta(seconds=600))
+        request.session.modified = False
+        grant_access(request, "a@example.com", 3600)
+        self.assertTrue(request.session.modified)
+        self.assertGreater(request.session.get_expiry_age(), 3500)
+
+    def test_relative_expiry_is_replaced_with_an_absolute_one(self):
+        request = self._request()
+        request.session[ACCESS_SESSION_KEY] = "a@example.com"
+        request.session.set_expiry(3600)
+        request.session.modified = False
+        grant_access(request, "a@example.com", 3600)
+        self.assertTrue(request.session.modified)
+        self.assertLess(request.session.get_expiry_age(modification=timezone.now() + datetime.timedelta(seconds=60)), 3600)
+
+
+@override_settings(ACCESS_TOKEN_REVOCATION_SYNC_SECONDS=0)
+class AccessTokenTests(TestCase):
+    def test_token_can_be_consumed_once(self):
+        token = utils_tokens.make_access_token("a@example.com", 600, user_id=7)
+        claims = utils_tokens.read_access_token(token)
+        self.assertEqual((claims["email"], claims["user_id"]), ("a@example.com", 7))
+        self.assertEqual(utils_tokens.consume_access_token(token)["nonce"], claims["nonce"])
+        self.assertTrue(RevokedToken.objects.filter(nonce=claims["nonce"]).exists())
+        with self.assertRaises(utils_tokens.TokenRevoked):
+            utils_tokens.read_access_token(token)
+        with self.assertRaises(utils_tokens.TokenRevoked):
+            utils_tokens.consume_access_token(token)
+
+    def test_replay_is_caught_by_the_insert_when_memory_has_not_seen_it(self):
+        token = utils_tokens.make_access_token("a@example.com", 600)
+        utils_tokens.consume_access_token(token)
+        with mock.patch.object(utils_tokens, "revoked", utils_tokens._RevocationSet()), \
+                mock.patch.object(utils_tokens._RevocationSet, "_maybe_sync"):
+            with self.assertRaises(utils_tokens.TokenRevoked):
+                utils_tokens.consume_access_token(token)
+
+    def test_expired_token_is_rejected(self):
+        token = utils_tokens.make_access_token("a@example.com", -1)
+        with self.assertRaises(SignatureExpired):
+            utils_tokens.read_access_token(token)
+        with self.assertRaises(SignatureExpired):
+            utils_tokens.consume_access_token(token)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_sync_picks_up_other_processes_revocations_from_the_watermark(self):
+        expires = timezone.now() + datetime.timedelta(hours=1)
+        first = RevokedToken.objects.create(nonce="first", expires_at=expires)
+        revoked = utils_tokens._RevocationSet()
+        self.assertIn("first", revoked)
+        self.assertEqual(revoked._watermark, first.created_at)
+        # rows older than the watermark were already seen and are not fetched again
+        RevokedToken.objects.create(nonce="backdated", expires_at=expires)
+        RevokedToken.objects.filter(nonce="backdated").update(created_at=first.created_at - datetime.timedelta(minutes=1))
+        RevokedToken.objects.create(nonce="second", expires_at=expires)
+        self.assertIn("second", revoked)
+        self.assertNotIn("backdated", revoked)
+        self.assertGreaterEqual(revoked._watermark, first.created_at)
+
+    def test_sync_drops_expired_nonces(self):
+        revoked = utils_tokens._RevocationSet()
+        revoked.add("stale", time.time() - 1)
+        self.assertNotIn("stale", revoked)
+
+
+class ValidateUserTests(TestCase):
+    def test_token_for_a_missing_user_grants_nothing(self):
+        token = make_validation_token(999999, "gone@example.com")
+        self.client.get(reverse("registrations:registrations_validate", args=[token]))
+        self.assertNotIn(ACCESS_SESSION_KEY, self.client.session)
+
+    def test_repeat_click_keeps_the_first_validation_time(self):
+        user = PendingUser.objects.create(first_name="Ann", last_name="Lee", email="ann@example.com")
+        url = reverse("registrations:registrations_validate", args=[make_validation_token(user.id, user.email)])
+        self.client.get(url)
+        first = PendingUser.objects.get(pk=user.pk).validated_at
+        self.client.get(url)
+        user.refresh_from_db()
+        self.assertTrue(user.is_validated)
+        self.assertEqual(user.validated_at, first)
+        self.assertEqual(self.client.session[ACCESS_SESSION_KEY], "ann@example.com")
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class ResendConfirmationTests(TestCase):
+    def test_send_failure_looks_like_an_unknown_email(self):
+        PendingUser.objects.create(first_name="Ann", last_name="Lee", email="ann@example.com")
+        url = reverse("registrations:registrations_resend_confirmation")
+        unknown = self.client.post(url, {"email": "nobody@example.com"})
+        with mock.patch("registrations.views_async.send_html", side_effect=OSError("smtp down")), \
+                self.assertLogs("registrations.views_async", "ERROR"):
+            failed = self.client.post(url, {"email": "ann@example.com"})
+        self.assertEqual((failed.status_code, failed.content), (unknown.status_code, unknown.content))
+
+
+class RosterCursorTests(SimpleTestCase):
+    fields = roster.ORDERINGS["name"]
+
+    def test_round_trip(self):
+        values = ["Núñez", "José", 42]
+        self.assertEqual(roster.decode_cursor(roster.encode_cursor(values), self.fields), values)
+
+    def test_mangled_cursors_mean_first_page(self):
+        for values in ({"a": 1}, ["Lee", "Ann"], ["Lee", "Ann", "42"], ["Lee", ["Ann"], 42],
+                       ["Lee", "Ann", True], ["Lee", "Ann", 2 ** 70], ["Le\x00e", "Ann", 1]):
+            self.assertIsNone(roster.decode_cursor(roster.encode_cursor(values), self.fields), values)
+        self.assertIsNone(roster.decode_cursor("not base64 !", self.fields))
+
+
+class ReadRosterTests(SimpleTestCase):
+    def test_over_long_values_are_reported_not_loaded(self):
+        text = ("email,first name,category\n"
+                f"a@example.com,{'x' * 121},Faculty\n"
+                "b@example.com,Ann,Faculty\n")
+        rows, problems = roster_sync.read_roster(text)
+        self.assertEqual(list(rows), ["b@example.com"])
+        self.assertEqual(problems, ["line 2: first_name too long"])
+
+
+class MatchKeyTests(SimpleTestCase):
+    def test_match_key_ignores_case_accents_and_punctuation(self):
+        self.assertEqual(dedupe.match_key("José ", "Núñez-Ruiz", "Hinds CC"),
+                         dedupe.match_key("jose", "NUNEZ RUIZ", "hinds c.c."))
+        self.assertNotEqual(dedupe.match_key("Ann", "Lee", "Hinds CC"), dedupe.match_key("Ann", "Lee", "Jones College"))
+
+
+class IdempotencyTests(TestCase):
+    def test_replay_gets_the_first_outcome(self):
+        self.assertEqual(idempotency.begin("adv@example.com", "k1"), (True, None))
+        self.assertEqual(idempotency.begin("adv@example.com", "k1"), (False, None))  # still running
+        idempotency.finish("adv@example.com", "k1", {"status_block": "saved"})
+        self.assertEqual(idempotency.begin("adv@example.com", "k1"), (False, {"status_block": "saved"}))
+        self.assertEqual(idempotency.begin("other@example.com", "k1"), (True, None))
+
+    def test_released_or_expired_key_can_be_claimed_again(self):
+        idempotency.begin("adv@example.com", "k2")
+        idempotency.release("adv@example.com", "k2")
+        self.assertEqual(idempotency.begin("adv@example.com", "k2"), (True, None))
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(idempotency.begin("adv@example.com", "k2"), (True, None))
+
+    def test_batch_in_flight_keeps_the_queue_and_its_key(self):
+        rows = [("Ann", "Lee", "", "M", "Hinds CC", "", "", "")]
+        post = {"idem_key": "k3"}
+        idempotency.begin("adv@example.com", "k3")  # another request is still saving this list
+        with mock.patch.object(views_flat, "_batch_rows", return_value=rows), \
+                mock.patch.object(views_flat, "_batch_problems", return_value=[]):
+            status_block, queued, idem_key = views_flat._save_batch_post(post, "adv@example.com")
+        self.assertIn("still being saved", status_block)
+        self.assertEqual((queued, idem_key), (rows, "k3"))
+
+    def test_save_that_raises_releases_the_key(self):
+        def save():
+            raise RuntimeError("boom")
+        with self.assertRaises(RuntimeError):
+            views_flat._run_once("k4", "adv@example.com", save)
+        self.assertFalse(IdempotencyKey.objects.filter(key="k4").exists())
+
+
+class ReportVersionTests(TestCase):
+    def test_bump_is_stored_in_the_database(self):
+        self.assertEqual(reports.current_version(), 0)
+        reports.bump_version()
+        reports.bump_version()
+        self.assertEqual(ReportVersion.objects.get().version, 2)
+        self.assertEqual(reports.current_version(), 2)
+
+
+class _FailingTransport(email_utils.FakeTransport):
+    """Fails the given (0-based) send calls, accepts the rest."""
+
+    def __init__(self, failing):
+        super().__init__()
+        self.failing, self.calls = set(failing), 0
+
+    def send(self, payload):
+        self.calls += 1
+        if self.calls - 1 in self.failing:
+            raise RuntimeError("HTTP 500: try later")
+        return super().send(payload)
+
+
+class SendBulkTests(SimpleTestCase):
+    def _use(self, transport):
+        email_utils.set_transport(transport)
+        self.addCleanup(email_utils.set_transport, None)
+        return transport
+
+    @staticmethod
+    def _by_email(payload):
+        return {p["to"][0]["email"]: p for p in payload["personalizations"]}
+
+    def test_recipients_are_chunked_at_max_personalizations(self):
+        transport = self._use(email_utils.FakeTransport())
+        recipients = [f"r{i}@example.com" for i in range(7)]
+        with mock.patch.object(email_utils, "MAX_PERSONALIZATIONS", 3):
+            self.assertEqual(email_utils.send_bulk("Hi", recipients, "<p>Hi</p>"), 7)
+        self.assertEqual([len(p["personalizations"]) for p in transport.sent], [3, 3, 1])
+        self.assertEqual(sorted(e for p in transport.sent for e in self._by_email(p)), sorted(recipients))
+
+    def test_each_recipient_gets_its_own_substitutions(self):
+        transport = self._use(email_utils.FakeTransport())
+        email_utils.send_bulk("Hi", [("a@example.com", {"-link-": "https://x/a"}),
+                                     ("b@example.com", {"-link-": "https://x/b"}),
+                                     "c@example.com"], "<a href='-link-'>go</a>")
+        (payload,) = transport.sent
+        people = self._by_email(payload)
+        self.assertEqual(people["a@example.com"]["substitutions"], {"-link-": "https://x/a"})
+        self.assertEqual(people["b@example.com"]["substitutions"], {"-link-": "https://x/b"})
+        self.assertNotIn("substitutions", people["c@example.com"])
+
+    def test_failed_batch_is_logged_and_not_counted(self):
+        transport = self._use(_FailingTransport(failing={1}))
+        with mock.patch.object(email_utils, "MAX_PERSONALIZATIONS", 2), \
+                self.assertLogs("registrations.email_utils", "WARNING") as logs:
+            accepted = email_utils.send_bulk("Hi", [f"r{i}@example.com" for i in range(5)], "<p>Hi</p>")
+        self.assertEqual(accepted, 3)  # batches of 2, 2, 1; the second failed
+        self.assertEqual(transport.recipients, 3)
+        self.assertIn("2 recipients", logs.output[0])
+
+    def test_sendgrid_transport_raises_on_http_errors(self):
+        transport = email_utils.SendGridTransport("key")
+        with mock.patch.object(transport.session, "post",
+                               return_value=mock.Mock(status_code=202, text="")) as post:
+            self.assertEqual(transport.send({"x": 1}), 202)
+        self.assertEqual(post.call_args.args, (email_utils.SENDGRID_SEND_URL,))
+        self.assertEqual(post.call_args.kwargs["json"], {"x": 1})
+        self.assertEqual(transport.session.headers["Authorization"], "Bearer key")
+        with mock.patch.object(transport.session, "post", return_value=mock.Mock(status_code=429, text="slow down")):
+            with self.assertRaisesRegex(RuntimeError, "HTTP 429: slow down"):
+                transport.send({"x": 1})
+
+
+class PurgeTests(TestCase):
+    def test_only_expired_or_used_past_grace_rows_go(self):
+        now = timezone.now()
+        past, future = now - datetime.timedelta(hours=1), now + datetime.timedelta(hours=1)
+        expired = [AccessLink.objects.create(email=f"x{i}@example.com", expires_at=past) for i in range(3)]
+        live = AccessLink.objects.create(email="live@example.com", expires_at=future)
+        used_recently = AccessLink.objects.create(email="recent@example.com", expires_at=future, used=True)
+        used_long_ago = AccessLink.objects.create(email="old@example.com", expires_at=future, used=True)
+        AccessLink.objects.filter(pk=used_long_ago.pk).update(created_at=now - datetime.timedelta(hours=48))
+        for i in range(2):
+            RevokedToken.objects.create(nonce=f"gone{i}", expires_at=past)
+        RevokedToken.objects.create(nonce="kept", expires_at=future)
+        IdempotencyKey.objects.create(advisor="adv@example.com", key="old", expires_at=past)
+        IdempotencyKey.objects.create(advisor="adv@example.com", key="new", expires_at=future)
+        Session.objects.create(session_key="gone", session_data="", expire_date=past)
+        Session.objects.create(session_key="kept", session_data="", expire_date=future)
+
+        with mock.patch("registrations.purge.time.sleep") as sleep:
+            report = purge.purge(batch_size=2, sleep=0.01, used_grace_hours=24)
+
+        self.assertEqual({r["target"]: r["rows"] for r in report}, {
+            "expired access links": 3,
+            "used access links": 1,
+            "expired token revocations": 2,
+            "expired idempotency keys": 1,
+            "expired sessions": 1,
+        })
+        self.assertTrue(sleep.called)  # 3 expired links take two batches of 2
+        self.assertEqual(set(AccessLink.objects.values_list("pk", flat=True)), {live.pk, used_recently.pk})
+        self.assertFalse(AccessLink.objects.filter(pk__in=[link.pk for link in expired]).exists())
+        self.assertEqual(list(RevokedToken.objects.values_list("nonce", flat=True)), ["kept"])
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"])
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["kept"])
+
+
+class FlatPendingUserAuditTests(TransactionTestCase):
+    def test_insert_is_audited_once(self):
+        views_flat._reset_schema_registry()
+        for _ in range(2):  # the second call hits ON CONFLICT DO NOTHING
+            self.assertEqual(views_flat._insert_pending_user("Ann", "Lee", "ann@example.com", "Faculty"), (True, ""))
+        user = PendingUser.objects.get(email="ann@example.com")
+        entries = AuditEntry.objects.filter(entity="pendinguser", object_key=str(user.pk))
+        self.assertEqual([e.action for e in entries], ["insert"])
+
+
+@_postgres_only
+class PendingUserUpsertConcurrencyTests(TransactionTestCase):
+    """Hammer PendingUser.upsert for one email from many threads at once."""
+
+    threads = 16
+    rounds = 25
+
+    def _hammer(self, worker):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+
+        def run(i):
+            try:
+                barrier.wait()
+                for n in range(self.rounds):
+                    worker(i, n)
+            except Exception as e:  # surfaced in the main thread below
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        pool = [threading.Thread(target=run, args=(i,)) for i in range(self.threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_one_row_and_exactly_one_create(self):
+        created = []
+
+        def worker(i, n):
+            _, was_created = PendingUser.upsert("race@example.com", first_name=f"T{i}", category="Student")
+            if was_created:
+                created.append(i)
+
+        self._hammer(worker)
+        self.assertEqual(PendingUser.objects.filter(email="race@example.com").count(), 1)
+        self.assertEqual(len(created), 1)
+
+    def test_blank_fields_do_not_clobber(self):
+        PendingUser.upsert("keep@example.com", first_name="Ada", last_name="Lovelace", category="Faculty")
+        self._hammer(lambda i, n: PendingUser.upsert("keep@example.com", first_name="", category=""))
+        obj = PendingUser.objects.get(email="keep@example.com")
+        self.assertEqual((obj.first_name, obj.last_name, obj.category), ("Ada", "Lovelace", "Faculty"))
+
+    def test_overwrite_false_keeps_existing_row(self):
+        PendingUser.upsert("adv@example.com", first_name="Grace", category="Staff")
+        self._hammer(lambda i, n: PendingUser.upsert("adv@example.com", overwrite=False, first_name=f"X{i}"))
+        obj, created = PendingUser.upsert("adv@example.com", overwrite=False)
+        self.assertFalse(created)
+        self.assertEqual((obj.first_name, obj.category), ("Grace", "Staff"))
+
+
+@_postgres_only
+@override_settings(RATE_LIMIT_ENABLED=False)
+class QueryBudgetTests(TransactionTestCase):
+    """
+    Upper bounds on database round trips per view and scenario, at registration-day
+    data sizes. A failure lists the queries that ran, so the regression is obvious.
+    TransactionTestCase because the flat-table probe may fail a statement, which
+    would poison an enclosing transaction on PostgreSQL.
+    """
+
+    advisors = 40
+    per_advisor = 25
+
+    def setUp(self):
+        cache.clear()  # rate-limit counters
+        PendingUser.objects.bulk_create(
+            [PendingUser(first_name="Adv", last_name=str(i), email=f"adv{i}@example.com", category="Faculty")
+             for i in range(self.advisors)]
+        )
+        self.advisor = PendingUser.objects.get(email="adv0@example.com")
+        views_flat._reset_schema_registry()
+        _, participant_ok = views_flat._ensure_flat_tables_if_missing()
+        table = "registrations_participant" if participant_ok else "registrations_participant_fallback"
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {table}")
+            cur.executemany(
+                f"INSERT INTO {table} (first_name,last_name,student_organization,tee_shirt_size,"
+                f"college_company,tour,fee_cents,advisor_email,event) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+                [(f"P{n}", f"L{a}", "DECA", "M", "Hinds Community College", "None", views_flat.FEE_CENTS,
+                  f"adv{a}@example.com", events.current()) for a in range(self.advisors) for n in range(self.per_advisor)],
+            )
+        FLCRegistration.objects.bulk_create(
+            [FLCRegistration(advisor=self.advisor, first_name=f"R{n}", last_name="Reg") for n in range(self.per_advisor)]
+        )
+
+    def assertMaxQueries(self, budget, fn, *args, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            result = fn(*args, **kwargs)
+        self.assertLessEqual(
+            len(ctx.captured_queries), budget,
+            f"{len(ctx.captured_queries)} queries (budget {budget}):\n"
+            + "\n".join(q["sql"] for q in ctx.captured_queries),
+        )
+        return result
+
+    def _form_url(self, **params):
+        from urllib.parse import urlencode
+        return reverse("registrations:registrations_form") + ("?" + urlencode(params) if params else "")
+
+    def _save(self):
+        return self.client.post(self._form_url(email="adv0@example.com"), {
+            "first_name": "New", "last_name": "Person", "advisor_email": "adv0@example.com",
+        })
+
+    # ---- form_view -------------------------------------------------------
+
+    def test_form_get(self):
+        resp = self.assertMaxQueries(2, self.client.get, self._form_url(email="adv0@example.com"))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_form_save_warm(self):
+        # duplicate probe + insert + digest event + reports version + audit entry + the two list queries;
+        # schema probe cached
+        self.assertMaxQueries(7, self._save)
+
+    def test_form_save_cold_worker(self):
+        views_flat._reset_schema_registry()
+        self.assertMaxQueries(28, self._save)  # + the one-off probe/DDL pass
+        self.assertMaxQueries(7, self._save)
+
+    def test_form_save_batch(self):
+        # one duplicate probe + one multi-row INSERT (in a savepoint) + one digest INSERT + the reports
+        # version + one audit INSERT + the two list queries, for any row count
+        n = 20
+        batch = {f"batch_{f}": [""] * n for f in views_flat.BATCH_FIELDS}
+        batch.update(batch_first_name=[f"B{i}" for i in range(n)], batch_last_name=["Batch"] * n)
+        self.assertMaxQueries(9, self.client.post, self._form_url(email="adv0@example.com"),
+                              {**batch, "save_batch": "1", "advisor_email": "adv0@example.com"})
+        rows = views_flat._select_participants_for_advisor("adv0@example.com", 100)
+        self.assertEqual(sum(1 for r in rows if r[2] == "Batch"), n)
+
+    def test_form_delete(self):
+        rows = views_flat._select_participants_for_advisor("adv0@example.com", 1)
+        rowkey = rows[0][0]  # already "src:id"
+        self.assertMaxQueries(7, self.client.post, self._form_url(email="adv0@example.com"),
+                              {"delete_row": rowkey, "advisor_email": "adv0@example.com"})
+        remaining = views_flat._select_participants_for_advisor("adv0@example.com", 100)
+        self.assertNotIn(rowkey, [r[0] for r in remaining])
+
+    def test_form_bulk_update(self):
+        rowkeys = [r[0] for r in views_flat._select_participants_for_advisor("adv0@example.com", 50)]
+        # SELECT ... FOR UPDATE + seat check (savepoint) + one UPDATE ... FROM (VALUES ...) + reports version
+        # + audit + the two lists
+        self.assertMaxQueries(10, self.client.post, self._form_url(email="adv0@example.com"), {
+            "bulk_action": "update", "selected": rowkeys, "advisor_email": "adv0@example.com",
+            "bulk_tee_shirt_size": "Large", "bulk_tour": "Haley Barbour Center for Manufacturing Excellence",
+        })
+        rows = views_flat._select_participants_for_advisor("adv0@example.com", 50)
+        self.assertTrue(all(r[5] == "Large" and r[7].startswith("Haley") for r in rows))
+
+    def test_form_bulk_delete(self):
+        rowkeys = [r[0] for r in views_flat._select_participants_for_advisor("adv0@example.com", 50)]
+        rowkeys.append(views_flat._select_participants_for_advisor("adv1@example.com", 1)[0][0])  # not adv0's
+        # one DELETE ... RETURNING + one digest INSERT + the reports version + one audit INSERT
+        # + the two list queries
+        self.assertMaxQueries(6, self.client.post, self._form_url(email="adv0@example.com"), {
+            "bulk_action": "delete", "selected": rowkeys, "advisor_email": "adv0@example.com",
+        })
+        self.assertEqual(views_flat._select_participants_for_advisor("adv0@example.com", 50), [])
+        self.assertEqual(len(views_flat._select_participants_for_advisor("adv1@example.com", 50)), self.per_advisor)
+
+    def test_finish_advisor(self):
+        self.assertMaxQueries(4, self.client.post, self._form_url(email="adv0@example.com"),
+                              {"finish": "1", "advisor_email": "adv0@example.com"})
+
+    def test_finish_all(self):
+        self.assertMaxQueries(2, self.client.post, self._form_url(all=1), {"finish": "1"})
+
+    # ---- access / validation ---------------------------------------------
+
+    def test_names_by_category(self):
+        resp = self.assertMaxQueries(1, self.client.get, reverse("registrations:registrations_names_by_category"),
+                                     {"category": "Faculty"})
+        self.assertEqual(len(resp.json()["names"]), self.advisors)
+
+    def test_validate_user(self):
+        token = make_validation_token(self.advisor.id, self.advisor.email)
+        url = reverse("registrations:registrations_validate", args=[token])
+        self.assertMaxQueries(5, self.client.get, url)   # UPDATE + audit + new session
+        self.assertMaxQueries(3, self.client.get, url)   # repeat click: UPDATE + audit + session read
+
+    def test_access_link(self):
+        link = AccessLink.objects.create(email=self.advisor.email,
+                                         expires_at=timezone.now() + datetime.timedelta(hours=1))
+        url = reverse("registrations:registrations_access_link", args=[link.token])
+        # GET only confirms (mail scanners prefetch links); the POST consumes it
+        resp = self.assertMaxQueries(1, self.client.get, url)
+        self.assertEqual(resp.status_code, 200)
+        link.refresh_from_db()
+        self.assertFalse(link.used)
+        resp = self.assertMaxQueries(5, self.client.post, url)
+        self.assertEqual(resp.status_code, 302)
+        link.refresh_from_db()
+        self.assertTrue(link.used)
+
+    def test_manage_pending_users(self):
+        self.assertMaxQueries(1, self.client.get, reverse("registrations:registrations_manage_pending_users"))
+
+    # ---- session-gated template views (views_full) -------------------------
+
+    def _gated_request(self):
+        request = RequestFactory().get("/")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.session[ACCESS_SESSION_KEY] = self.advisor.email
+        request.session.save()
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(request.session.session_key)
+        return request
+
+    def test_registration_form_page(self):
+        # session load + advisor + one registrations query (no separate COUNT)
+        resp = self.assertMaxQueries(3, views_full.registration_form_view, self._gated_request(),
+                                     user_id=self.advisor.id)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_finish_session_page(self):
+        resp = self.assertMaxQueries(3, views_full.finish_session_view, self._gated_request(),
+                                     user_id=self.advisor.id)
+        self.assertEqual(resp.status_code, 200)
+
+
+@_postgres_only
+class ParticipantEditConflictTests(TransactionTestCase):
+    """Optimistic concurrency on participant edits: stale versions never overwrite."""
+
+    advisor = "edit@example.com"
+
+    def setUp(self):
+        views_flat._reset_schema_registry()
+        ok, msg = views_flat._insert_participant("Ann", "Lee", "DECA", "Small", "", "", "", "", 0, self.advisor)
+        self.assertTrue(ok, msg)
+        self.rowkey = views_flat._select_participants_for_advisor(self.advisor, 1)[0][0]
+        self.version = views_flat._fetch_participant_by_rowkey(self.rowkey)["version"]
+
+    def _edit(self, first, version):
+        return views_flat._update_participant(self.rowkey, self.advisor, first, "Lee", "DECA", "Small", "", "",
+                                              "", "", self.advisor, expected_version=version)
+
+    def test_second_editor_gets_conflict(self):
+        self.assertEqual(self._edit("Anne", self.version), (True, ""))
+        self.assertEqual(self._edit("Annie", self.version), (False, views_flat.EDIT_CONFLICT))
+        row = views_flat._fetch_participant_by_rowkey(self.rowkey)
+        self.assertEqual((row["first"], row["version"]), ("Anne", self.version + 1))
+
+    def test_simultaneous_edits_one_winner(self):
+        threads = 12
+        barrier = threading.Barrier(threads)
+        results = []
+
+        def run(i):
+            try:
+                barrier.wait()
+                results.append(self._edit(f"T{i}", self.version)[0])
+            finally:
+                connections.close_all()
+
+        pool = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(views_flat._fetch_participant_by_rowkey(self.rowkey)["version"], self.version + 1)
+
+
+@_postgres_only
+class DuplicateDetectionTests(TransactionTestCase):
+    """Name variants of one student collide on match_key; saves warn and the report groups them."""
+
+    def setUp(self):
+        views_flat._reset_schema_registry()
+
+    def test_save_warns_and_report_groups(self):
+        ok, msg = views_flat._insert_participant("José", "Núñez", "", "", "Hinds CC", "", "", "", 0, "a@example.com")
+        self.assertEqual((ok, msg), (True, ""))
+        ok, msg = views_flat._insert_participant("jose", "NUNEZ", "", "", "Hinds CC", "", "", "", 0, "b@example.com")
+        self.assertTrue(ok)
+        self.assertIn("registered by a@example.com", msg)
+        groups = dedupe.report()
+        self.assertEqual([sorted(r["advisor"] for r in g["rows"]) for g in groups], [["a@example.com", "b@example.com"]])
+
+    def test_matches_cross_the_form_families(self):
+        advisor = PendingUser.objects.create(first_name="Adv", last_name="R", email="r@example.com", category="Faculty")
+        FLCRegistration.objects.create(advisor=advisor, first_name="Ann", last_name="Lee", college_company="Jones College")
+        ok, msg = views_flat._insert_participant("ann", "LEE", "", "", "Jones College", "", "", "", 0, "f@example.com")
+        self.assertTrue(ok)
+        self.assertIn("registered by r@example.com", msg)
+        reg = FLCRegistration(advisor=advisor, first_name="Ann", last_name="Lee", college_company="Jones College")
+        self.assertIn("registered by f@example.com", dedupe.describe(reg.possible_duplicates(), advisor.email))
+
+
+@_postgres_only
+class EventScopingTests(TransactionTestCase):
+    """Participants belong to the event they were saved under; other events never see them."""
+
+    advisor = "event@example.com"
+
+    def setUp(self):
+        views_flat._reset_schema_registry()
+
+    def test_rows_stay_with_their_event(self):
+        with override_settings(CURRENT_EVENT="2098"):
+            views_flat._insert_participant("Old", "Year", "", "", "", "", "", "", 0, self.advisor)
+            rowkey = views_flat._select_participants_for_advisor(self.advisor)[0][0]
+        with override_settings(CURRENT_EVENT="2099"):
+            self.assertEqual(views_flat._select_participants_for_advisor(self.advisor), [])
+            self.assertIsNone(views_flat._fetch_participant_by_rowkey(rowkey))
+            self.assertEqual(views_flat._delete_participant(rowkey, self.advisor), (False, "Row not found"))
+            ok, msg = views_flat._insert_participant("Old", "Year", "", "", "", "", "", "", 0, self.advisor)
+            self.assertEqual((ok, msg), (True, ""))  # last year's entry is no duplicate
+        with override_settings(CURRENT_EVENT="2098"):
+            self.assertEqual([r[0] for r in views_flat._select_participants_for_advisor(self.advisor)], [rowkey])
+
+
+@_postgres_only
+class TourCapacityConcurrencyTests(TransactionTestCase):
+    """Many simultaneous sign-ups for one limited tour: never more seats than capacity."""
+
+    threads = 24
+    capacity = 10
+
+    def setUp(self):
+        TourCapacity.objects.create(tour="HB-CME", capacity=self.capacity)
+
+    def _signups(self, per_thread):
+        barrier = threading.Barrier(self.threads)
+        results, errors = [], []
+
+        def run():
+            try:
+                barrier.wait()
+                for _ in range(per_thread):
+                    results.append(tours.assign_tour("HB-CME"))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        pool = [threading.Thread(target=run) for _ in range(self.threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_seats_never_oversold(self):
+        results = self._signups(per_thread=3)
+        granted = [tour for tour, waitlisted in results if not waitlisted]
+        waitlisted = [tour for tour, waitlisted in results if waitlisted]
+        self.assertEqual(len(granted), self.capacity)
+        self.assertEqual(len(waitlisted), self.threads * 3 - self.capacity)
+        self.assertTrue(all(t == tours.WAITLIST_PREFIX + "HB-CME" for t in waitlisted))
+        self.assertEqual(TourCapacity.objects.get(tour="HB-CME").reserved, self.capacity)
+
+    def test_released_seat_can_be_taken_again(self):
+        self._signups(per_thread=1)
+        tours.release_seat("Haley Barbour Center for Manufacturing Excellence")
+        self.assertEqual(tours.seats_left("HB-CME"), 1)
+        self.assertEqual(tours.assign_tour("HB-CME"), ("HB-CME", False))
+        self.assertEqual(tours.assign_tour("HB-CME"), (tours.WAITLIST_PREFIX + "HB-CME", True))
+
+    def test_seats_are_per_event(self):
+        with override_settings(CURRENT_EVENT="2099"):
+            self.assertIsNone(tours.seats_left("HB-CME"))  # last year's limit doesn't carry over
+            TourCapacity.objects.create(tour="HB-CME", event="2099", capacity=1)
+            self.assertEqual(tours.assign_tour("HB-CME"), ("HB-CME", False))
+            self.assertTrue(tours.assign_tour("HB-CME")[1])
+        self.assertEqual(tours.seats_left("HB-CME"), self.capacity)
+
+    def test_freed_seat_goes_to_the_oldest_waitlisted(self):
+        views_flat._reset_schema_registry()
+        views_flat._ensure_flat_tables_if_missing()
+        advisor = "tours@example.com"
+        for i in range(self.capacity + 2):
+            ok, _ = views_flat._insert_participant(f"T{i}", "Tour", "", "", "", "HB-CME", "", "",
+                                                   views_flat.FEE_CENTS, advisor)
+            self.assertTrue(ok)
+
+        def by_name():
+            return {r[1]: r for r in views_flat._select_participants_for_advisor(advisor, 100)}
+
+        rows = by_name()
+        self.assertEqual(TourCapacity.objects.get(tour="HB-CME").reserved, self.capacity)
+        self.assertTrue(tours.is_waitlisted(rows[f"T{self.capacity}"][7]))
+
+        ok, _ = views_flat._delete_participant(rows["T0"][0], advisor)
+        self.assertTrue(ok)
+        rows = by_name()
+        self.assertNotIn("T0", rows)
+        self.assertEqual(tours.canonical(rows[f"T{self.capacity}"][7]), "HB-CME")
+        self.assertFalse(tours.is_waitlisted(rows[f"T{self.capacity}"][7]))  # oldest waitlisted promoted
+        self.assertTrue(tours.is_waitlisted(rows[f"T{self.capacity + 1}"][7]))
+        self.assertEqual(TourCapacity.objects.get(tour="HB-CME").reserved, self.capacity)
+
+
+class DigestTests(TransactionTestCase):
+    """Participant events coalesce into one digest per advisor; nothing is lost or sent twice."""
+
+    advisor = "digest@example.com"
+
+    def setUp(self):
+        views_flat._reset_schema_registry()
+        mail.outbox = []
+
+    def _record(self, *names, at=None):
+        digest.record_events(self.advisor, "added", [(n, "Lee") for n in names])
+        if at is not None:
+            ParticipantEvent.objects.filter(advisor_email=self.advisor).update(created_at=at)
+
+    @override_settings(DIGEST_QUIET_SECONDS=300, DIGEST_MAX_DELAY_SECONDS=3600)
+    def test_burst_is_one_digest_once_quiet(self):
+        self._record("Ann", "Bo", "Cy")
+        self.assertEqual(digest.flush_due(), {"digests": 0, "events": 0})  # still active
+        later = timezone.now() + datetime.timedelta(seconds=301)
+        self.assertEqual(digest.flush_due(later), {"digests": 1, "events": 3})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("3 change(s)", mail.outbox[0].subject)
+        self.assertFalse(ParticipantEvent.objects.exists())
+
+    @override_settings(DIGEST_QUIET_SECONDS=300, DIGEST_MAX_DELAY_SECONDS=3600)
+    def test_max_delay_sends_during_continuous_activity(self):
+        now = timezone.now()
+        self._record("Ann", at=now - datetime.timedelta(seconds=3601))
+        self._record("Bo")  # keeps the burst from going quiet
+        self.assertEqual(digest.due_advisors(now), [self.advisor])
+        self.assertEqual(digest.flush_due(now)["events"], 2)
+
+    def test_failed_send_requeues_the_events(self):
+        self._record("Ann", "Bo")
+        created = set(ParticipantEvent.objects.values_list("created_at", flat=True))
+        with mock.patch("registrations.digest.send_html", side_effect=OSError("smtp down")), \
+                self.assertLogs("registrations.digest", "ERROR"):
+            self.assertEqual(digest.flush_advisor(self.advisor), 0)
+        self.assertEqual(sorted(ParticipantEvent.objects.values_list("first_name", flat=True)), ["Ann", "Bo"])
+        self.assertEqual(set(ParticipantEvent.objects.values_list("created_at", flat=True)), created)
+        self.assertEqual(digest.flush_advisor(self.advisor), 2)
+
+    def test_overlapping_flushers_send_disjoint_events(self):
+        self._record("Ann", "Bo", "Cy")
+        sent = []
+
+        def send(to, subject, html, **kwargs):
+            sent.append(subject)
+            if len(sent) == 1:  # a second flusher runs while the first is still sending
+                self._record("Dee")
+                self.assertEqual(digest.flush_advisor(self.advisor), 1)
+
+        with mock.patch("registrations.digest.send_html", side_effect=send):
+            self.assertEqual(digest.flush_advisor(self.advisor), 3)
+        self.assertEqual(sorted(sent), ["FLC Registration update: 1 change(s)", "FLC Registration update: 3 change(s)"])
+        self.assertFalse(ParticipantEvent.objects.exists())
+
+    @_postgres_only
+    def test_concurrent_flushers_cover_every_event_once(self):
+        self._record(*(f"P{i}" for i in range(50)))
+        views_flat._ensure_flat_tables_if_missing()
+        barrier, counts = threading.Barrier(8), []
+
+        def run():
+            try:
+                barrier.wait()
+                counts.append(digest.flush_advisor(self.advisor))
+            finally:
+                connections.close_all()
+
+        pool = [threading.Thread(target=run) for _ in range(8)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        self.assertEqual(sum(counts), 50)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(ParticipantEvent.objects.exists())
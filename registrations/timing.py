@@ -0,0 +1,114 @@
+# registrations/timing.py
+"""
+Per-request phase timings. ServerTimingMiddleware opens an accumulator in a
+context variable; hooks in the hot helpers (`with phase("db"):`) add to it, and
+the totals go out as a Server-Timing header plus one log line per request.
+Outside a request (commands, shell) phase() is a no-op.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# {"phases": {name: [calls, seconds]}, "open": set of names being timed}
+_current: ContextVar[dict | None] = ContextVar("flc_request_timing", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time the block under `name`. Nested or overlapping (asyncio.gather) blocks
+    of the same name count once, so each phase reads as wall-clock time.
+    """
+    acc = _current.get()
+    if acc is None or name in acc["open"]:
+        yield
+        return
+    acc["open"].add(name)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        acc["open"].discard(name)
+        slot = acc["phases"].setdefault(name, [0, 0.0])
+        slot[0] += 1
+        slot[1] += time.perf_counter() - t0
+
+
+def timed(name: str):
+    """Decorator form of phase() for plain functions."""
+    def decorator(fn):
+        @wraps(fn)
+        def _wrapped(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return _wrapped
+    return decorator
+
+
+def header_value(phases: dict, total: float) -> str:
+    parts = [
+        f'{name};dur={secs * 1000:.1f};desc="{calls} call{"s" if calls != 1 else ""}"'
+        for name, (calls, secs) in phases.items()
+    ]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    Put it first in MIDDLEWARE so "total" covers every other middleware
+    (session save included). SERVER_TIMING_HEADER=False keeps the log line
+    but drops the response header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, token, t0):
+        total = time.perf_counter() - t0
+        phases = _current.get()["phases"]
+        _current.reset(token)
+        if getattr(settings, "SERVER_TIMING_HEADER", True):
+            response["Server-Timing"] = header_value(phases, total)
+        logger.info(
+            "timing method=%s path=%s status=%s total_ms=%.1f %s",
+            request.method, request.path, response.status_code, total * 1000,
+            " ".join(f"{name}_ms={secs * 1000:.1f} {name}_n={calls}" for name, (calls, secs) in phases.items()),
+        )
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _current.set({"phases": {}, "open": set()})
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            _current.reset(token)
+            raise
+        return self._finish(request, response, token, t0)
+
+    async def __acall__(self, request):
+        token = _current.set({"phases": {}, "open": set()})
+        t0 = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            _current.reset(token)
+            raise
+        return self._finish(request, response, token, t0)
@@ -0,0 +1,113 @@
+# registrations/tours.py
+"""
+Tour seat limits. A TourCapacity row per limited tour and event holds the
+counter; every query here filters on the current event. reserve_seat() takes
+a seat with one conditional UPDATE, which either succeeds or matches no row
+when the tour is full, with no count-then-insert race. Full tours put the participant on the waitlist (the stored tour value
+gets WAITLIST_PREFIX); a released seat goes to the oldest waitlisted entry.
+"""
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from . import audit, events
+from .forms import TOURS
+from .models import TourCapacity
+
+WAITLIST_PREFIX = "Waitlist: "
+
+# form labels and keys both map to the key, e.g. "Haley Barbour Center ..." -> "HB-CME"
+_CANONICAL = {**{label: key for key, label in TOURS}, **{key: key for key, _ in TOURS}}
+
+
+def _seats(key: str):
+    """The current event's TourCapacity row for tour `key` (as a queryset)."""
+    return TourCapacity.objects.filter(tour=key, event=events.current())
+
+
+def canonical(tour: str) -> str:
+    tour = (tour or "").strip()
+    if tour.startswith(WAITLIST_PREFIX):
+        tour = tour[len(WAITLIST_PREFIX):]
+    return _CANONICAL.get(tour, tour)
+
+
+def variants(tour: str) -> list[str]:
+    """Every stored spelling of the same tour (key and label)."""
+    key = canonical(tour)
+    return sorted({key, *(label for k, label in TOURS if k == key)} | {tour})
+
+
+def label(tour: str) -> str:
+    """The form label for a stored tour value (key or label, waitlisted or not)."""
+    key = canonical(tour)
+    return dict(TOURS).get(key, key)
+
+
+def is_waitlisted(tour: str) -> bool:
+    return (tour or "").startswith(WAITLIST_PREFIX)
+
+
+def reserve_seat(tour: str) -> bool:
+    """Take one seat; True if granted (or the tour has no limit)."""
+    key = canonical(tour)
+    if not key or key == "None":
+        return True
+    taken = _seats(key).filter(reserved__lt=F("capacity")).update(reserved=F("reserved") + 1)
+    if taken:
+        return True
+    return not _seats(key).exists()
+
+
+def reserve_seats(tour: str, n: int) -> int:
+    """Take up to `n` seats at once (bulk edits); returns how many were granted."""
+    key = canonical(tour)
+    if n < 1 or not key or key == "None":
+        return max(n, 0)
+    with transaction.atomic():
+        row = _seats(key).select_for_update().values_list("capacity", "reserved").first()
+        if row is None:
+            return n
+        granted = max(0, min(n, row[0] - row[1]))
+        if granted:
+            _seats(key).update(reserved=F("reserved") + granted)
+    return granted
+
+
+def release_seat(tour: str, n: int = 1) -> None:
+    if not tour or is_waitlisted(tour) or n < 1:
+        return
+    _seats(canonical(tour)).filter(reserved__gt=0).update(
+        reserved=Greatest(F("reserved") - n, Value(0))
+    )
+
+
+def assign_tour(tour: str) -> tuple[str, bool]:
+    """The tour value to store for a new participant, and whether they were waitlisted."""
+    tour = (tour or "").strip()
+    if not tour or is_waitlisted(tour) or reserve_seat(tour):
+        return tour, False
+    return WAITLIST_PREFIX + tour, True
+
+
+def seats_left(tour: str):
+    """Remaining seats, or None if unlimited."""
+    row = _seats(canonical(tour)).values("capacity", "reserved").first()
+    return None if row is None else row["capacity"] - row["reserved"]
+
+
+def save_registration(reg) -> bool:
+    """Save a new FLCRegistration with its tour seat taken (or waitlisted). Returns waitlisted."""
+    requested = reg.tour
+    reg.tour, waitlisted = assign_tour(requested)
+    try:
+        reg.save()
+    except Exception:
+        if not waitlisted:
+            release_seat(reg.tour)
+        raise
+    audit.record("insert", "registration", reg.pk, actor=reg.advisor.email, after={
+        f: getattr(reg, f) for f in ("first_name", "last_name", "student_organization", "college_company",
+                                     "tour", "tee_shirt_size", "food_allergy", "ada_needs")
+    })
+    return waitlisted
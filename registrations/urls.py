@@ -1,8 +1,22 @@
+from django.conf import settings
 from django.urls import path
 from . import views_flat as views
+from . import views_async
+
+# ASYNC_VIEWS=1 (the web-asgi profile) serves the registration form natively async
+form_view = views_async.form_view if getattr(settings, "ASYNC_VIEWS", False) else views.form_view
 
 urlpatterns = [
     path("sanity/", views.sanity_view, name="registrations_sanity"),
-    path("form/", views.form_view, name="registrations_form"),
+    path("form/", form_view, name="registrations_form"),
+    path("access/<uuid:token>/", views.access_link_view, name="registrations_access_link"),
+    path("access/s/<str:token>/", views.signed_access_link_view, name="registrations_signed_access_link"),
+    path("names-by-category/", views_async.get_names_by_category, name="registrations_names_by_category"),
+    path("validate/<str:token>/", views_async.validate_user, name="registrations_validate"),
+    path("resend-confirmation/", views_async.resend_confirmation, name="registrations_resend_confirmation"),
     path("manage-pending-users/", views.manage_pending_users_view, name="registrations_manage_pending_users"),
+    path("roster-sync/", views.roster_sync_view, name="registrations_roster_sync"),
+    path("reports/", views.reports_view, name="registrations_reports"),
+    path("reports.csv", views.reports_csv_view, name="registrations_reports_csv"),
+    path("duplicates/", views.duplicates_view, name="registrations_duplicates"),
 ]
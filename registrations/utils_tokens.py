@@ -1,4 +1,12 @@
+import secrets
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
 from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
+from django.db import IntegrityError, transaction
 
 _signer = TimestampSigner()
 
@@ -10,3 +18,97 @@ def read_validation_token(token: str, max_age_seconds: int):
     raw = _signer.unsign(token, max_age=max_age_seconds)
     user_id_str, email = raw.split(":", 1)
     return int(user_id_str), email
+
+
+# --- Stateless one-time access tokens ---------------------------------------
+# Everything needed to validate the link (email, user id, expiry, nonce) is in
+# the signed token, so checking it needs no DB row. One-time use is tracked by
+# nonce: consuming inserts a RevokedToken row (the authoritative check), and each
+# process keeps the unexpired nonces in memory, refreshed incrementally every
+# ACCESS_TOKEN_REVOCATION_SYNC_SECONDS, so replays are rejected without a query.
+
+_ACCESS_SALT = "registrations.access-token"
+
+
+class TokenRevoked(BadSignature):
+    """The token is genuine but has already been used."""
+
+
+def make_access_token(email: str, ttl_seconds: int, user_id: int | None = None) -> str:
+    claims = {"e": email, "x": int(time.time()) + int(ttl_seconds), "n": secrets.token_urlsafe(9)}
+    if user_id is not None:
+        claims["u"] = user_id
+    return signing.dumps(claims, salt=_ACCESS_SALT, compress=True)
+
+
+class _RevocationSet:
+    def __init__(self):
+        self._nonces: dict[str, float] = {}  # nonce -> token expiry (epoch seconds)
+        self._watermark = None                # newest RevokedToken.created_at seen
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, nonce: str, expires: float) -> None:
+        with self._lock:
+            self._nonces[nonce] = expires
+
+    def __contains__(self, nonce: str) -> bool:
+        self._maybe_sync()
+        return nonce in self._nonces
+
+    def _maybe_sync(self) -> None:
+        interval = getattr(settings, "ACCESS_TOKEN_REVOCATION_SYNC_SECONDS", 30)
+        now = time.time()
+        if now - self._synced_at < interval:
+            return
+        from .models import RevokedToken
+
+        with self._lock:
+            if now - self._synced_at < interval:
+                return
+            self._synced_at = now
+            qs = RevokedToken.objects.filter(expires_at__gt=datetime.fromtimestamp(now, dt_timezone.utc))
+            if self._watermark is not None:
+                qs = qs.filter(created_at__gte=self._watermark)
+            try:
+                for nonce, expires_at, created_at in qs.values_list("nonce", "expires_at", "created_at"):
+                    self._nonces[nonce] = expires_at.timestamp()
+                    if self._watermark is None or created_at > self._watermark:
+                        self._watermark = created_at
+            except Exception:
+                return  # keep serving from memory; consume() still enforces one-time use
+            self._nonces = {n: x for n, x in self._nonces.items() if x > now}
+
+
+revoked = _RevocationSet()
+
+
+def read_access_token(token: str) -> dict:
+    """
+    Returns {"email", "user_id", "expires", "nonce"} or raises SignatureExpired,
+    TokenRevoked or BadSignature. No DB access except the periodic revocation sync.
+    """
+    claims = signing.loads(token, salt=_ACCESS_SALT)
+    if claims["x"] < time.time():
+        raise SignatureExpired("Access token expired")
+    if claims["n"] in revoked:
+        raise TokenRevoked("Access token already used")
+    return {"email": claims["e"], "user_id": claims.get("u"), "expires": claims["x"], "nonce": claims["n"]}
+
+
+def consume_access_token(token: str) -> dict:
+    """Validate and mark the token used (one INSERT). Raises like read_access_token."""
+    from .models import RevokedToken
+
+    claims = read_access_token(token)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                nonce=claims["nonce"],
+                expires_at=datetime.fromtimestamp(claims["expires"], dt_timezone.utc),
+            )
+    except IntegrityError:
+        revoked.add(claims["nonce"], claims["expires"])
+        raise TokenRevoked("Access token already used")
+    revoked.add(claims["nonce"], claims["expires"])
+    return claims
@@ -8,6 +8,8 @@ from django.urls import reverse
 
 from .models import PendingUser, FLCRegistration
 from .constants import ACCESS_SESSION_KEY
+from .decorators import grant_access
+from .vocab import pending_user_categories
 
 
 def _safe_message(request: HttpRequest, level: int, text: str):
@@ -37,24 +39,13 @@ def user_access_view(request: HttpRequest):
 
     if email:
         if PendingUser.objects.filter(email__iexact=email).exists():
-            request.session[ACCESS_SESSION_KEY] = email
-            request.session.set_expiry(30 * 24 * 3600)  # 30 days
+            grant_access(request, email, 30 * 24 * 3600)  # 30 days
             _safe_message(request, messages.SUCCESS, "Access granted.")
             return redirect("registrations:manage_pending_users")
         else:
             _safe_message(request, messages.ERROR, "Email not recognized. Please request access.")
 
-    try:
-        categories = list(
-            PendingUser.objects
-            .exclude(category__isnull=True)
-            .exclude(category__exact="")
-            .values_list("category", flat=True)
-            .distinct()
-            .order_by("category")
-        ) or ["Student"]
-    except Exception:
-        categories = ["Student"]
+    categories = pending_user_categories()
 
     ctx = {
         "categories": categories,
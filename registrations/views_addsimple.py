@@ -51,10 +51,7 @@ def registration_form_view(request: HttpRequest, user_id: int | None = None) ->
                 try:
                     with transaction.atomic():
                         # upsert primary person
-                        obj, created = PendingUser.objects.get_or_create(email=email)
-                        for k, v in base_payload.items():
-                            setattr(obj, k, v)
-                        obj.save()
+                        obj, created = PendingUser.upsert(email, **base_payload)
                         just_added.append(email)
 
                         # additional participants
@@ -64,10 +61,7 @@ def registration_form_view(request: HttpRequest, user_id: int | None = None) ->
                             pieces = [p.strip() for p in re.split(r"[,\s]+", raw) if p.strip()]
                             for pemail in pieces:
                                 if pemail and "email" in _field_names(PendingUser):
-                                    extra, _ = PendingUser.objects.get_or_create(
-                                        email=pemail,
-                                        defaults=base_payload
-                                    )
+                                    extra, _ = PendingUser.upsert(pemail, overwrite=False, **base_payload)
                                     just_added.append(pemail)
 
                     if not errors:
@@ -0,0 +1,209 @@
+"""
+Native async versions of the registration hot paths, for running under ASGI
+(see the web-asgi entry in Procfile). Reads go through an async psycopg pool
+when ASYNC_DB_DRIVER="psycopg"; otherwise, and for writes, the existing sync
+helpers run via sync_to_async so behaviour stays identical to views_flat.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import urllib.parse
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signing import BadSignature, SignatureExpired
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.http import HttpResponseRedirect, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from . import audit, events
+from .constants import TOKEN_MAX_AGE_SECONDS
+from .decorators import agrant_access
+from .mailers import send_html
+from .models import PendingUser
+from .ratelimit import rate_limit
+from .timing import phase
+from .utils_tokens import make_validation_token, read_validation_token
+from .views_flat import (
+    ADVISOR_ROWS_SQL,
+    _edit_prefill, _form_post, _html_page, _link_expired_page, _merge_participant_rows, _render_form_page, _safe_get,
+    _try_select,
+)
+
+try:
+    import psycopg
+    from psycopg_pool import AsyncConnectionPool
+except Exception:  # optional: fall back to the sync driver in a thread
+    AsyncConnectionPool = None
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_loop = None
+_pool_lock = None  # asyncio.Lock, created on (and bound to) the pool's loop
+
+
+async def _get_pool():
+    """One pool per event loop (uvicorn runs one loop per worker)."""
+    global _pool, _pool_loop, _pool_lock
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop:
+        return _pool
+    if _pool_lock is None or _pool_loop is not loop:
+        # no await between the check and the assignment, so one lock per loop
+        _pool_lock, _pool_loop = asyncio.Lock(), loop
+        stale, _pool = _pool, None
+        if stale is not None:
+            try:
+                await stale.close()
+            except Exception:  # it belonged to a loop that is gone
+                pass
+    async with _pool_lock:
+        if _pool is None:
+            db = settings.DATABASES["default"]
+            conninfo = psycopg.conninfo.make_conninfo(
+                dbname=db.get("NAME"), user=db.get("USER"), password=db.get("PASSWORD"),
+                host=db.get("HOST") or None, port=db.get("PORT") or None,
+            )
+            pool = AsyncConnectionPool(
+                conninfo, min_size=1, max_size=getattr(settings, "ASYNC_DB_POOL_SIZE", 10),
+                kwargs={"autocommit": True}, open=False,
+            )
+            await pool.open()
+            _pool = pool
+    return _pool
+
+
+def _use_async_driver() -> bool:
+    return AsyncConnectionPool is not None and getattr(settings, "ASYNC_DB_DRIVER", "thread") == "psycopg"
+
+
+async def _aselect(sql, params=None):
+    """Async twin of views_flat._try_select: rows, or None on any error."""
+    if not _use_async_driver():
+        return await sync_to_async(_try_select)(sql, params)
+    try:
+        with phase("db"):
+            pool = await _get_pool()
+            async with pool.connection() as conn:
+                cur = await conn.execute(sql, params or [])
+                return await cur.fetchall()
+    except Exception:
+        return None
+
+
+async def _aselect_participants_for_advisor(advisor_email, limit=200):
+    if not (advisor_email and "@" in advisor_email):
+        return []
+    real_sql, fb_sql = ADVISOR_ROWS_SQL
+    params = [events.current(), advisor_email, limit]
+    # both tables at once: two pooled connections instead of two round trips in series
+    real, fb = await asyncio.gather(_aselect(real_sql, params), _aselect(fb_sql, params))
+    return _merge_participant_rows(real, fb)
+
+
+@csrf_exempt
+@rate_limit("30/m", key="ip")
+@rate_limit("20/m", key="advisor")
+async def form_view(request):
+    """Async views_flat.form_view: same POST actions, same page."""
+    advisor_email_url = _safe_get(request.GET, "email", "").strip().lower()
+
+    status_block = ""
+    summary_html = ""
+    advisor_for_list = advisor_email_url
+    queued = []
+    edit = None
+    idem_key = ""
+
+    if request.method == "POST":
+        status_block, summary_html, advisor_for_list, queued, edit, idem_key = await sync_to_async(_form_post)(
+            request, advisor_email_url)
+
+    elif _safe_get(request.GET, "edit").strip():
+        edit, status_block = await sync_to_async(_edit_prefill)(_safe_get(request.GET, "edit").strip(), advisor_email_url)
+
+    rows = await _aselect_participants_for_advisor(advisor_for_list, limit=50) if advisor_for_list else []
+    return _render_form_page(advisor_for_list, rows, status_block, summary_html, queued, edit, idem_key)
+
+
+async def get_names_by_category(request):
+    category = (request.GET.get("category") or "").strip()
+    if not category:
+        return JsonResponse({"names": []})
+    users = (
+        PendingUser.objects.filter(category=category, is_active=True)
+        .order_by("first_name", "last_name")
+        .values("id", "first_name", "last_name", "email")
+    )
+    names = [
+        {"id": u["id"], "full_name": f'{u["first_name"]} {u["last_name"]}', "email": u["email"] or ""}
+        async for u in users
+    ]
+    return JsonResponse({"names": names})
+
+
+async def validate_user(request, token: str):
+    """Async views_full.validate_user: no SELECT, one UPDATE; access only if it matched a row."""
+    try:
+        user_id, email = read_validation_token(token, TOKEN_MAX_AGE_SECONDS)
+    except (SignatureExpired, BadSignature):
+        return _link_expired_page()
+
+    if not await PendingUser.objects.filter(id=user_id, email=email).aupdate(
+        is_validated=True, validated_at=Coalesce(F("validated_at"), timezone.now())
+    ):
+        return _link_expired_page()
+    audit.record("validate", "pendinguser", user_id, actor=email, after={"is_validated": True})
+    await agrant_access(request, email.strip().lower(), 12 * 3600)
+    return HttpResponseRedirect(
+        reverse("registrations:registrations_form") + "?" + urllib.parse.urlencode({"email": email.lower()})
+    )
+
+
+def _validation_email_html(link: str, first_name: str) -> str:
+    return f"""
+    <p>Hello {escape(first_name)},</p>
+    <p>Please confirm your email to access FLC Registration:</p>
+    <p>
+      <a href="{link}" style="display:inline-block;padding:10px 14px;background:#0d6efd;color:#fff;border-radius:6px;text-decoration:none;">
+        Confirm Email
+      </a>
+    </p>
+    <p>This link expires in 30 days.</p>
+    """
+
+
+@require_POST
+@rate_limit("5/m", key="ip")
+@rate_limit("1/m", key="email")
+async def resend_confirmation(request):
+    email = (request.POST.get("email") or "").strip()
+    user = await PendingUser.objects.filter(email=email).only("id", "email", "first_name").afirst() if email else None
+    if user:
+        link = request.build_absolute_uri(
+            reverse("registrations:registrations_validate", args=[make_validation_token(user.id, user.email)])
+        )
+        # SMTP runs in a worker thread; the event loop keeps serving other requests meanwhile.
+        # A failure gets the same page as success, so the response never says whether
+        # the email is registered.
+        try:
+            await sync_to_async(send_html, thread_sensitive=False)(
+                user.email, "Confirm your email for FLC Registration",
+                _validation_email_html(link, user.first_name),
+            )
+        except Exception:
+            logger.exception("Could not resend confirmation to pending user %s", user.id)
+    body = """
+      <h1 id="pageTitle">Confirmation Sent</h1>
+      <div class="card success" role="status" aria-live="polite">
+        <p>If that email is registered, a confirmation has been sent.</p>
+      </div>
+    """
+    return _html_page("Confirmation Sent", body)
@@ -40,21 +40,9 @@ def manage_pending_users(request):
         org   = request.POST.get("college_company", "") or ""
         if email:
             try:
-                obj, created = PendingUser.objects.get_or_create(
-                    email=email,
-                    defaults={"first_name": first, "last_name": last, "category": cat, "college_company": org},
+                obj, created = PendingUser.upsert(
+                    email, first_name=first, last_name=last, category=cat, college_company=org,
                 )
-                # best-effort update of optional fields
-                for k, v in (("first_name", first), ("last_name", last), ("category", cat), ("college_company", org)):
-                    try:
-                        if hasattr(obj, k) and v and getattr(obj, k, "") != v:
-                            setattr(obj, k, v)
-                    except Exception:
-                        pass
-                try:
-                    obj.save()
-                except Exception:
-                    pass
                 msg = f"{'Added' if created else 'Updated'}: {escape(email)}"
             except Exception as e:
                 msg = "DB error while saving"
@@ -115,21 +103,8 @@ def registration_form_basic(request):
             if not email:
                 return
             try:
-                obj, created = PendingUser.objects.get_or_create(
-                    email=email,
-                    defaults={"first_name": first, "last_name": last, "category": cat, "college_company": org},
-                )
-                for k, v in (("first_name", first), ("last_name", last), ("category", cat), ("college_company", org)):
-                    try:
-                        if hasattr(obj, k) and v and getattr(obj, k, "") != v:
-                            setattr(obj, k, v)
-                    except Exception:
-                        pass
-                try:
-                    obj.save()
-                    saved += 1
-                except Exception:
-                    pass
+                PendingUser.upsert(email, first_name=first, last_name=last, category=cat, college_company=org)
+                saved += 1
             except Exception:
                 pass
 
@@ -1,17 +1,87 @@
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseRedirect
 import urllib.parse
 from django.views.decorators.csrf import csrf_exempt
+from django.contrib.admin.views.decorators import staff_member_required
+from django.middleware.csrf import get_token
 from django.utils.html import escape
 from django.conf import settings
-from django.db import connection
+from django.db import connection, transaction
 
-import datetime, html, io, csv, urllib.parse
+from django.urls import reverse
+from django.utils import timezone
+
+from . import audit, dedupe, digest, events, idempotency, reports, timing, tours
+from .decorators import grant_access
+from .models import AccessLink
+from .utils_tokens import BadSignature, consume_access_token, read_access_token
+from .ratelimit import rate_limit
+from .roster_sync import sync_roster
+
+import datetime, html, io, csv, json, urllib.parse
+from collections import Counter
 
 # No default advisor: show nothing unless provided
 SAFE_DEFAULT_ADVISOR = ""  # require explicit advisor
 FEE_USD = 45
 FEE_CENTS = FEE_USD * 100
 
+# The participant form's select options as (stored value, label), like forms.py;
+# the add/edit form and the bulk form both render them (_options_html).
+PARTICIPANT_CHOICES = {
+    "student_organization": ("Student Organization", [
+        ("DECA", "DECA"),
+        ("FBLA", "FBLA"),
+        ("SkillsUSA", "SkillsUSA"),
+        ("HOSA", "HOSA"),
+        ("Mississippi Postsecondary Student Organization", "Mississippi Postsecondary Student Organization"),
+    ]),
+    "tee_shirt_size": ("T-Shirt Size", [
+        ("XSmall", "XSmall"),
+        ("Small", "Small"),
+        ("Medium", "Medium"),
+        ("Large", "Large"),
+        ("XLarge", "XLarge"),
+        ("2XLarge", "2XLarge"),
+        ("3XLarge", "3XLarge"),
+        ("4XLarge", "4XLarge"),
+    ]),
+    "college_company": ("College/Chapter", [
+        ("Coahoma Community College", "Coahoma Community College"),
+        ("Copiah-Lincoln Community College", "Copiah-Lincoln Community College"),
+        ("Delta State University", "Delta State University"),
+        ("East Central Community College", "East Central Community College"),
+        ("East Mississippi Community College - Mayhew", "East Mississippi Community College - Mayhew"),
+        ("East Mississippi Community College - Scooba", "East Mississippi Community College - Scooba"),
+        ("Hinds Community College - Raymond", "Hinds Community College - Raymond"),
+        ("Hinds Community College - Utica", "Hinds Community College - Utica"),
+        ("Holmes Community College", "Holmes Community College"),
+        ("Jones College", "Jones College"),
+        ("Mississippi Delta Community College", "Mississippi Delta Community College"),
+        ("Mississippi Gulf Coast Community College - Harrison", "Mississippi Gulf Coast Community College - Harrison"),
+        ("Mississippi State University College of Business", "Mississippi State University College of Business"),
+        ("Mississippi University for Women", "Mississippi University for Women"),
+        ("Northeast Mississippi Community College", "Northeast Mississippi Community College"),
+        ("Southwest Mississippi Community College", "Southwest Mississippi Community College"),
+        ("Tougaloo College", "Tougaloo College"),
+        ("University of Mississippi - Desoto", "University of Mississippi - Desoto"),
+        ("Mississippi Community College Board", "Mississippi Community College Board"),
+        ("Other", "Other"),
+    ]),
+    "tour": ("Tour", [
+        ("Haley Barbour Center for Manufacturing Excellence", "Haley Barbour Center for Manufacturing Excellence"),
+        ("The Jim and Thomas Duff Center for Science and Technology Innovation", "The Jim and Thomas Duff Center for Science and Technology Innovation"),
+        ("No Tour", "No Tour"),
+    ]),
+}
+
+
+def _options_html(column, current=""):
+    return "".join(
+        f'<option value="{escape(value)}"{" selected" if (current or "") == value else ""}>{escape(label)}</option>'
+        for value, label in PARTICIPANT_CHOICES[column][1]
+    )
+
+@timing.timed("html")
 def _html_page(title: str, body: str) -> HttpResponse:
     return HttpResponse(f"""<!doctype html>
 <html lang="en">
@@ -72,7 +142,7 @@ def _safe_get(d, k, default=""):
 
 def _try_select(sql, params=None):
     try:
-        with connection.cursor() as cur:
+        with timing.phase("db"), connection.cursor() as cur:
             cur.execute(sql, params or [])
             return cur.fetchall()
     except Exception:
@@ -80,16 +150,63 @@ def _try_select(sql, params=None):
 
 def _try_exec(sql, params=None):
     try:
-        with connection.cursor() as cur:
+        with timing.phase("db"), connection.cursor() as cur:
             cur.execute(sql, params or [])
         return True, ""
     except Exception as e:
         return False, f"{type(e).__name__}: {e}"
 
+def _try_insert_id(sql, params=None):
+    """_try_exec for an INSERT ... RETURNING id: (new id or None, msg); no row (ON CONFLICT DO NOTHING) is (None, "")."""
+    try:
+        with timing.phase("db"), connection.cursor() as cur:
+            cur.execute(sql, params or [])
+            row = cur.fetchone()
+            return (row[0] if row else None), ""
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _try_exec_rowcount(sql, params=None):
+    """_try_exec for conditional writes: (rows affected, msg); None rows on error."""
+    try:
+        with timing.phase("db"), connection.cursor() as cur:
+            cur.execute(sql, params or [])
+            return cur.rowcount, ""
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+# Schema registry: the probe/DDL pass below costs a dozen-odd queries, and the
+# answer doesn't change while a process runs, so it is done once per process
+# (at worker boot by warmup.warm_worker, or lazily on first use).
+_SCHEMA = {}
+
 def _ensure_flat_tables_if_missing():
     """
     Prefer real app tables if present; always ensure fallback tables/columns exist.
+    Returns (pending_ok, participant_ok), cached per process once the DB answered.
     """
+    if "tables" not in _SCHEMA:
+        with timing.phase("schema"):
+            result = _probe_flat_tables()
+        if _try_select("SELECT 1") is not None:  # don't cache answers from an unreachable DB
+            _SCHEMA["tables"] = result
+        return result
+    return _SCHEMA["tables"]
+
+def _reset_schema_registry():
+    _SCHEMA.clear()
+
+def _has_version(table):
+    """Whether `table` carries the optimistic-locking version column (see the probe)."""
+    _ensure_flat_tables_if_missing()
+    return table in _SCHEMA.get("versioned", ())
+
+def _has_match_key(table):
+    """Whether `table` carries dedupe.match_key (see the probe)."""
+    _ensure_flat_tables_if_missing()
+    return table in _SCHEMA.get("matchable", ())
+
+def _probe_flat_tables():
     pending_ok = _try_select("SELECT 1 FROM registrations_pendinguser LIMIT 1") is not None
     participant_ok = _try_select("SELECT 1 FROM registrations_participant LIMIT 1") is not None
 
@@ -117,14 +234,16 @@ def _ensure_flat_tables_if_missing():
         );
     """)
 
-    # Ensure newer columns exist (idempotent)
+    # Ensure newer columns exist (idempotent); True if the column is there afterwards
     def _ensure_col(table, col, ddl):
         got = _try_select(
             "SELECT 1 FROM information_schema.columns WHERE table_name=%s AND column_name=%s LIMIT 1;",
             [table, col],
         )
-        if not got:
-            _try_exec(ddl)
+        if got or _try_exec(ddl)[0]:
+            return True
+        # no information_schema (or a race with another worker's ALTER): ask the table itself
+        return _try_select(f"SELECT {col} FROM {table} LIMIT 1;") is not None
 
     _ensure_col("registrations_participant_fallback", "dietary_restrictions",
                 "ALTER TABLE registrations_participant_fallback ADD COLUMN dietary_restrictions TEXT;")
@@ -135,6 +254,28 @@ def _ensure_flat_tables_if_missing():
     _ensure_col("registrations_participant_fallback", "advisor_email",
                 "ALTER TABLE registrations_participant_fallback ADD COLUMN advisor_email TEXT;")
 
+    # Event scoping (events.py): every participant query filters on event, so a real
+    # table that can't take the column is left alone and the fallback is used instead.
+    # The DEFAULT only tags rows that predate the column; the app always writes it.
+    event_col = "ALTER TABLE {} ADD COLUMN event TEXT NOT NULL DEFAULT '%s';" % events.current()
+    _ensure_col("registrations_participant_fallback", "event", event_col.format("registrations_participant_fallback"))
+    participant_ok = participant_ok and _ensure_col("registrations_participant", "event",
+                                                    event_col.format("registrations_participant"))
+
+    # Row version for optimistic concurrency on edits; the real table may not be ours to alter
+    tables = ["registrations_participant_fallback"] + (["registrations_participant"] if participant_ok else [])
+    _SCHEMA["versioned"] = {
+        t for t in tables
+        if _ensure_col(t, "version", f"ALTER TABLE {t} ADD COLUMN version INTEGER NOT NULL DEFAULT 1;")
+    }
+
+    # Normalized name key for duplicate warnings (dedupe.py), indexed for the one probe per save
+    _SCHEMA["matchable"] = set()
+    for t in tables:
+        if _ensure_col(t, "match_key", f"ALTER TABLE {t} ADD COLUMN match_key TEXT;"):
+            _try_exec(f"CREATE INDEX IF NOT EXISTS {t}_match_key_idx ON {t} (match_key);")
+            _SCHEMA["matchable"].add(t)
+
     return pending_ok, participant_ok
 
 # ---------- Edit/Delete helpers ----------
@@ -300,42 +441,97 @@ def _fetch_participant_by_rowkey(rowkey):
     src, pid = _parse_rowkey(rowkey)
     if not pid:
         return None
+    table = "registrations_participant" if src == "p" else "registrations_participant_fallback"
+    version = "version" if _has_version(table) else "NULL"
     if src == "p":
-        row = _try_select("""SELECT id, first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email
-                             FROM registrations_participant WHERE id=%s LIMIT 1;""", [pid])
+        row = _try_select(f"""SELECT id, first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email,
+                                     {version}
+                             FROM registrations_participant WHERE id=%s AND event=%s LIMIT 1;""", [pid, events.current()])
     else:
-        row = _try_select("""SELECT id, first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email,
-                                    dietary_restrictions, ada
-                             FROM registrations_participant_fallback WHERE id=%s LIMIT 1;""", [pid])
+        row = _try_select(f"""SELECT id, first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email,
+                                     {version}, dietary_restrictions, ada
+                             FROM registrations_participant_fallback WHERE id=%s AND event=%s LIMIT 1;""", [pid, events.current()])
     if not row:
         return None
     if src == "p":
-        (rid, f, l, org, sz, col, tr, fee, adv) = row[0]
-        return {"src":"p","id":rid,"first":f,"last":l,"org":org,"size":sz,"college":col,"tour":tr,"fee":fee,"advisor":(adv or "")}
+        (rid, f, l, org, sz, col, tr, fee, adv, ver) = row[0]
+        return {"src":"p","id":rid,"first":f,"last":l,"org":org,"size":sz,"college":col,"tour":tr,"fee":fee,"advisor":(adv or ""),"version":ver}
     else:
-        (rid, f, l, org, sz, col, tr, fee, adv, diet, ada) = row[0]
-        return {"src":"f","id":rid,"first":f,"last":l,"org":org,"size":sz,"college":col,"tour":tr,"fee":fee,"advisor":(adv or ""),"dietary":(diet or ""),"ada":(ada or "")}
+        (rid, f, l, org, sz, col, tr, fee, adv, ver, diet, ada) = row[0]
+        return {"src":"f","id":rid,"first":f,"last":l,"org":org,"size":sz,"college":col,"tour":tr,"fee":fee,"advisor":(adv or ""),"version":ver,"dietary":(diet or ""),"ada":(ada or "")}
+
+EDIT_CONFLICT = "Changed by someone else since you opened it"
 
-def _update_participant(rowkey, guard_advisor, first, last, org, size, college, tour, dietary, ada, advisor_new):
-    # Only allow if the row's advisor matches the current advisor (typed or URL)
+AUDIT_KEYS = ("first", "last", "org", "size", "college", "tour", "dietary", "ada", "advisor", "fee", "version")
+
+def _audit_image(data):
+    """The audited view of a participant (a _fetch_participant_by_rowkey-style dict)."""
+    return {k: data[k] for k in AUDIT_KEYS if data.get(k) is not None}
+
+def _update_participant(rowkey, guard_advisor, first, last, org, size, college, tour, dietary, ada, advisor_new,
+                        expected_version=None):
+    """
+    Only allowed if the row's advisor matches the current advisor (typed or URL).
+    With expected_version (the version the edit form was opened at) the UPDATE
+    is conditional on it, so a concurrent edit yields (False, EDIT_CONFLICT)
+    instead of being overwritten; every update bumps the version.
+    """
     data = _fetch_participant_by_rowkey(rowkey)
     if not data:
         return False, "Row not found"
     if not (guard_advisor and guard_advisor == (data.get("advisor") or "")):
         return False, "Advisor mismatch"
+    table = "registrations_participant" if data["src"] == "p" else "registrations_participant_fallback"
+    versioned = _has_version(table)
+    checked = versioned and expected_version is not None
+    if checked and data["version"] != expected_version:
+        return False, EDIT_CONFLICT
+    old_tour = data["tour"] or ""
+    moved = tours.canonical(tour) != tours.canonical(old_tour)
+    if moved:
+        tour, waitlisted = tours.assign_tour(tour)
+    else:
+        tour = old_tour  # same tour: keep the seat (or waitlist place) already held
+    bump = ",version=version+1" if versioned else ""
+    guard = " AND version=%s" if checked else ""
+    mk = [dedupe.match_key(first, last, college)] if _has_match_key(table) else []
+    rekey = ",match_key=%s" if mk else ""
     if data["src"] == "p":
         # primary table doesn't have dietary/ada in this app
-        return _try_exec("""UPDATE registrations_participant
+        n, msg = _try_exec_rowcount(f"""UPDATE registrations_participant
                             SET first_name=%s,last_name=%s,student_organization=%s,tee_shirt_size=%s,
-                                college_company=%s,tour=%s,advisor_email=%s
-                            WHERE id=%s AND advisor_email=%s;""",
-                         [first,last,org,size,college,tour,advisor_new,data["id"],guard_advisor])
+                                college_company=%s,tour=%s,advisor_email=%s{rekey}{bump}
+                            WHERE id=%s AND event=%s AND advisor_email=%s{guard};""",
+                         [first,last,org,size,college,tour,advisor_new,*mk,data["id"],events.current(),guard_advisor]
+                         + ([expected_version] if checked else []))
     else:
-        return _try_exec("""UPDATE registrations_participant_fallback
+        n, msg = _try_exec_rowcount(f"""UPDATE registrations_participant_fallback
                             SET first_name=%s,last_name=%s,student_organization=%s,tee_shirt_size=%s,
-                                college_company=%s,tour=%s,dietary_restrictions=%s,ada=%s,advisor_email=%s
-                            WHERE id=%s AND advisor_email=%s;""",
-                         [first,last,org,size,college,tour,dietary,ada,advisor_new,data["id"],guard_advisor])
+                                college_company=%s,tour=%s,dietary_restrictions=%s,ada=%s,advisor_email=%s{rekey}{bump}
+                            WHERE id=%s AND event=%s AND advisor_email=%s{guard};""",
+                         [first,last,org,size,college,tour,dietary,ada,advisor_new,*mk,data["id"],events.current(),guard_advisor]
+                         + ([expected_version] if checked else []))
+    ok = bool(n)
+    if n == 0:  # the row moved on between the fetch and the UPDATE
+        msg = EDIT_CONFLICT
+    if ok:
+        after = {**data, "first": first, "last": last, "org": org, "size": size, "college": college,
+                 "tour": tour, "advisor": advisor_new}
+        if data["src"] == "f":
+            after.update(dietary=dietary, ada=ada)
+        if versioned:
+            after["version"] = (data["version"] or 0) + 1
+        audit.record("update", "participant", rowkey, actor=guard_advisor,
+                     before=_audit_image(data), after=_audit_image(after))
+    if moved and ok:
+        _free_seats(old_tour)
+    elif moved and not waitlisted:
+        tours.release_seat(tour)
+    if ok:
+        reports.bump_version()
+        if moved and waitlisted:
+            msg = f"{tour[len(tours.WAITLIST_PREFIX):]} is full; added to the waitlist."
+    return ok, msg
 
 def _delete_participant(rowkey, guard_advisor):
     data = _fetch_participant_by_rowkey(rowkey)
@@ -344,40 +540,219 @@ def _delete_participant(rowkey, guard_advisor):
     if not (guard_advisor and guard_advisor == (data.get("advisor") or "")):
         return False, "Advisor mismatch"
     if data["src"] == "p":
-        return _try_exec("DELETE FROM registrations_participant WHERE id=%s AND advisor_email=%s;", [data["id"], guard_advisor])
+        ok, msg = _try_exec("DELETE FROM registrations_participant WHERE id=%s AND event=%s AND advisor_email=%s;",
+                            [data["id"], events.current(), guard_advisor])
     else:
-        return _try_exec("DELETE FROM registrations_participant_fallback WHERE id=%s AND advisor_email=%s;", [data["id"], guard_advisor])
+        ok, msg = _try_exec("DELETE FROM registrations_participant_fallback WHERE id=%s AND event=%s AND advisor_email=%s;",
+                            [data["id"], events.current(), guard_advisor])
+    if ok:
+        audit.record("delete", "participant", rowkey, actor=guard_advisor, before=_audit_image(data))
+        digest.record_event(guard_advisor, "deleted", data["first"], data["last"])
+        _free_seats(data["tour"])
+        reports.bump_version()
+    return ok, msg
+
+def _free_seats(tour, n=1):
+    """`n` participants left `tour`: give the seats back and hand them to the oldest waitlisted entries."""
+    if tours.canonical(tour) in ("", "None") or tours.is_waitlisted(tour) or n < 1:
+        return
+    tours.release_seat(tour, n)
+    waiting = [tours.WAITLIST_PREFIX + v for v in tours.variants(tour)]
+    marks = ",".join(["%s"] * len(waiting))
+    event = events.current()
+    candidates = []
+    for src, table in (("p", "registrations_participant"), ("f", "registrations_participant_fallback")):
+        for created, pid in _try_select(f"SELECT created_at, id FROM {table} WHERE event=%s AND tour IN ({marks}) "
+                                        "ORDER BY created_at, id LIMIT %s;", [event, *waiting, n]) or []:
+            candidates.append((created, src, table, pid))
+    candidates.sort(key=lambda c: (c[0] is None, str(c[0] or ""), c[1], c[3]))
+    granted = tours.reserve_seats(tour, len(candidates[:n]))  # others may have taken some seats first
+    chosen = candidates[:granted]
+    promoted = 0
+    for table in {c[2] for c in chosen}:
+        ids = [c[3] for c in chosen if c[2] == table]
+        # conditional on the waitlist value, so two promoters can't both move the same row
+        moved = _try_select(
+            f"UPDATE {table} SET tour=SUBSTR(tour, %s) "
+            f"WHERE event=%s AND id IN ({','.join(['%s'] * len(ids))}) AND tour IN ({marks}) RETURNING id, tour;",
+            [len(tours.WAITLIST_PREFIX) + 1, event, *ids, *waiting]) or []
+        src = "f" if table.endswith("_fallback") else "p"
+        for pid, new_tour in moved:
+            audit.record("promote", "participant", _rowkey(src, pid),
+                         before={"tour": tours.WAITLIST_PREFIX + new_tour}, after={"tour": new_tour})
+        promoted += len(moved)
+    if promoted < granted:
+        tours.release_seat(tour, granted - promoted)
+
+# ---------- Bulk edit/delete ----------
+
+_TABLES = {"p": "registrations_participant", "f": "registrations_participant_fallback"}
+
+# columns the bulk form can set (bulk_<column> selects; blank = no change)
+BULK_COLUMNS = ("student_organization", "tee_shirt_size", "tour")
+
+def _ids_by_table(rowkeys):
+    by_table = {}
+    for rk in rowkeys:
+        src, pid = _parse_rowkey(rk)
+        if pid:
+            by_table.setdefault(_TABLES[src], []).append(pid)
+    return by_table
+
+# participant column -> _fetch_participant_by_rowkey / audit key
+_COLUMN_KEYS = {"student_organization": "org", "tee_shirt_size": "size", "college_company": "college", "tour": "tour"}
+
+def _bulk_update_participants(rowkeys, guard_advisor, changes):
+    """
+    Apply `changes` ({column: value}) to the advisor's selected rows in one
+    transaction. Per table: one SELECT ... FOR UPDATE (the audit's before
+    images and current tours), then one set-based UPDATE; a tour change takes
+    the seats in one step and writes per-row tours via UPDATE ... FROM
+    (VALUES ...), since some rows may land on the waitlist.
+    Returns (ok, msg, updated, waitlisted).
+    """
+    by_table = _ids_by_table(rowkeys)
+    new_tour = changes.get("tour")
+    plain = [(col, value) for col, value in changes.items() if col != "tour"]
+    updated = waitlisted = 0
+    freed = Counter()
+    before = {}  # (table, id) -> audit image
+    event = events.current()
+    try:
+        with transaction.atomic(), timing.phase("db"), connection.cursor() as cur:
+            lock = " FOR UPDATE" if connection.features.has_select_for_update else ""
+            for table, ids in by_table.items():
+                extra = ", dietary_restrictions, ada" if table.endswith("_fallback") else ", NULL, NULL"
+                version = "version" if _has_version(table) else "NULL"
+                cur.execute(f"SELECT id, first_name, last_name, student_organization, tee_shirt_size, college_company, "
+                            f"tour, fee_cents, {version}{extra} FROM {table} WHERE event=%s AND advisor_email=%s "
+                            f"AND id IN ({','.join(['%s'] * len(ids))}){lock};", [event, guard_advisor, *ids])
+                for pid, f, l, org, sz, col, tr, fee, ver, diet, ada in cur.fetchall():
+                    before[(table, pid)] = _audit_image({
+                        "first": f, "last": l, "org": org, "size": sz, "college": col, "tour": tr,
+                        "dietary": diet, "ada": ada, "advisor": guard_advisor, "fee": fee, "version": ver,
+                    })
+            tour_for = {key: image.get("tour") for key, image in before.items()}
+            if new_tour is not None:
+                moving = [key for key, old in tour_for.items() if tours.canonical(old) != tours.canonical(new_tour)]
+                granted = tours.reserve_seats(new_tour, len(moving))
+                for i, key in enumerate(moving):
+                    old = tour_for[key]
+                    tour_for[key] = new_tour if i < granted else tours.WAITLIST_PREFIX + new_tour
+                    if old and not tours.is_waitlisted(old):
+                        freed[tours.canonical(old)] += 1
+                waitlisted = len(moving) - granted
+
+            for table in by_table:
+                found = [pid for (t, pid) in before if t == table]
+                if not found:
+                    continue
+                sets = [f"{col}=%s" for col, _ in plain] + (["version=version+1"] if _has_version(table) else [])
+                params = [value for _, value in plain]
+                if new_tour is None:
+                    cur.execute(f"UPDATE {table} SET {', '.join(sets)} WHERE event=%s AND advisor_email=%s "
+                                f"AND id IN ({','.join(['%s'] * len(found))});", params + [event, guard_advisor, *found])
+                    updated += cur.rowcount
+                elif connection.vendor == "postgresql":
+                    rows = [(pid, tour_for[(table, pid)]) for pid in found]
+                    cur.execute(f"UPDATE {table} AS t SET {', '.join(sets + ['tour=v.tour'])} "
+                                f"FROM (VALUES {','.join(['(%s,%s)'] * len(rows))}) AS v(id, tour) "
+                                "WHERE t.id=v.id AND t.event=%s AND t.advisor_email=%s;",
+                                params + [x for row in rows for x in row] + [event, guard_advisor])
+                    updated += cur.rowcount
+                else:
+                    for pid in found:
+                        cur.execute(f"UPDATE {table} SET {', '.join(sets + ['tour=%s'])} "
+                                    "WHERE id=%s AND event=%s AND advisor_email=%s;",
+                                    params + [tour_for[(table, pid)], pid, event, guard_advisor])
+                        updated += cur.rowcount
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}", 0, 0
+    src_of = {table: src for src, table in _TABLES.items()}
+    for (table, pid), image in before.items():
+        after = {**image, **{_COLUMN_KEYS[col]: value for col, value in plain}, "tour": tour_for[(table, pid)]}
+        if "version" in image:
+            after["version"] = image["version"] + 1
+        audit.record("update", "participant", _rowkey(src_of[table], pid), actor=guard_advisor,
+                     before=image, after=_audit_image(after))
+    for tour, n in freed.items():
+        _free_seats(tour, n)
+    if updated:
+        reports.bump_version()
+    return True, "", updated, waitlisted
+
+def _bulk_delete_participants(rowkeys, guard_advisor):
+    """Delete the advisor's selected rows: one DELETE ... RETURNING per table, one transaction. -> (ok, msg, deleted)."""
+    removed = []
+    try:
+        with transaction.atomic(), timing.phase("db"), connection.cursor() as cur:
+            for table, ids in _ids_by_table(rowkeys).items():
+                extra = ", dietary_restrictions, ada" if table.endswith("_fallback") else ", NULL, NULL"
+                cur.execute(f"DELETE FROM {table} WHERE event=%s AND advisor_email=%s "
+                            f"AND id IN ({','.join(['%s'] * len(ids))}) RETURNING id, first_name, last_name, "
+                            f"student_organization, tee_shirt_size, college_company, tour, fee_cents{extra};",
+                            [events.current(), guard_advisor, *ids])
+                src = "f" if table.endswith("_fallback") else "p"
+                for pid, f, l, org, sz, col, tr, fee, diet, ada in cur.fetchall():
+                    removed.append((_rowkey(src, pid), {
+                        "first": f, "last": l, "org": org, "size": sz, "college": col, "tour": tr,
+                        "dietary": diet, "ada": ada, "advisor": guard_advisor, "fee": fee,
+                    }))
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}", 0
+    for rowkey, data in removed:
+        audit.record("delete", "participant", rowkey, actor=guard_advisor, before=_audit_image(data))
+    if removed:
+        digest.record_events(guard_advisor, "deleted", [(d["first"], d["last"]) for _, d in removed])
+        seats = Counter(tours.canonical(d["tour"]) for _, d in removed
+                        if d["tour"] and not tours.is_waitlisted(d["tour"]))
+        for tour, n in seats.items():
+            _free_seats(tour, n)
+        reports.bump_version()
+    return True, "", len(removed)
 
 # ---------- Query/build helpers ----------
 
-def _select_participants_for_advisor(advisor_email, limit=200):
-    if not (advisor_email and "@" in advisor_email):
-        return []
-    real = _try_select("""SELECT 'p' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
+# (real table, fallback table) queries, params (event, [advisor,] limit); views_async runs the
+# same SQL on its async driver
+ADVISOR_ROWS_SQL = (
+    """SELECT 'p' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
         FROM registrations_participant
-        WHERE advisor_email=%s
-        ORDER BY created_at DESC NULLS LAST, id DESC LIMIT %s;""", [advisor_email, limit]) or []
-    fb = _try_select("""SELECT 'f' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
+        WHERE event=%s AND advisor_email=%s
+        ORDER BY created_at DESC NULLS LAST, id DESC LIMIT %s;""",
+    """SELECT 'f' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
         FROM registrations_participant_fallback
-        WHERE advisor_email=%s
-        ORDER BY created_at DESC, id DESC LIMIT %s;""", [advisor_email, limit]) or []
-    rows = real + fb
+        WHERE event=%s AND advisor_email=%s
+        ORDER BY created_at DESC, id DESC LIMIT %s;""",
+)
+ALL_ROWS_SQL = (
+    """SELECT 'p' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
+                          FROM registrations_participant WHERE event=%s
+                          ORDER BY created_at DESC NULLS LAST, id DESC LIMIT %s;""",
+    """SELECT 'f' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
+                          FROM registrations_participant_fallback WHERE event=%s
+                          ORDER BY created_at DESC, id DESC LIMIT %s;""",
+)
+
+@timing.timed("merge")
+def _merge_participant_rows(real, fb):
+    rows = (real or []) + (fb or [])
     rows.sort(key=lambda r: (r[-1] or datetime.datetime.min))  # oldest → newest
     rate = f"$ {FEE_USD}"
     # return tuples including rowkey for actions
     return [(_rowkey(src, pid), f, l, a, org, sz, col, tr, rate) for (src, pid, f, l, a, org, sz, col, tr, _) in rows]
 
+def _select_participants_for_advisor(advisor_email, limit=200):
+    if not (advisor_email and "@" in advisor_email):
+        return []
+    real_sql, fb_sql = ADVISOR_ROWS_SQL
+    params = [events.current(), advisor_email, limit]
+    return _merge_participant_rows(_try_select(real_sql, params), _try_select(fb_sql, params))
+
 def _select_participants_all(limit=2000):
-    real = _try_select("""SELECT 'p' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
-                          FROM registrations_participant
-                          ORDER BY created_at DESC NULLS LAST, id DESC LIMIT %s;""", [limit]) or []
-    fb   = _try_select("""SELECT 'f' as src, id, first_name,last_name,advisor_email,student_organization,tee_shirt_size,college_company,tour,created_at
-                          FROM registrations_participant_fallback
-                          ORDER BY created_at DESC, id DESC LIMIT %s;""", [limit]) or []
-    rows = real + fb
-    rows.sort(key=lambda r: (r[-1] or datetime.datetime.min))
-    rate = f"$ {FEE_USD}"
-    return [(_rowkey(src, pid), f, l, a, org, sz, col, tr, rate) for (src, pid, f, l, a, org, sz, col, tr, _) in rows]
+    real_sql, fb_sql = ALL_ROWS_SQL
+    params = [events.current(), limit]
+    return _merge_participant_rows(_try_select(real_sql, params), _try_select(fb_sql, params))
 
 def _build_table_and_csv(rows):
     buf = io.StringIO()
@@ -409,32 +784,145 @@ def _build_table_and_csv(rows):
     return table_html, csv_text, len(rows), len(rows)*FEE_USD
 
 def _send_admin_email(subject, html_body, csv_text, to_addr="studentorgs@mccb.edu"):
-    # Email disabled (stub) to avoid runtime failures
+    # Email disabled (stub) to avoid runtime failures.
+    # Per-save notifications go through digest.record_event instead (one digest per advisor burst).
     return True, "(email disabled)"
 
 def _insert_pending_user(first, last, email, category):
     pending_ok, _ = _ensure_flat_tables_if_missing()
-    if pending_ok:
-        return _try_exec("""INSERT INTO registrations_pendinguser
-            (first_name,last_name,email,category) VALUES (%s,%s,%s,%s)
-            ON CONFLICT (email) DO NOTHING;""", [first,last,email,category])
-    return _try_exec("""INSERT INTO registrations_pending_user_fallback
-        (first_name,last_name,email,category) VALUES (%s,%s,%s,%s)
-        ON CONFLICT (email) DO NOTHING;""", [first,last,email,category])
+    if pending_ok:  # the model table's other NOT NULL columns have no database default
+        table, extra_cols, extra = "registrations_pendinguser", ",college_company,is_validated", ["", False]
+    else:
+        table, extra_cols, extra = "registrations_pending_user_fallback", "", []
+    new_id, msg = _try_insert_id(f"""INSERT INTO {table}
+        (first_name,last_name,email,category{extra_cols}) VALUES (%s,%s,%s,%s{",%s" * len(extra)})
+        ON CONFLICT (email) DO NOTHING RETURNING id;""", [first,last,email,category,*extra])
+    if new_id is not None:  # None: already there, nothing changed
+        audit.record("insert", "pendinguser", new_id,
+                     after={"email": email, "first_name": first, "last_name": last, "category": category})
+    return not msg, msg
+
+def _find_matches(keys, limit=5):
+    """This event's rows (raw tables and FLCRegistration) whose match_key is in `keys`; see dedupe.find_matches."""
+    return dedupe.find_matches(keys, limit)
+
+def _tag_cols(table, key):
+    """(extra column SQL, params) for an INSERT: the current event, plus match_key `key` where `table` has it."""
+    if _has_match_key(table):
+        return ",event,match_key", [events.current(), key]
+    return ",event", [events.current()]
 
 def _insert_participant(first, last, org, size, college, tour, dietary, ada, fee_cents, advisor_email):
     _, participant_ok = _ensure_flat_tables_if_missing()
+    key = dedupe.match_key(first, last, college)
+    duplicate = dedupe.describe(_find_matches([key]), advisor_email)  # warn only; the save goes ahead
+    tour, waitlisted = tours.assign_tour(tour)
+    new_id = None
     if participant_ok:
-        ok, msg = _try_exec("""INSERT INTO registrations_participant
-            (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s);""",
-            [first,last,org,size,college,tour,fee_cents,advisor_email])
-        if ok:
-            return ok, msg
-    return _try_exec("""INSERT INTO registrations_participant_fallback
-        (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,dietary_restrictions,ada,fee_cents,advisor_email)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s);""",
-        [first,last,org,size,college,tour,dietary,ada,fee_cents,advisor_email])
+        src = "p"
+        tag_col, tag_val = _tag_cols("registrations_participant", key)
+        new_id, msg = _try_insert_id(f"""INSERT INTO registrations_participant
+            (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email{tag_col})
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s{",%s" * len(tag_val)}) RETURNING id;""",
+            [first,last,org,size,college,tour,fee_cents,advisor_email,*tag_val])
+    if new_id is None:
+        src = "f"
+        tag_col, tag_val = _tag_cols("registrations_participant_fallback", key)
+        new_id, msg = _try_insert_id(f"""INSERT INTO registrations_participant_fallback
+            (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,dietary_restrictions,ada,fee_cents,advisor_email{tag_col})
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s{",%s" * len(tag_val)}) RETURNING id;""",
+            [first,last,org,size,college,tour,dietary,ada,fee_cents,advisor_email,*tag_val])
+    ok = new_id is not None
+    if ok:
+        audit.record("insert", "participant", _rowkey(src, new_id), actor=advisor_email, after=_audit_image({
+            "first": first, "last": last, "org": org, "size": size, "college": college, "tour": tour,
+            "dietary": dietary if src == "f" else None, "ada": ada if src == "f" else None,
+            "fee": fee_cents, "advisor": advisor_email,
+        }))
+        digest.record_event(advisor_email, "added", first, last)
+        reports.bump_version()
+        notes = [f"{tour[len(tours.WAITLIST_PREFIX):]} is full; added to the waitlist."] if waitlisted else []
+        msg = " ".join(notes + ([duplicate] if duplicate else []))
+    elif not waitlisted:
+        tours.release_seat(tour)
+    return ok, msg
+
+# Rows queued client-side ("Add to list") arrive as repeated batch_<field> inputs.
+BATCH_FIELDS = ("first_name", "last_name", "student_organization", "tee_shirt_size",
+                "college_company", "tour", "dietary_restrictions", "ada")
+MAX_BATCH_ROWS = 100
+
+def _batch_rows(post):
+    """Queued rows as lists in BATCH_FIELDS order; short columns pad with ''."""
+    columns = [post.getlist(f"batch_{f}") for f in BATCH_FIELDS]
+    n = max(len(c) for c in columns)
+    return [[(c[i] if i < len(c) else "").strip() for c in columns] for i in range(n)]
+
+def _batch_problems(rows):
+    if len(rows) > MAX_BATCH_ROWS:
+        return [f"At most {MAX_BATCH_ROWS} participants per save ({len(rows)} queued)."]
+    return [f"Row {i}: please provide First and Last name."
+            for i, row in enumerate(rows, start=1) if not (row[0] and row[1])]
+
+def _insert_participants(rows, fee_cents, advisor_email):
+    """
+    Insert all queued rows or none: seats and one multi-row INSERT (primary
+    table, else fallback) in a single transaction. Returns (ok, msg, waitlisted
+    names); on success msg is the possible-duplicate warning, if any.
+    """
+    _, participant_ok = _ensure_flat_tables_if_missing()
+    rows = [list(r) for r in rows]
+    keys = [dedupe.match_key(r[0], r[1], r[4]) for r in rows]
+    matches = _find_matches(keys)  # one probe for the whole list
+    repeated = {k for k, n in Counter(keys).items() if n > 1}
+    matches += [("", None, r[0], r[1], advisor_email)  # twice in this very list
+                for k, r in {k: r for r, k in zip(rows, keys) if k in repeated}.items()]
+    waitlisted = []
+    try:
+        with transaction.atomic(), timing.phase("db"), connection.cursor() as cur:
+            for row in rows:
+                row[5], full = tours.assign_tour(row[5])
+                if full:
+                    waitlisted.append(f"{row[0]} {row[1]}")
+            src = None
+            if participant_ok:
+                tag_col = _tag_cols("registrations_participant", "")[0]
+                values = [[*r[:6], fee_cents, advisor_email, *_tag_cols("registrations_participant", k)[1]]
+                          for r, k in zip(rows, keys)]
+                try:
+                    with transaction.atomic():  # savepoint: a failure here still allows the fallback
+                        cur.execute(
+                            f"""INSERT INTO registrations_participant
+                            (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,fee_cents,advisor_email{tag_col})
+                            VALUES """ + ",".join(["(" + ",".join(["%s"] * len(values[0])) + ")"] * len(rows))
+                            + " RETURNING id,first_name,last_name,student_organization,tee_shirt_size,college_company,tour;",
+                            [v for row in values for v in row])
+                        src, inserted = "p", [(*r, None, None) for r in cur.fetchall()]
+                except Exception:
+                    pass
+            if src is None:
+                tag_col = _tag_cols("registrations_participant_fallback", "")[0]
+                values = [[*r, fee_cents, advisor_email, *_tag_cols("registrations_participant_fallback", k)[1]]
+                          for r, k in zip(rows, keys)]
+                cur.execute(
+                    f"""INSERT INTO registrations_participant_fallback
+                    (first_name,last_name,student_organization,tee_shirt_size,college_company,tour,dietary_restrictions,ada,fee_cents,advisor_email{tag_col})
+                    VALUES """ + ",".join(["(" + ",".join(["%s"] * len(values[0])) + ")"] * len(rows))
+                    + " RETURNING id,first_name,last_name,student_organization,tee_shirt_size,college_company,tour,"
+                      "dietary_restrictions,ada;",
+                    [v for row in values for v in row])
+                src, inserted = "f", cur.fetchall()
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}", []
+    # RETURNING order need not follow VALUES order, so each image comes from its own returned row
+    for pid, first, last, org, size, college, tour, dietary, ada in inserted:
+        audit.record("insert", "participant", _rowkey(src, pid), actor=advisor_email, after=_audit_image({
+            "first": first, "last": last, "org": org, "size": size, "college": college, "tour": tour,
+            "dietary": dietary, "ada": ada, "fee": fee_cents, "advisor": advisor_email,
+        }))
+    digest.record_events(advisor_email, "added", [(r[0], r[1]) for r in rows])
+    reports.bump_version()
+    return True, dedupe.describe(matches, advisor_email), waitlisted
 
 @csrf_exempt
 def sanity_view(request):
@@ -446,101 +934,331 @@ def sanity_view(request):
     """
     return _html_page("Sanity", body)
 
-@csrf_exempt
-def form_view(request):
-    advisor_email_url = _safe_get(request.GET, "email", "").strip().lower()
+@rate_limit("10/m", key="ip", methods=("GET", "POST"))
+def access_link_view(request, token):
+    """
+    One-time invitation link (see invitations.py). GET only shows a confirm
+    button, so mail scanners that prefetch links don't use them up; the POST's
+    conditional UPDATE both checks and consumes the link, so two clicks can't
+    both get in.
+    """
+    if request.method != "POST":
+        usable = AccessLink.objects.filter(pk=token, used=False, expires_at__gt=timezone.now()).exists()
+        return _link_confirm_page(request) if usable else _link_expired_page()
+    link = AccessLink.objects.filter(pk=token).only("email").first()
+    consumed = link and AccessLink.objects.filter(
+        pk=token, used=False, expires_at__gt=timezone.now()
+    ).update(used=True)
+    if not consumed:
+        return _link_expired_page()
+    return _grant_access(request, link.email)
+
+@rate_limit("10/m", key="ip", methods=("GET", "POST"))
+def signed_access_link_view(request, token):
+    """Stateless variant: the signed token is checked in memory; consuming it (on POST) is one INSERT."""
+    try:
+        if request.method != "POST":
+            read_access_token(token)
+            return _link_confirm_page(request)
+        claims = consume_access_token(token)
+    except BadSignature:  # also SignatureExpired / TokenRevoked
+        return _link_expired_page()
+    return _grant_access(request, claims["email"])
+
+def _link_confirm_page(request):
+    body = f"""
+      <h1 id="pageTitle">Open the registration form</h1>
+      <div class="card">
+        <p>This invitation link works once. Continue to sign in and open your registration form.</p>
+        <form method="post">
+          <input type="hidden" name="csrfmiddlewaretoken" value="{get_token(request)}" />
+          <button type="submit" class="btn-primary btn-left">Continue</button>
+        </form>
+      </div>
+    """
+    return _html_page("Open the registration form", body)
 
-    status_block = ""
-    summary_html = ""
-    advisor_for_list = advisor_email_url  # which advisor’s rows to show
+def _link_expired_page():
+    body = """
+      <h1 id="pageTitle">Link expired</h1>
+      <div class="card warn" role="alert">
+        <p>This access link has expired or was already used. Please ask for a new invitation.</p>
+      </div>
+    """
+    return _html_page("Link expired", body)
 
-    if request.method == "POST":
-        # 1) DELETE comes first so it doesn't fall through to finish/save
-        delete_rowkey = _safe_get(request.POST, "delete_row").strip()
-        if delete_rowkey:
-            typed_advisor = _safe_get(request.POST, "advisor_email").strip().lower() or advisor_email_url
-            ok, msg = _delete_participant(delete_rowkey, typed_advisor)
-            status_block = (
-                '<div class="card success" role="status">Participant deleted.</div>'
-                if ok else f'<div class="card error" role="alert">Delete failed: {escape(msg)}</div>'
-            )
-            # after a delete, show that advisor's updated list
-            advisor_for_list = typed_advisor or advisor_email_url
-
-        # 2) FINISH summary (typed advisor preferred; fallback to URL ?email=...)
-        elif request.POST.get("finish"):
-            admin_mode = _safe_get(request.GET, "all", "").lower() in ("1", "true", "yes")
-            if admin_mode:
-                rows = _select_participants_all(2000)
-                advisor_label = "All participants"
-            else:
-                typed_adv = _safe_get(request.POST, "advisor_email").strip().lower()
-                effective_adv = typed_adv or advisor_email_url
-                if not (effective_adv and "@" in effective_adv):
-                    status_block = '<div class="card warn" role="alert">Enter your advisor email, then press Finish.</div>'
-                    rows = []
-                    advisor_label = "Advisor: (missing)"
-                else:
-                    rows = _select_participants_for_advisor(effective_adv, 500)
-                    advisor_label = f"Advisor: {escape(effective_adv)}"
-
-            table_html, csv_text, cnt, total = _build_table_and_csv(rows)
-            summary_html = f"""
-            <div class="card success" role="region" aria-label="Finish summary">
-              <h2 style="margin-top:0;">Summary (print this for your records)</h2>
-              <p class="muted topbox-text">{advisor_label} · Count: {cnt} · Total: $ {total}</p>
-              {table_html}
-              <div class="print-actions">
-                <a class="btn-primary" style="display:inline-block;padding:.6rem .9rem;border-radius:10px;text-decoration:none;"
-                   download="flc_summary.csv"
-                   href={{"data:text/csv;charset=utf-8," + urllib.parse.quote(csv_text)}}>Download CSV</a>
-                <button type="button" class="btn-primary" style="width:auto;max-width:none;" onclick="window.print()">Print Summary</button>
-              </div>
-            </div>
-            """
+def _grant_access(request, email):
+    email = email.strip().lower()
+    grant_access(request, email)
+    return HttpResponseRedirect(
+        reverse("registrations:registrations_form") + "?" + urllib.parse.urlencode({"email": email})
+    )
 
-        # 3) SAVE / SHOW ENTRIES (normal flow)
-        else:
-            first   = _safe_get(request.POST, "first_name").strip()
-            last    = _safe_get(request.POST, "last_name").strip()
-            org     = _safe_get(request.POST, "student_organization").strip()
-            size    = _safe_get(request.POST, "tee_shirt_size").strip()
-            college = _safe_get(request.POST, "college_company").strip()
-            tour    = _safe_get(request.POST, "tour").strip()
-            dietary = _safe_get(request.POST, "dietary_restrictions").strip()
-            ada     = _safe_get(request.POST, "ada").strip()
-            role    = _safe_get(request.POST, "role").strip()  # read-only for now
-            typed_advisor = _safe_get(request.POST, "advisor_email").strip().lower()
-
-            # whose list to show after POST
-            advisor_for_list = typed_advisor or advisor_email_url
-
-            # Just show previous entries (no validation)
-            if request.POST.get("show_entries"):
-                if typed_advisor and "@" in typed_advisor:
-                    status_block = f'<div class="card success" role="status">Showing entries for {escape(typed_advisor)}</div>'
-                else:
-                    status_block = '<div class="card warn" role="alert">Enter a valid advisor email to see previous entries.</div>'
+def _finish_summary_html(rows, advisor_label):
+    table_html, csv_text, cnt, total = _build_table_and_csv(rows)
+    return f"""
+    <div class="card success" role="region" aria-label="Finish summary">
+      <h2 style="margin-top:0;">Summary (print this for your records)</h2>
+      <p class="muted topbox-text">{advisor_label} · Count: {cnt} · Total: $ {total}</p>
+      {table_html}
+      <div class="print-actions">
+        <a class="btn-primary" style="display:inline-block;padding:.6rem .9rem;border-radius:10px;text-decoration:none;"
+           download="flc_summary.csv"
+           href={{"data:text/csv;charset=utf-8," + urllib.parse.quote(csv_text)}}>Download CSV</a>
+        <button type="button" class="btn-primary" style="width:auto;max-width:none;" onclick="window.print()">Print Summary</button>
+      </div>
+    </div>
+    """
 
-            # Insert a new participant
-            else:
-                if not (typed_advisor and "@" in typed_advisor):
-                    status_block = '<div class="card warn" role="alert">Advisor email is required for each entry.</div>'
-                elif not first or not last:
-                    status_block = '<div class="card warn" role="alert">Please provide First and Last name.</div>'
-                else:
-                    ok, msg = _insert_participant(
-                        first, last, org, size, college, tour, dietary, ada, FEE_CENTS, typed_advisor
-                    )
-                    status_block = (
-                        f'<div class="card success" role="status" aria-live="polite">Saved {escape(first)} {escape(last)} (fee $ {FEE_USD})</div>'
-                        if ok else f'<div class="card error" role="alert">DB write failed. Details: {escape(msg)}</div>'
-                    )
+def _save_participant_once(idem_key, typed_advisor, first, last, org, size, college, tour, dietary, ada):
+    """
+    Insert guarded by the form's idempotency key: a replayed POST returns the
+    first attempt's status instead of writing a duplicate row.
+    """
+    def save():
+        ok, msg = _insert_participant(first, last, org, size, college, tour, dietary, ada, FEE_CENTS, typed_advisor)
+        return ok, _saved_status(ok, msg, first, last)
+    return _run_once(idem_key, typed_advisor, save)[1]
+
+def _save_batch_once(idem_key, typed_advisor, rows):
+    """Batch counterpart of _save_participant_once: the whole list is one keyed attempt."""
+    def save():
+        ok, msg, waitlisted = _insert_participants(rows, FEE_CENTS, typed_advisor)
+        return ok, _batch_status(ok, msg, len(rows), waitlisted)
+    return _run_once(idem_key, typed_advisor, save)
+
+def _run_once(idem_key, typed_advisor, save):
+    """-> (ok, status_block); a replay is ok, ok is None while the first attempt is still in flight."""
+    owner, replay = idempotency.begin(typed_advisor, idem_key)
+    if not owner:
+        if replay and replay.get("status_block"):
+            return True, replay["status_block"]
+        return None, ('<div class="card warn" role="status" aria-live="polite">This entry is still being saved. '
+                      'Press save again in a moment to see the result.</div>')
+    try:
+        ok, status_block = save()
+    except Exception:
+        idempotency.release(typed_advisor, idem_key)
+        raise
+    if ok:
+        idempotency.finish(typed_advisor, idem_key, {"status_block": status_block})
+    else:
+        idempotency.release(typed_advisor, idem_key)
+    return ok, status_block
+
+def _batch_status(ok, msg, count, waitlisted):
+    if not ok:
+        return f'<div class="card error" role="alert">DB write failed; nothing was saved. Details: {escape(msg)}</div>'
+    saved = f"Saved {count} participant{'s' if count != 1 else ''} (fee $ {FEE_USD} each)."
+    notes = ([f'Tour full, waitlisted: {", ".join(waitlisted)}'] if waitlisted else []) + ([msg] if msg else [])
+    if notes:
+        return f'<div class="card warn" role="status" aria-live="polite">{saved} {escape(" ".join(notes))}</div>'
+    return f'<div class="card success" role="status" aria-live="polite">{saved}</div>'
+
+def _saved_status(ok, msg, first, last):
+    if ok and msg:  # saved with a note, e.g. put on a tour waitlist
+        return f'<div class="card warn" role="status" aria-live="polite">Saved {escape(first)} {escape(last)} (fee $ {FEE_USD}). {escape(msg)}</div>'
+    return (
+        f'<div class="card success" role="status" aria-live="polite">Saved {escape(first)} {escape(last)} (fee $ {FEE_USD})</div>'
+        if ok else f'<div class="card error" role="alert">DB write failed. Details: {escape(msg)}</div>'
+    )
 
+# (row dict key, POST field, label) for the edit form and its merge prompt
+EDIT_FIELDS = (
+    ("first", "first_name", "First name"), ("last", "last_name", "Last name"),
+    ("org", "student_organization", "Organization"), ("size", "tee_shirt_size", "T-shirt size"),
+    ("college", "college_company", "College/Company"), ("tour", "tour", "Tour"),
+    ("dietary", "dietary_restrictions", "Dietary"), ("ada", "ada", "ADA"),
+)
 
-    # Build advisor-scoped table (simple & stable; supports 8- or 9-tuples)
-    rows = _select_participants_for_advisor(advisor_for_list, limit=50) if advisor_for_list else []
+def _edit_prefill(rowkey, advisor_email):
+    """GET ?edit=<rowkey>: (edit values for the form or None, status_block)."""
+    data = _fetch_participant_by_rowkey(rowkey)
+    if not data or not advisor_email or data["advisor"] != advisor_email:
+        return None, '<div class="card warn" role="alert">That participant can\'t be edited from this list.</div>'
+    return {**data, "tour": tours.label(data["tour"]), "rowkey": rowkey}, ""
 
+def _save_edit_post(post, typed_advisor):
+    """
+    Edit-form POST -> (status_block, edit values to re-show or None). A version
+    conflict re-shows the advisor's values next to the saved ones (merge
+    prompt); the form then carries the current version, so pressing Update
+    again is a deliberate overwrite.
+    """
+    rowkey = _safe_get(post, "edit_row").strip()
+    mine = {key: _safe_get(post, field).strip() for key, field, _ in EDIT_FIELDS}
+    try:
+        expected = int(_safe_get(post, "row_version"))
+    except ValueError:
+        expected = None
+    edit = {**mine, "advisor": typed_advisor, "rowkey": rowkey, "version": expected}
+    if not (typed_advisor and "@" in typed_advisor):
+        return '<div class="card warn" role="alert">Advisor email is required for each entry.</div>', edit
+    if not mine["first"] or not mine["last"]:
+        return '<div class="card warn" role="alert">Please provide First and Last name.</div>', edit
+
+    ok, msg = _update_participant(rowkey, typed_advisor, mine["first"], mine["last"], mine["org"], mine["size"],
+                                  mine["college"], mine["tour"], mine["dietary"], mine["ada"], typed_advisor,
+                                  expected_version=expected)
+    name = f"{escape(mine['first'])} {escape(mine['last'])}"
+    if ok:
+        if msg:
+            return f'<div class="card warn" role="status" aria-live="polite">Updated {name}. {escape(msg)}</div>', None
+        return f'<div class="card success" role="status" aria-live="polite">Updated {name}.</div>', None
+    if msg != EDIT_CONFLICT:
+        return f'<div class="card error" role="alert">Update failed. Details: {escape(msg)}</div>', edit
+
+    current = _fetch_participant_by_rowkey(rowkey)
+    if not current or current["advisor"] != typed_advisor:
+        return ('<div class="card warn" role="alert">This participant was deleted or moved to another advisor '
+                'while you were editing; your changes were not saved.</div>'), None
+    current["tour"] = tours.label(current["tour"])
+    diffs = [(title, mine[key], current[key] or "") for key, _, title in EDIT_FIELDS
+             if key in current and mine[key] != (current[key] or "")]
+    if not diffs:  # the other change was this same edit (e.g. a double submit)
+        return f'<div class="card success" role="status" aria-live="polite">Updated {name}.</div>', None
+    rows = "".join(f"<tr><td>{escape(t)}</td><td>{escape(a)}</td><td>{escape(b)}</td></tr>" for t, a, b in diffs)
+    discard = "?" + urllib.parse.urlencode({"email": typed_advisor, "edit": rowkey})
+    return f"""
+      <div class="card warn" role="alert">
+        <p><strong>Someone changed this participant after you opened it.</strong>
+           Your edits are still in the form below: press Update Participant to save them over the
+           current version, or <a href="{escape(discard)}">discard your edits</a> to start from the saved values.</p>
+        <table aria-label="Your edits and the saved values">
+          <thead><tr><th>Field</th><th>Your edit</th><th>Saved now</th></tr></thead>
+          <tbody>{rows}</tbody>
+        </table>
+      </div>
+    """, {**edit, "version": current["version"]}
+
+def _bulk_post(post, typed_advisor):
+    """Bulk form POST (Apply to selected / Delete selected) -> status_block."""
+    rowkeys = [rk for rk in post.getlist("selected") if rk]
+    if not (typed_advisor and "@" in typed_advisor):
+        return '<div class="card warn" role="alert">Advisor email is required for each entry.</div>'
+    if not rowkeys:
+        return '<div class="card warn" role="alert">Select at least one participant first.</div>'
+    if _safe_get(post, "bulk_action") == "delete":
+        ok, msg, done = _bulk_delete_participants(rowkeys, typed_advisor)
+        waitlisted, verb = 0, "Deleted"
+    else:
+        changes = {col: value for col in BULK_COLUMNS if (value := _safe_get(post, f"bulk_{col}").strip())}
+        if not changes:
+            return '<div class="card warn" role="alert">Choose at least one value to change.</div>'
+        ok, msg, done, waitlisted = _bulk_update_participants(rowkeys, typed_advisor, changes)
+        verb = "Updated"
+    if not ok:
+        return f'<div class="card error" role="alert">Nothing was changed. Details: {escape(msg)}</div>'
+    text = f"{verb} {done} participant{'s' if done != 1 else ''}."
+    if done < len(rowkeys):
+        text += f" {len(rowkeys) - done} selected row(s) no longer exist or belong to another advisor."
+    if waitlisted:
+        text += f" The tour is full: {waitlisted} went on the waitlist."
+    card = "warn" if waitlisted or done < len(rowkeys) else "success"
+    return f'<div class="card {card}" role="status" aria-live="polite">{escape(text)}</div>'
+
+def _bulk_form_html(advisor_for_list):
+    selects = "".join(
+        f'<div><label for="bulk_{col}">{PARTICIPANT_CHOICES[col][0]}</label>'
+        f'<select id="bulk_{col}" name="bulk_{col}"><option value="">(no change)</option>'
+        + _options_html(col) + "</select></div>"
+        for col in BULK_COLUMNS
+    )
+    return f"""
+        <form id="bulkform" method="post" style="margin-top:12px;" aria-label="Bulk actions for selected participants">
+          <input type="hidden" name="advisor_email" value="{escape(advisor_for_list or '')}" />
+          <div class="row">{selects}</div>
+          <div style="margin-top:8px; display:flex; gap:12px; flex-wrap:wrap;">
+            <button type="submit" name="bulk_action" value="update" class="btn-muted" style="width:auto;">Apply to selected</button>
+            <button type="submit" name="bulk_action" value="delete" class="btn-danger" style="width:auto;"
+                    onclick="return confirm('Delete all selected participants?');">Delete selected</button>
+          </div>
+        </form>
+        <script>
+          document.getElementById('selectAll').addEventListener('change', function () {{
+            var on = this.checked;
+            document.querySelectorAll('input[name="selected"]').forEach(function (box) {{ box.checked = on; }});
+          }});
+        </script>
+    """
+
+def _save_batch_post(post, typed_advisor):
+    """
+    "Save all queued" POST -> (status_block, rows still queued, idem_key to
+    render). Every row is validated first; on any problem nothing is saved and
+    the list comes back. While an earlier POST of the same list is still saving,
+    the list comes back with its key, so saving again replays that attempt
+    instead of writing the rows twice.
+    """
+    rows = _batch_rows(post)
+    if not rows:
+        return '<div class="card warn" role="alert">No participants queued. Use "Add to list" first.</div>', [], ""
+    if not (typed_advisor and "@" in typed_advisor):
+        return '<div class="card warn" role="alert">Advisor email is required for each entry.</div>', rows, ""
+    problems = _batch_problems(rows)
+    if problems:
+        items = "".join(f"<li>{escape(p)}</li>" for p in problems)
+        return f'<div class="card warn" role="alert">Nothing was saved.<ul>{items}</ul></div>', rows, ""
+    idem_key = _safe_get(post, "idem_key").strip()
+    ok, status_block = _save_batch_once(idem_key, typed_advisor, rows)
+    if ok is None:
+        return status_block, rows, idem_key
+    return status_block, ([] if ok else rows), ""
+
+def _queued_row_html(row):
+    cells = "".join(f"<td>{escape(v)}</td>" for v in row[:6])
+    hidden = "".join(f"<input type='hidden' name='batch_{f}' value='{escape(v)}'/>" for f, v in zip(BATCH_FIELDS, row))
+    return (f"<tr>{cells}<td>{hidden}"
+            "<button type='button' class='btn-muted batch-remove' aria-label='Remove from list'>Remove</button></td></tr>")
+
+# Client side of the batch list: "Add to list" copies the fields into a queued
+# row (hidden batch_* inputs inside the form), so one POST saves them all.
+_BATCH_SCRIPT = """
+<script>
+(function () {
+  var form = document.getElementById('flcform');
+  var body = document.getElementById('batchRows');
+  var fields = %s;
+  function refresh() {
+    var n = body.rows.length;
+    document.getElementById('batchCard').hidden = n === 0;
+    document.getElementById('batchCount').textContent = n;
+  }
+  function addRow() {
+    var first = form.elements.first_name, last = form.elements.last_name;
+    if (!first.value.trim() || !last.value.trim()) { (first.value.trim() ? last : first).reportValidity(); return; }
+    var tr = document.createElement('tr'), actions = document.createElement('td');
+    fields.forEach(function (name, i) {
+      var value = form.elements[name].value.trim();
+      if (i < 6) { var td = document.createElement('td'); td.textContent = value; tr.appendChild(td); }
+      var input = document.createElement('input');
+      input.type = 'hidden'; input.name = 'batch_' + name; input.value = value;
+      actions.appendChild(input);
+    });
+    var remove = document.createElement('button');
+    remove.type = 'button'; remove.className = 'btn-muted batch-remove'; remove.textContent = 'Remove';
+    actions.appendChild(remove);
+    tr.appendChild(actions);
+    body.appendChild(tr);
+    first.value = ''; last.value = '';
+    first.focus();
+    refresh();
+  }
+  document.getElementById('batchAdd').addEventListener('click', addRow);
+  body.addEventListener('click', function (e) {
+    if (e.target.classList.contains('batch-remove')) { e.target.closest('tr').remove(); refresh(); }
+  });
+  refresh();
+})();
+</script>
+""" % json.dumps(list(BATCH_FIELDS))
+
+@timing.timed("html")
+def _render_form_page(advisor_for_list, rows, status_block, summary_html, queued=(), edit=None, idem_key=""):
+    """
+    HTML for the registration page; shared by the sync and async (views_async)
+    form views. The form gets a fresh idempotency key unless idem_key is given.
+    """
     if not rows:
         part_html = "<p class='muted'>No participants found.</p>"
     else:
@@ -550,6 +1268,8 @@ def form_view(request):
             rk, f, l, a, org, sz, col, tr, rate = tup
             body_rows.append(
                 "<tr>"
+                f"<td><input type='checkbox' name='selected' value='{escape(rk)}' form='bulkform'"
+                f" aria-label='Select {escape(f)} {escape(l)}'/></td>"
                 f"<td>{escape(f)}</td><td>{escape(l)}</td><td>{escape(a)}</td>"
                 f"<td>{escape(org or '')}</td><td>{escape(sz or '')}</td>"
                 f"<td>{escape(col or '')}</td><td>{escape(tr or '')}</td>"
@@ -573,13 +1293,15 @@ def form_view(request):
         <table aria-label="Recently added participants" style="font-size:.92rem;">
           <thead>
             <tr>
+              <th><input type="checkbox" id="selectAll" aria-label="Select all"/></th>
               <th>First</th><th>Last</th><th>Advisor</th>
               <th>Org</th><th>Size</th><th>College/Company</th><th>Tour</th><th>Rate</th><th>Actions</th>
             </tr>
           </thead>
           <tbody>{''.join(body_rows)}</tbody>
-          <tfoot><tr><td colspan="9" class="muted">Oldest at top, newest at bottom</td></tr></tfoot>
+          <tfoot><tr><td colspan="10" class="muted">Oldest at top, newest at bottom</td></tr></tfoot>
         </table>
+        {_bulk_form_html(advisor_for_list)}
         """
 
 
@@ -595,9 +1317,22 @@ def form_view(request):
       </div>
     """
 
-    # Prefill (no edit mode right now)
-    ef = el = eorg = esize = ecol = etour = ediet = eada = erole = ""
-    eadv = advisor_for_list
+    # Prefill: blank for a new entry; in edit mode the row (or the advisor's unsaved edits)
+    edit = edit or {}
+    ef, el, eorg, esize, ecol, etour, ediet, eada = (edit.get(key) or "" for key, _, _ in EDIT_FIELDS)
+    erole = ""
+    eadv = edit.get("advisor") or advisor_for_list
+    if edit:
+        edit_inputs = (
+            f'<input type="hidden" name="edit_row" value="{escape(edit["rowkey"])}" />'
+            f'<input type="hidden" name="row_version" value="{escape(edit.get("version") or "")}" />'
+        )
+        save_label = "Update Participant"
+        cancel_edit = (f'<a href="?{escape(urllib.parse.urlencode({"email": eadv}))}" '
+                       'style="align-self:center;">Cancel edit</a>')
+    else:
+        edit_inputs = cancel_edit = ""
+        save_label = "Save Participant"
 
     def _sel(cur, opt):
         return ' selected' if (cur or '') == opt else ''
@@ -610,6 +1345,8 @@ def form_view(request):
       {summary_html}
 
       <form id="flcform" class="card" method="post" aria-label="Participant add form">
+        <input type="hidden" name="idem_key" value="{escape(idem_key or idempotency.new_key())}" />
+        {edit_inputs}
 
         <!-- Row 1 -->
         <div class="row">
@@ -623,19 +1360,14 @@ def form_view(request):
             <label for="student_organization">Student Organization</label>
             <select id="student_organization" name="student_organization" aria-label="Student Organization">
               <option value="">(select)</option>
-              <option{_sel(eorg,'DECA')}>DECA</option><option{_sel(eorg,'FBLA')}>FBLA</option>
-              <option{_sel(eorg,'SkillsUSA')}>SkillsUSA</option><option{_sel(eorg,'HOSA')}>HOSA</option>
-              <option{_sel(eorg,'Mississippi Postsecondary Student Organization')}>Mississippi Postsecondary Student Organization</option>
+              {_options_html('student_organization', eorg)}
             </select>
           </div>
           <div>
             <label for="tee_shirt_size">T-Shirt Size</label>
             <select id="tee_shirt_size" name="tee_shirt_size" aria-label="Tee Shirt Size">
               <option value="">(select)</option>
-              <option{_sel(esize,'XSmall')}>XSmall</option><option{_sel(esize,'Small')}>Small</option>
-              <option{_sel(esize,'Medium')}>Medium</option><option{_sel(esize,'Large')}>Large</option>
-              <option{_sel(esize,'XLarge')}>XLarge</option><option{_sel(esize,'2XLarge')}>2XLarge</option>
-              <option{_sel(esize,'3XLarge')}>3XLarge</option><option{_sel(esize,'4XLarge')}>4XLarge</option>
+              {_options_html('tee_shirt_size', esize)}
             </select>
           </div>
         </div>
@@ -646,35 +1378,14 @@ def form_view(request):
             <label for="college_company">College/Chapter</label>
             <select id="college_company" name="college_company" aria-label="College or Company">
               <option value="">(select)</option>
-              <option{_sel(ecol,'Coahoma Community College')}>Coahoma Community College</option>
-              <option{_sel(ecol,'Copiah-Lincoln Community College')}>Copiah-Lincoln Community College</option>
-              <option{_sel(ecol,'Delta State University')}>Delta State University</option>
-              <option{_sel(ecol,'East Central Community College')}>East Central Community College</option>
-              <option{_sel(ecol,'East Mississippi Community College - Mayhew')}>East Mississippi Community College - Mayhew</option>
-              <option{_sel(ecol,'East Mississippi Community College - Scooba')}>East Mississippi Community College - Scooba</option>
-              <option{_sel(ecol,'Hinds Community College - Raymond')}>Hinds Community College - Raymond</option>
-              <option{_sel(ecol,'Hinds Community College - Utica')}>Hinds Community College - Utica</option>
-              <option{_sel(ecol,'Holmes Community College')}>Holmes Community College</option>
-              <option{_sel(ecol,'Jones College')}>Jones College</option>
-              <option{_sel(ecol,'Mississippi Delta Community College')}>Mississippi Delta Community College</option>
-              <option{_sel(ecol,'Mississippi Gulf Coast Community College - Harrison')}>Mississippi Gulf Coast Community College - Harrison</option>
-              <option{_sel(ecol,'Mississippi State University College of Business')}>Mississippi State University College of Business</option>
-              <option{_sel(ecol,'Mississippi University for Women')}>Mississippi University for Women</option>
-              <option{_sel(ecol,'Northeast Mississippi Community College')}>Northeast Mississippi Community College</option>
-              <option{_sel(ecol,'Southwest Mississippi Community College')}>Southwest Mississippi Community College</option>
-              <option{_sel(ecol,'Tougaloo College')}>Tougaloo College</option>
-              <option{_sel(ecol,'University of Mississippi - Desoto')}>University of Mississippi - Desoto</option>
-              <option{_sel(ecol,'Mississippi Community College Board')}>Mississippi Community College Board</option>
-              <option{_sel(ecol,'Other')}>Other</option>
+              {_options_html('college_company', ecol)}
             </select>
           </div>
           <div>
             <label for="tour">Tour</label>
             <select id="tour" name="tour" aria-label="Tour selection">
               <option value="">(select)</option>
-              <option{_sel(etour,'Haley Barbour Center for Manufacturing Excellence')}>Haley Barbour Center for Manufacturing Excellence</option>
-              <option{_sel(etour,'The Jim and Thomas Duff Center for Science and Technology Innovation')}>The Jim and Thomas Duff Center for Science and Technology Innovation</option>
-              <option{_sel(etour,'No Tour')}>No Tour</option>
+              {_options_html('tour', etour)}
             </select>
           </div>
         </div>
@@ -710,12 +1421,25 @@ def form_view(request):
         </div>
 
         <div style="margin-top:8px; display:flex; gap:12px; flex-wrap:wrap;">
-          <button type="submit" class="btn-primary btn-left" aria-label="Save participant">Save Participant</button>
+          <button type="submit" class="btn-primary btn-left" aria-label="{save_label}">{save_label}</button>
+          {cancel_edit}
+          <button type="button" id="batchAdd" aria-label="Add to list">Add to list</button>
           <button type="submit" name="show_entries" value="1" formnovalidate aria-label="Show previous entries">
             Enter email to see previous entries
           </button>
         </div>
+
+        <div id="batchCard" style="margin-top:12px;"{'' if queued else ' hidden'}>
+          <h2 style="margin-top:0;">Queued participants (<span id="batchCount">{len(queued)}</span>)</h2>
+          <table aria-label="Queued participants" style="font-size:.92rem;">
+            <thead><tr><th>First</th><th>Last</th><th>Org</th><th>Size</th><th>College/Company</th><th>Tour</th><th></th></tr></thead>
+            <tbody id="batchRows">{''.join(_queued_row_html(r) for r in queued)}</tbody>
+          </table>
+          <button type="submit" name="save_batch" value="1" formnovalidate class="btn-primary"
+                  style="width:auto;" aria-label="Save all queued participants">Save all queued</button>
+        </div>
       </form>
+      {_BATCH_SCRIPT}
 
       <div class="card" aria-live="polite">
         <h2 style="margin-top:0;">Recently Added Participants</h2>
@@ -725,8 +1449,131 @@ def form_view(request):
     return _html_page("Fall Leadership Conference Registration", body)
 
 
+def _form_post(request, advisor_email_url):
+    """
+    The form page's POST actions, shared by form_view and views_async.form_view
+    (which runs it in a thread). Returns (status_block, summary_html,
+    advisor_for_list, queued, edit, idem_key) for _render_form_page.
+    """
+    status_block = ""
+    summary_html = ""
+    advisor_for_list = advisor_email_url  # which advisor’s rows to show
+    queued = []
+    edit = None
+    idem_key = ""
+
+    # 1) DELETE comes first so it doesn't fall through to finish/save
+    delete_rowkey = _safe_get(request.POST, "delete_row").strip()
+    if delete_rowkey:
+        typed_advisor = _safe_get(request.POST, "advisor_email").strip().lower() or advisor_email_url
+        ok, msg = _delete_participant(delete_rowkey, typed_advisor)
+        status_block = (
+            '<div class="card success" role="status">Participant deleted.</div>'
+            if ok else f'<div class="card error" role="alert">Delete failed: {escape(msg)}</div>'
+        )
+        # after a delete, show that advisor's updated list
+        advisor_for_list = typed_advisor or advisor_email_url
+
+    # Bulk edit/delete of the checked rows
+    elif request.POST.get("bulk_action"):
+        typed_advisor = _safe_get(request.POST, "advisor_email").strip().lower() or advisor_email_url
+        status_block = _bulk_post(request.POST, typed_advisor)
+        advisor_for_list = typed_advisor or advisor_email_url
+
+    # 2) FINISH summary (typed advisor preferred; fallback to URL ?email=...)
+    elif request.POST.get("finish"):
+        admin_mode = _safe_get(request.GET, "all", "").lower() in ("1", "true", "yes")
+        if admin_mode:
+            rows = _select_participants_all(2000)
+            advisor_label = "All participants"
+        else:
+            typed_adv = _safe_get(request.POST, "advisor_email").strip().lower()
+            effective_adv = typed_adv or advisor_email_url
+            if not (effective_adv and "@" in effective_adv):
+                status_block = '<div class="card warn" role="alert">Enter your advisor email, then press Finish.</div>'
+                rows = []
+                advisor_label = "Advisor: (missing)"
+            else:
+                rows = _select_participants_for_advisor(effective_adv, 500)
+                advisor_label = f"Advisor: {escape(effective_adv)}"
+
+        summary_html = _finish_summary_html(rows, advisor_label)
+
+    # 3) SAVE / SHOW ENTRIES (normal flow)
+    else:
+        first   = _safe_get(request.POST, "first_name").strip()
+        last    = _safe_get(request.POST, "last_name").strip()
+        org     = _safe_get(request.POST, "student_organization").strip()
+        size    = _safe_get(request.POST, "tee_shirt_size").strip()
+        college = _safe_get(request.POST, "college_company").strip()
+        tour    = _safe_get(request.POST, "tour").strip()
+        dietary = _safe_get(request.POST, "dietary_restrictions").strip()
+        ada     = _safe_get(request.POST, "ada").strip()
+        role    = _safe_get(request.POST, "role").strip()  # read-only for now
+        typed_advisor = _safe_get(request.POST, "advisor_email").strip().lower()
+
+        # whose list to show after POST
+        advisor_for_list = typed_advisor or advisor_email_url
+        queued = _batch_rows(request.POST)  # keep the client-side list across re-renders
+
+        # Save every queued row at once
+        if request.POST.get("save_batch"):
+            status_block, queued, idem_key = _save_batch_post(request.POST, typed_advisor)
+
+        # Update the row being edited (version-checked)
+        elif request.POST.get("edit_row") and not request.POST.get("show_entries"):
+            status_block, edit = _save_edit_post(request.POST, typed_advisor)
+
+        # Just show previous entries (no validation)
+        elif request.POST.get("show_entries"):
+            if typed_advisor and "@" in typed_advisor:
+                status_block = f'<div class="card success" role="status">Showing entries for {escape(typed_advisor)}</div>'
+            else:
+                status_block = '<div class="card warn" role="alert">Enter a valid advisor email to see previous entries.</div>'
+
+        # Insert a new participant
+        else:
+            if not (typed_advisor and "@" in typed_advisor):
+                status_block = '<div class="card warn" role="alert">Advisor email is required for each entry.</div>'
+            elif not first or not last:
+                status_block = '<div class="card warn" role="alert">Please provide First and Last name.</div>'
+            else:
+                status_block = _save_participant_once(
+                    _safe_get(request.POST, "idem_key").strip(), typed_advisor,
+                    first, last, org, size, college, tour, dietary, ada,
+                )
+
+    return status_block, summary_html, advisor_for_list, queued, edit, idem_key
+
 
 @csrf_exempt
+@rate_limit("30/m", key="ip")
+@rate_limit("20/m", key="advisor")
+def form_view(request):
+    advisor_email_url = _safe_get(request.GET, "email", "").strip().lower()
+
+    status_block = ""
+    summary_html = ""
+    advisor_for_list = advisor_email_url
+    queued = []
+    edit = None
+    idem_key = ""
+
+    if request.method == "POST":
+        status_block, summary_html, advisor_for_list, queued, edit, idem_key = _form_post(request, advisor_email_url)
+
+    # Edit button: open that row in the form
+    elif _safe_get(request.GET, "edit").strip():
+        edit, status_block = _edit_prefill(_safe_get(request.GET, "edit").strip(), advisor_email_url)
+
+    # Build advisor-scoped table (simple & stable; supports 8- or 9-tuples)
+    rows = _select_participants_for_advisor(advisor_for_list, limit=50) if advisor_for_list else []
+    return _render_form_page(advisor_for_list, rows, status_block, summary_html, queued, edit, idem_key)
+
+
+
+@csrf_exempt
+@rate_limit("10/m", key="ip")
 def manage_pending_users_view(request):
     post_status = ""
     if request.method == "POST":
@@ -741,9 +1588,10 @@ def manage_pending_users_view(request):
             post_status = (f'<div class="card success" role="status" aria-live="polite">Seeded/ensured {escape(email)}</div>'
                            if ok else f'<div class="card error" role="alert">Could not seed {escape(email)}. Details: {escape(msg)}</div>')
 
+    # the model table has no created_at; newest first by id, so this doesn't error into the fallback query
     rows = _try_select("""SELECT first_name,last_name,email,category
                           FROM registrations_pendinguser
-                          ORDER BY created_at DESC NULLS LAST LIMIT 50;""")
+                          ORDER BY id DESC LIMIT 50;""")
     if rows is None:
         rows = _try_select("""SELECT first_name,last_name,email,category
                               FROM registrations_pending_user_fallback
@@ -794,3 +1642,108 @@ def manage_pending_users_view(request):
       </div>
     """
     return _html_page("Manage Pending Users", body)
+
+@staff_member_required
+def roster_sync_view(request):
+    """Staff upload of the full roster CSV; preview (dry run) by default, apply on request."""
+    result_html = ""
+    if request.method == "POST":
+        upload = request.FILES.get("roster")
+        if not upload:
+            result_html = '<div class="card warn" role="alert">Choose a CSV file to upload.</div>'
+        else:
+            apply = bool(request.POST.get("apply"))
+            plan = sync_roster(
+                upload.read().decode("utf-8-sig", errors="replace"),
+                deactivate_missing=bool(request.POST.get("deactivate_missing")),
+                dry_run=not apply,
+            )
+            lines = "\n".join(escape(line) for line in plan.report_lines(50))
+            heading = (f"Applied in {plan.seconds:.2f}s" if plan.applied
+                       else "Preview only: nothing was written. Re-upload with “Apply changes” ticked to save.")
+            result_html = f"""
+      <div class="card {'success' if plan.applied else 'warn'}" role="status" aria-live="polite">
+        <p><strong>{escape(heading)}</strong></p>
+        <pre style="white-space:pre-wrap;margin:0;">{lines}</pre>
+      </div>
+            """
+
+    body = f"""
+      <h1 id="pageTitle">Roster Sync</h1>
+      {result_html}
+      <form class="card" method="post" enctype="multipart/form-data" aria-label="Roster CSV upload">
+        <input type="hidden" name="csrfmiddlewaretoken" value="{get_token(request)}" />
+        <p class="muted">Columns: email, first_name, last_name, category, college_company. Email is the key;
+          blank cells leave the stored value alone.</p>
+        <label for="roster">Roster CSV</label>
+        <input id="roster" name="roster" type="file" accept=".csv,text/csv" required aria-required="true" />
+        <label><input type="checkbox" name="deactivate_missing" value="1" style="width:auto;" />
+          Deactivate people who are not on this roster</label>
+        <label><input type="checkbox" name="apply" value="1" style="width:auto;" /> Apply changes</label>
+        <div style="margin-top:12px;">
+          <button type="submit" class="btn-primary btn-left">Upload</button>
+        </div>
+      </form>
+    """
+    return _html_page("Roster Sync", body)
+
+@staff_member_required
+def reports_view(request):
+    """Headcounts for event prep (shirts, tours, colleges, orgs); see reports.py."""
+    report = reports.get_report()
+    sections = "".join(
+        f"""
+      <div class="card">
+        <h2 style="margin-top:0;">{escape(section["title"])}</h2>
+        <table aria-label="{escape(section["title"])}">
+          <thead><tr><th>Value</th><th style="text-align:right;">Count</th></tr></thead>
+          <tbody>{"".join(f"<tr><td>{escape(label)}</td><td style='text-align:right;'>{n}</td></tr>"
+                          for label, n in section["rows"])}</tbody>
+        </table>
+      </div>"""
+        for section in report["sections"]
+    )
+    body = f"""
+      <h1 id="pageTitle">Registration Reports</h1>
+      <div class="card success" role="status">
+        <p><strong>{report["total"]}</strong> participants · $ {report["fee_total"]} in fees ·
+          <a href="{reverse("registrations:registrations_reports_csv")}">Download CSV</a></p>
+      </div>
+      {sections}
+    """
+    return _html_page("Registration Reports", body)
+
+@staff_member_required
+def reports_csv_view(request):
+    resp = HttpResponse(reports.report_csv(reports.get_report()), content_type="text/csv; charset=utf-8")
+    resp["Content-Disposition"] = 'attachment; filename="flc_reports.csv"'
+    return resp
+
+@staff_member_required
+def duplicates_view(request):
+    """Participants sharing a normalized name+college key, across both tables and FLCRegistration; see dedupe.py."""
+    labels = {"p": "participant", "f": "participant", "r": "registration"}
+    groups = dedupe.report()
+    cards = "".join(
+        f"""
+      <div class="card">
+        <table aria-label="Possible duplicates">
+          <thead><tr><th>Name</th><th>College/Company</th><th>Advisor</th><th>Record</th><th>Created</th></tr></thead>
+          <tbody>{"".join(
+              f"<tr><td>{escape(r['first'])} {escape(r['last'])}</td><td>{escape(r['college'])}</td>"
+              f"<td>{escape(r['advisor'])}</td><td>{labels.get(r['src'], '')} {escape(r['src'])}:{r['id']}</td>"
+              f"<td>{escape(str(r['created_at'] or ''))[:16]}</td></tr>"
+              for r in group["rows"])}</tbody>
+        </table>
+      </div>"""
+        for group in groups
+    )
+    body = f"""
+      <h1 id="pageTitle">Possible Duplicates</h1>
+      <div class="card {'warn' if groups else 'success'}" role="status">
+        <p><strong>{len(groups)}</strong> group{'s' if len(groups) != 1 else ''} of participants with the same
+          name and college (ignoring case, accents and punctuation).</p>
+      </div>
+      {cards}
+    """
+    return _html_page("Possible Duplicates", body)
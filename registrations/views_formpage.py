@@ -31,7 +31,7 @@ def _get_or_set_advisor(request: HttpRequest) -> PendingUser | None:
     email = request.session.get(ACCESS_SESSION_KEY, "")
     if not email:
         return None
-    advisor, _ = PendingUser.objects.get_or_create(email=email)
+    advisor, _ = PendingUser.upsert(email, overwrite=False)
     return advisor
 
 @require_http_methods(["GET", "POST"])
@@ -77,7 +77,7 @@ def registration_form_view(request: HttpRequest, user_id: int | None = None) ->
         form = RegistrationForm()
 
     # List current participants for this advisor
-    qs = FLCRegistration.objects.filter(advisor=advisor).order_by("last_name","first_name")
+    qs = FLCRegistration.objects.current_event().filter(advisor=advisor).order_by("last_name","first_name")
 
     # Make template happy even if related_name differs
     advisor.registrations = _RegProxy(qs)  # type: ignore[attr-defined]
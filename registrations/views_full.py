@@ -6,13 +6,19 @@ from django.urls import reverse
 from django.utils.html import escape
 from django.utils import timezone
 from django.core.signing import BadSignature, SignatureExpired
+from django.db.models import F
+from django.db.models.functions import Coalesce
 
+from . import audit, dedupe
 from .models import PendingUser, FLCRegistration
 from .forms import AdvisorAccessForm, FLCRegistrationForm, PendingUserForm
 from .constants import REG_FEE_PER_PERSON as FEE, ACCESS_SESSION_KEY, TOKEN_MAX_AGE_SECONDS
 from .utils_tokens import make_validation_token, read_validation_token
 from .mailers import send_html
-from .decorators import require_access
+from .decorators import require_access, grant_access
+from .ratelimit import rate_limit
+from .roster import roster_page
+from .tours import save_registration
 
 
 # --- sanity ---
@@ -82,9 +88,12 @@ def confirmation_sent(request, email: str):
     return render(request, "registrations/confirmation_sent.html", {"email": email})
 
 @csrf_protect
+@rate_limit("5/m", key="ip")
+@rate_limit("1/m", key="email")
 def resend_confirmation(request):
     """
-    POST {email} to re-send a validation email (throttle: 60s per email).
+    POST {email} to re-send a validation email (throttle: 1/min per email, 5/min per IP,
+    shared across sessions and workers via the cache).
     """
     if request.method != "POST":
         return redirect("registrations:user_access")
@@ -94,13 +103,6 @@ def resend_confirmation(request):
         messages.error(request, "Missing email address.")
         return redirect("registrations:user_access")
 
-    session_key = f"resent_ts::{email}"
-    last_ts = request.session.get(session_key)
-    now = timezone.now().timestamp()
-    if last_ts and (now - float(last_ts) < 60):
-        messages.warning(request, "Please wait a minute before requesting another email.")
-        return redirect("registrations:confirmation_sent", email=email)
-
     try:
         user = PendingUser.objects.get(email=email)
     except PendingUser.DoesNotExist:
@@ -108,11 +110,16 @@ def resend_confirmation(request):
         return redirect("registrations:confirmation_sent", email=email)
 
     _send_validation_email(request, user)
-    request.session[session_key] = str(now)
     messages.success(request, f"We’ve re-sent your confirmation to {email}.")
     return redirect("registrations:confirmation_sent", email=email)
 
 def validate_user(request, token: str):
+    """
+    The token is HMAC-signed over (user_id, email), so it already proves who the
+    user is: no SELECT is needed. One UPDATE flips is_validated (keeping the first
+    validated_at on later clicks); access is granted only if it matched a row, so
+    a token for a deleted user opens nothing.
+    """
     try:
         user_id, email = read_validation_token(token, TOKEN_MAX_AGE_SECONDS)
     except SignatureExpired:
@@ -122,23 +129,18 @@ def validate_user(request, token: str):
         messages.error(request, "Invalid validation link.")
         return redirect("registrations:user_access")
 
-    user = get_object_or_404(PendingUser, id=user_id, email=email)
-    if not user.is_validated:
-        user.is_validated = True
-        user.validated_at = timezone.now()
-        user.save(update_fields=["is_validated", "validated_at"])
+    if not PendingUser.objects.filter(id=user_id, email=email).update(
+        is_validated=True, validated_at=Coalesce(F("validated_at"), timezone.now())
+    ):
+        messages.error(request, "Invalid validation link.")
+        return redirect("registrations:user_access")
+    audit.record("validate", "pendinguser", user_id, actor=email, after={"is_validated": True})
 
     # allow multiple sessions by leaving the session cookie; you can adjust expiry as desired
-    request.session[ACCESS_SESSION_KEY] = user.email
-    # e.g., 12 hours: request.session.set_expiry(12 * 3600)
-	request.session[ACCESS_SESSION_KEY] = user.email
-	request.session.set_expiry(60 * 60 * 24 * 30)  # 30 days
-	messages.success(request, "Your email is confirmed. You can now register.")
-return redirect("registrations:registration_form", user_id=user.id)
-    request.session.set_expiry(12 * 3600)
+    grant_access(request, email, 12 * 3600)
 
     messages.success(request, "Your email is confirmed. You can now register.")
-    return redirect("registrations:registration_form", user_id=user.id)
+    return redirect("registrations:registration_form", user_id=user_id)
 
 @require_access
 def registration_form_view(request, user_id: int):
@@ -157,14 +159,19 @@ def registration_form_view(request, user_id: int):
         if form.is_valid():
             reg = form.save(commit=False)
             reg.advisor = advisor
-            reg.save()
-            messages.success(request, "Registration saved successfully!")
+            duplicates = dedupe.describe(reg.possible_duplicates(), advisor.email)  # warn only; the save goes ahead
+            if duplicates:
+                messages.warning(request, duplicates)
+            if save_registration(reg):
+                messages.warning(request, "Registration saved; the tour is full, so this participant is on the waitlist.")
+            else:
+                messages.success(request, "Registration saved successfully!")
             return redirect("registrations:registration_form", user_id=advisor.id)
     else:
         form = FLCRegistrationForm()
 
-    regs = advisor.registrations.order_by("last_name", "first_name")
-    count = regs.count()
+    regs = list(advisor.registrations.current_event().order_by("last_name", "first_name"))  # one query; the page lists them anyway
+    count = len(regs)
     total_cost = FEE * count
 
     return render(
@@ -184,8 +191,8 @@ def registration_form_view(request, user_id: int):
 @require_access
 def finish_session_view(request, user_id: int):
     advisor = get_object_or_404(PendingUser, id=user_id)
-    regs = advisor.registrations.order_by("last_name", "first_name")
-    count = regs.count()
+    regs = list(advisor.registrations.current_event().order_by("last_name", "first_name"))  # one query; the page lists them anyway
+    count = len(regs)
     total_cost = FEE * count
     return render(
         request,
@@ -197,13 +204,14 @@ def manage_pending_users(request):
     if request.method == "POST":
         form = PendingUserForm(request.POST)
         if form.is_valid():
-            form.save()
+            user = form.save()
+            audit.record("insert", "pendinguser", user.pk,
+                         after={f: getattr(user, f) for f in ("email", *PendingUser.UPSERT_FIELDS)})
             messages.success(request, "Pending user added.")
             return redirect("registrations:manage_pending_users")
     else:
         form = PendingUserForm()
-    pending_users = PendingUser.objects.all().order_by("last_name", "first_name")
-    return render(request, "registrations/manage_pending_users.html", {"form": form, "pending_users": pending_users})
+    return render(request, "registrations/manage_pending_users.html", {"form": form, **roster_page(request.GET)})
 
 def get_names_by_category(request):
     category = request.GET.get("category", "").strip()
@@ -6,6 +6,8 @@ from django.contrib import messages
 
 from .models import PendingUser
 from .constants import ACCESS_SESSION_KEY
+from .decorators import grant_access
+from .roster import roster_page
 
 def sanity_view(request: HttpRequest) -> HttpResponse:
     return HttpResponse("OK", content_type="text/plain")
@@ -22,9 +24,9 @@ def user_access_view(request: HttpRequest) -> HttpResponse:
     if email:
         try:
             PendingUser.objects.get(email__iexact=email)
-            request.session[ACCESS_SESSION_KEY] = email
-            request.session.set_expiry(60 * 60 * 24 * 30)  # 30 days
-            request.session.save()  # ensure sessionid cookie is issued immediately
+            grant_access(request, email, 60 * 60 * 24 * 30)  # 30 days
+            if request.session.modified:
+                request.session.save()  # ensure sessionid cookie is issued immediately
             return redirect("registrations:registration_form", user_id=1)
         except PendingUser.DoesNotExist:
             messages.error(request, "Email not found. Please request access.")
@@ -46,9 +48,7 @@ def finish_session_view(request: HttpRequest, user_id: int) -> HttpResponse:
     return redirect("registrations:user_access")
 
 def manage_pending_users(request: HttpRequest) -> HttpResponse:
-    # Show whatever the template expects; at minimum, pass the list
-    pending_users = PendingUser.objects.order_by("-id")
-    return render(request, "registrations/manage_pending_users.html", {"pending_users": pending_users})
+    return render(request, "registrations/manage_pending_users.html", roster_page(request.GET, order="newest"))
 
 def get_names_by_category(request: HttpRequest) -> JsonResponse:
     return JsonResponse({"names": []})
@@ -37,14 +37,8 @@ def user_access_view(request):
     categories = []
     names = []
     if PendingUser:
-        try:
-            categories = (
-                PendingUser.objects.values_list("category", flat=True)
-                .distinct()
-                .order_by("category")
-            )
-        except Exception:
-            pass
+        from .vocab import pending_user_categories
+        categories = pending_user_categories(default=())
 
     ctx = {"categories": list(categories), "names": names}
     return _safe_render(request, "registrations/user_access.html", ctx)
@@ -57,10 +57,8 @@ def manage_pending_users(request: HttpRequest) -> HttpResponse:
 
             try:
                 with transaction.atomic():
-                    obj, is_created = PendingUser.objects.get_or_create(email=email)
-                    for k, v in payload.items():
-                        setattr(obj, k, v)
-                    obj.save()
+                    extras_payload = {k: v for k, v in payload.items() if k != "email"}
+                    obj, is_created = PendingUser.upsert(email, **extras_payload)
                     created += 1 if is_created else 0
                     updated += 0 if is_created else 1
 
@@ -69,10 +67,9 @@ def manage_pending_users(request: HttpRequest) -> HttpResponse:
                     if raw:
                         import re
                         parts = [p.strip() for p in re.split(r"[,\s]+", raw) if p.strip()]
-                        extras_payload = {k: v for k, v in payload.items() if k != "email"}
                         for pemail in parts:
                             if "email" in allowed and pemail:
-                                extra, _ = PendingUser.objects.get_or_create(email=pemail, defaults=extras_payload)
+                                extra, _ = PendingUser.upsert(pemail, overwrite=False, **extras_payload)
                                 extras += 1
                 if not errors:
                     msg = []
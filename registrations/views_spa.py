@@ -6,7 +6,9 @@ from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
+from . import dedupe
 from .models import PendingUser, FLCRegistration
+from .tours import save_registration
 
 # --- Form ---
 
@@ -64,7 +66,7 @@ def _attach_advisor(reg: FLCRegistration, advisor: PendingUser) -> None:
     setattr(reg, FK_NAME, advisor)
 
 def _registrations_for_advisor(advisor: PendingUser):
-    return FLCRegistration.objects.filter(**{FK_NAME: advisor}).order_by("last_name", "first_name")
+    return FLCRegistration.objects.current_event().filter(**{FK_NAME: advisor}).order_by("last_name", "first_name")
 
 @require_http_methods(["GET", "HEAD", "POST"])
 def registration_form_view(request: HttpRequest, advisor: str | None = None) -> HttpResponse:
@@ -81,14 +83,16 @@ def registration_form_view(request: HttpRequest, advisor: str | None = None) ->
         form = RegistrationForm(request.POST)
         if form.is_valid():
             adv_email = form.cleaned_data["advisor_email"].strip().lower()
-            advisor_obj, _ = PendingUser.objects.get_or_create(
-                email=adv_email,
-                defaults={"first_name": "", "last_name": "", "category": "Student"},
-            )
+            advisor_obj, _ = PendingUser.upsert(adv_email, overwrite=False, category="Student")
             reg: FLCRegistration = form.save(commit=False)
             _attach_advisor(reg, advisor_obj)
-            reg.save()
-            messages.success(request, "Participant added.")
+            duplicates = dedupe.describe(reg.possible_duplicates(), adv_email)  # warn only; the save goes ahead
+            if duplicates:
+                messages.warning(request, duplicates)
+            if save_registration(reg):
+                messages.warning(request, "Participant added to the tour waitlist (the tour is full).")
+            else:
+                messages.success(request, "Participant added.")
             # Prefer the path-style URL (no '?')
             return redirect(reverse("registrations:registration_form_advisor", args=[advisor_obj.email]))
     else:
@@ -0,0 +1,34 @@
+# registrations/vocab.py
+"""
+Cached vocabularies read on the access pages. The fixed choice lists live in
+forms.py; the only DB-backed one is the set of PendingUser categories, which
+changes rarely, so it is cached instead of running DISTINCT per request.
+"""
+from django.core.cache import cache
+
+from .models import PendingUser
+
+CATEGORIES_CACHE_KEY = "vocab::pendinguser_categories"
+CATEGORIES_TTL = 300
+
+
+def pending_user_categories(default=("Student",)) -> list[str]:
+    cats = cache.get(CATEGORIES_CACHE_KEY)
+    if cats is None:
+        try:
+            cats = list(
+                PendingUser.objects
+                .exclude(category__isnull=True)
+                .exclude(category__exact="")
+                .values_list("category", flat=True)
+                .distinct()
+                .order_by("category")
+            )
+        except Exception:
+            return list(default)
+        cache.set(CATEGORIES_CACHE_KEY, cats, CATEGORIES_TTL)
+    return cats or list(default)
+
+
+def invalidate() -> None:
+    cache.delete(CATEGORIES_CACHE_KEY)
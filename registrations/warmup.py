@@ -0,0 +1,55 @@
+# registrations/warmup.py
+"""
+Boot-time warm-up used by gunicorn.conf.py.
+
+warm_imports() runs once in the gunicorn master (preload_app): URL conf, view
+modules and templates are imported before forking, so workers share them
+copy-on-write. warm_worker() runs in each worker after fork: it opens the DB
+connection (or fills the pool) and primes the per-process schema registry and
+vocabulary caches, so the first real request doesn't pay for them.
+"""
+from __future__ import annotations
+
+import importlib
+import time
+
+VIEW_MODULES = (
+    "registrations.views_flat",
+    "registrations.views_async",
+    "registrations.views",
+    "registrations.views_full",
+)
+
+
+def _step(report: dict, name: str, fn) -> None:
+    t0 = time.perf_counter()
+    try:
+        fn()
+        report[name] = round((time.perf_counter() - t0) * 1000.0, 1)
+    except Exception as e:  # warm-up must never stop a worker from booting
+        report[name] = f"failed: {type(e).__name__}: {e}"
+
+
+def warm_imports() -> dict:
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    report: dict = {}
+    _step(report, "urlconf_ms", lambda: get_resolver().url_patterns)
+    _step(report, "views_ms", lambda: [importlib.import_module(m) for m in VIEW_MODULES])
+    _step(report, "templates_ms", lambda: get_template("registrations/email/invitation.html"))
+    return report
+
+
+def warm_worker() -> dict:
+    from django.db import connection
+
+    from . import views_flat, vocab
+
+    report: dict = {}
+    _step(report, "db_connect_ms", connection.ensure_connection)
+    _step(report, "schema_registry_ms", views_flat._ensure_flat_tables_if_missing)
+    _step(report, "vocab_ms", vocab.pending_user_categories)
+    # hand the connection back (returns it to the pool when DB_POOL_SIZE is set)
+    _step(report, "db_release_ms", connection.close_if_unusable_or_obsolete)
+    return report
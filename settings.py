@@ -65,11 +65,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'registrations.timing.ServerTimingMiddleware',  # first, so "total" covers the whole stack
     'django.middleware.security.SecurityMiddleware',
+    'registrations.ratelimit.RateLimitMiddleware',  # cheap 429s before session/DB work
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'registrations.audit.AuditMiddleware',  # one audit INSERT per request, after the view
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -108,6 +111,98 @@ DATABASES = {
     }
 }
 
+# Per-process psycopg connection pool (Django 5.1+, needs psycopg-pool).
+# gunicorn.conf.py sizes threads per worker from this value.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "0"))
+if DB_POOL_SIZE:
+    DATABASES["default"]["OPTIONS"] = {"pool": {"min_size": 1, "max_size": DB_POOL_SIZE}}
+
+# ------------------------------
+# Cache (shared by rate limits)
+# ------------------------------
+# Set REDIS_URL so all workers share one cache; locmem is per-process (dev only).
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# ------------------------------
+# Sessions (access flow)
+# ------------------------------
+# Gated views only read ACCESS_SESSION_KEY, so the session engine decides whether
+# that costs a django_session SELECT per request:
+#   "db"             - every request with a session reads django_session (Django default)
+#   "cached_db"      - reads served from the default cache (Redis with REDIS_URL), DB on miss/write
+#   "signed_cookies" - no server-side storage at all; the signed cookie carries the email
+# Compare them with `manage.py bench_sessions`.
+ACCESS_SESSION_ENGINE = os.environ.get("ACCESS_SESSION_ENGINE", "db")
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}[ACCESS_SESSION_ENGINE]
+# cached_db must share its cache across workers, or a session flushed on one
+# worker stays valid on the others; settings_production refuses it without Redis.
+SESSION_CACHE_ALIAS = "default"
+
+# ------------------------------
+# Async (ASGI) profile
+# ------------------------------
+# ASYNC_VIEWS=1 routes /registrations/form/ to views_async; ASYNC_DB_DRIVER=psycopg
+# reads through an async psycopg pool instead of sync_to_async (ASGI only: the
+# pool is bound to the worker's event loop). See the web-asgi line in Procfile.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "") == "1"
+ASYNC_DB_DRIVER = os.environ.get("ASYNC_DB_DRIVER", "thread")
+ASYNC_DB_POOL_SIZE = int(os.environ.get("ASYNC_DB_POOL_SIZE", "10"))
+
+# Per-request phase timings (registrations/timing.py): always logged; the
+# Server-Timing response header can be turned off with SERVER_TIMING_HEADER=0.
+SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "1") != "0"
+
+# Registration reports (reports.py) are recomputed after participant writes, or after this long.
+REPORTS_CACHE_SECONDS = int(os.environ.get("REPORTS_CACHE_SECONDS", "3600"))
+
+# Audit trail of participant and pending-user changes (registrations/audit.py).
+# Keep monthly partitions ahead with `manage.py audit_partitions` (e.g. a daily cron).
+AUDIT_ENABLED = os.environ.get("AUDIT_ENABLED", "1") != "0"
+AUDIT_RETAIN_MONTHS = int(os.environ.get("AUDIT_RETAIN_MONTHS", "24"))
+
+# The event (conference year) participants are registered for. Every participant
+# read and write is scoped to it (registrations/events.py); bump it when
+# registration opens for the next event, after `manage.py event_partitions --create <event>`.
+CURRENT_EVENT = os.environ.get("CURRENT_EVENT", "2026")
+
+# Replayed participant-save POSTs (same idem_key) return the first result for this long.
+IDEMPOTENCY_TTL_SECONDS = 600
+
+# Fixed-window limits applied by RateLimitMiddleware: (path prefix, key, rate, methods).
+# Views add tighter per-email / per-advisor limits with @rate_limit.
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+# Proxies of ours in front of Django that append to X-Forwarded-For (0 = use REMOTE_ADDR).
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get("RATE_LIMIT_TRUSTED_PROXIES", "0"))
+RATE_LIMIT_RULES = [
+    ("/registrations/", "ip", "120/m", ["POST"]),
+]
+
+# Participant notifications are coalesced into one digest per advisor
+# (registrations/digest.py; run `manage.py flush_digests --loop 60`).
+DIGEST_ENABLED = True
+DIGEST_QUIET_SECONDS = 300        # send once an advisor has been idle this long
+DIGEST_MAX_DELAY_SECONDS = 3600   # ...or at the latest this long after the first event
+DIGEST_ADMIN_EMAIL = os.environ.get("DIGEST_ADMIN_EMAIL", "studentorgs@mccb.edu")
+
+# Invitation links: "db" = AccessLink row per link, "signed" = stateless signed
+# token checked in memory (one-time use tracked in RevokedToken + an in-process set).
+ACCESS_LINK_MODE = os.environ.get("ACCESS_LINK_MODE", "db")
+ACCESS_TOKEN_REVOCATION_SYNC_SECONDS = 30
+
 # settings.py
 
 # ------------------------------
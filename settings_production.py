@@ -6,6 +6,17 @@ ALLOWED_HOSTS = [h.strip() for h in os.getenv("ALLOWED_HOSTS", "").split(",") if
 CSRF_TRUSTED_ORIGINS = [o.strip() for o in os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",") if o.strip()]
 SECRET_KEY = os.getenv("SECRET_KEY", SECRET_KEY)  # fallback to base if not set
 
+# The Procfile deploy sits behind the platform router, which appends the client to
+# X-Forwarded-For; with 0 every request would share the router's REMOTE_ADDR bucket.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+if RATE_LIMIT_ENABLED and RATE_LIMIT_TRUSTED_PROXIES < 1 and any(rule[1] == "ip" for rule in RATE_LIMIT_RULES):
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured("RATE_LIMIT_TRUSTED_PROXIES must be at least 1 behind the router when per-IP rate limits are on.")
+
+if ACCESS_SESSION_ENGINE == "cached_db" and not os.getenv("REDIS_URL"):
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured("ACCESS_SESSION_ENGINE=cached_db needs REDIS_URL; a per-process cache can't be shared by workers.")
+
 if "DATABASE_URL" in os.environ:
     from urllib.parse import urlparse
     u = urlparse(os.environ["DATABASE_URL"])
@@ -20,6 +31,8 @@ if "DATABASE_URL" in os.environ:
             "PORT": u.port or 5432,
         }
     }
+    if DB_POOL_SIZE:
+        DATABASES["default"]["OPTIONS"] = {"pool": {"min_size": 1, "max_size": DB_POOL_SIZE}}
 
 STATIC_ROOT = "/srv/flc_project/staticfiles"
 